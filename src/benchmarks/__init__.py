@@ -0,0 +1 @@
+"""Performance benchmarks for the simulation core. Run from `src/`, e.g. `python -m benchmarks.scaling` or `python -m benchmarks.trade`."""
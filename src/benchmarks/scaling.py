@@ -0,0 +1,161 @@
+"""
+Scaling benchmarks for World. Each scenario runs in a fresh process (so
+peak RSS is its own) with fixed seeds and reports initialization time, full
+tick times, per-phase times from the world's profiler and isolated timings
+of the hot subsystems. Results are written as JSON and can be compared with
+a stored baseline:
+
+    python -m benchmarks.scaling --output results.json
+    python -m benchmarks.scaling --baseline results.json --tolerance 0.25
+
+With --workers N the worlds are ParallelWorlds with N workers, which shard
+the households, aging and corporation kernels; the rest of a tick stays
+serial, so compare the per-phase times to see what the workers take over.
+"""
+import argparse
+import json
+import platform
+import resource
+import statistics
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, List, Tuple
+import numpy as np
+from world.parallel import ParallelWorld
+from world.world import World, WorldConfig
+
+# (people, corporations)
+SCENARIOS = [(1_000, 50), (10_000, 500), (100_000, 2_000), (1_000_000, 10_000)]
+SEED = 1234
+MIN_COMPARED_S = 1e-3  # Shorter timings are too noisy to flag as regressions
+
+def _best(function, repeats: int) -> float:
+    best = float("inf")
+    for _ in range(repeats):
+        start = time.perf_counter()
+        function()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+def run_scenario(people: int, corporations: int, ticks: int = 3, repeats: int = 3, workers: int = 1) -> Dict:
+    config = WorldConfig(initial_population=people, corporation_count=corporations, columnar=True,
+                         seed=SEED, profile=True, raise_errors=True)
+    start = time.perf_counter()
+    world = ParallelWorld(config, workers) if workers > 1 else World(config)
+    init = time.perf_counter() - start
+
+    tick_times = []
+    for _ in range(ticks):
+        start = time.perf_counter()
+        world.update()
+        tick_times.append(time.perf_counter() - start)
+    phases = {path: stats["mean_s"] for path, stats in world.get_profile()["phases"].items()}
+    if workers > 1:
+        world.close()
+
+    # Subsistemas aislados, con el estado que dejó la simulación
+    economy, population = world.economy, world.population
+    employed = np.flatnonzero(population.employer_id != -1)
+    incomes = population.salary[employed] if len(employed) else np.full(1000, 25000.0)
+    sample = incomes[:1000].tolist()
+    subsystems = {
+        "economy_update_s": _best(lambda: economy.update(world.corporations, population), repeats),
+        "politics_update_s": _best(lambda: world.politics.update(world.time.current_year), repeats),
+        "tax_scalar_per_1k_s": _best(lambda: [economy.tax_system.calculate_tax(income) for income in sample],
+                                     repeats),
+        "tax_batch_s": _best(lambda: economy.tax_system.calculate_tax_batch(incomes), repeats),
+        "job_openings_s": _best(lambda: [corp.generate_job_openings(economy.rng) for corp in world.corporations], repeats),
+        "trade_step_s": _best(economy.trade.step, repeats),
+        "market_clearing_s": _best(lambda: economy.market.clear(world.corporations, population, 1 / 12), repeats),
+    }
+    return {
+        "people": people,
+        "corporations": corporations,
+        "workers": workers,
+        "init_s": init,
+        "tick_median_s": statistics.median(tick_times),
+        "tick_max_s": max(tick_times),
+        "phases_s": phases,
+        "subsystems_s": subsystems,
+        "peak_rss_mb": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024,  # ru_maxrss is KiB on Linux
+    }
+
+def run_isolated(people: int, corporations: int, ticks: int, workers: int = 1) -> Dict:
+    """Run one scenario in its own process"""
+    with ProcessPoolExecutor(max_workers=1) as pool:
+        return pool.submit(run_scenario, people, corporations, ticks, 3, workers).result()
+
+def _flatten(result: Dict) -> Dict[str, float]:
+    metrics = {"init_s": result["init_s"], "tick_median_s": result["tick_median_s"],
+               "peak_rss_mb": result["peak_rss_mb"]}
+    metrics.update({f"phase.{path}": value for path, value in result["phases_s"].items()})
+    metrics.update({f"subsystem.{name}": value for name, value in result["subsystems_s"].items()})
+    return metrics
+
+def compare(results: List[Dict], baseline: List[Dict], tolerance: float) -> List[Tuple[str, str, float, float]]:
+    """Metrics that are more than `tolerance` (a fraction) worse than the baseline"""
+    previous = {(entry["people"], entry["corporations"], entry.get("workers", 1)): _flatten(entry)
+                for entry in baseline}
+    regressions = []
+    for result in results:
+        scenario = f"{result['people']}x{result['corporations']}"
+        before = previous.get((result["people"], result["corporations"], result.get("workers", 1)))
+        if before is None:
+            continue
+        for metric, value in _flatten(result).items():
+            reference = before.get(metric)
+            if not reference or (metric.endswith("_s") and reference < MIN_COMPARED_S):
+                continue
+            if value > reference * (1 + tolerance):
+                regressions.append((scenario, metric, reference, value))
+    return regressions
+
+def main():
+    parser = argparse.ArgumentParser(description="Time World at increasing sizes")
+    parser.add_argument("--people", type=int, nargs="+", help="Population sizes (default: the standard grid)")
+    parser.add_argument("--corporations", type=int, nargs="+", help="Corporation counts, paired with --people")
+    parser.add_argument("--ticks", type=int, default=3)
+    parser.add_argument("--workers", type=int, default=1, help="Step the worlds with a ParallelWorld of this many workers")
+    parser.add_argument("--output", help="Write the results to this JSON file")
+    parser.add_argument("--baseline", help="JSON results to compare against")
+    parser.add_argument("--tolerance", type=float, default=0.2, help="Allowed slowdown before failing (0.2 = 20%%)")
+    args = parser.parse_args()
+
+    scenarios = SCENARIOS
+    if args.people:
+        corporations = args.corporations or [50] * len(args.people)
+        if len(corporations) != len(args.people):
+            parser.error("--corporations needs one value per --people value")
+        scenarios = list(zip(args.people, corporations))
+
+    results = []
+    for people, corporations in scenarios:
+        result = run_isolated(people, corporations, args.ticks, args.workers)
+        results.append(result)
+        print(f"{people:>9} personas, {corporations:>6} corporaciones: init {result['init_s']:.3f}s, "
+              f"tick {result['tick_median_s']:.3f}s, RSS {result['peak_rss_mb']:.0f} MB")
+
+    report = {
+        "seed": SEED,
+        "python": platform.python_version(),
+        "numpy": np.__version__,
+        "machine": platform.machine(),
+        "results": results,
+    }
+    if args.output:
+        with open(args.output, "w") as file:
+            json.dump(report, file, indent=2)
+
+    if args.baseline:
+        with open(args.baseline) as file:
+            baseline = json.load(file)["results"]
+        regressions = compare(results, baseline, args.tolerance)
+        for scenario, metric, before, after in regressions:
+            print(f"REGRESIÓN {scenario} {metric}: {before:.4g} -> {after:.4g} (x{after / before:.2f})")
+        if regressions:
+            sys.exit(1)
+        print(f"Sin regresiones (tolerancia {args.tolerance:.0%})")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,56 @@
+import argparse
+import time
+from typing import Dict
+import numpy as np
+from systems.economy import EconomySystem
+
+RESOURCES = ["food", "water", "energy", "minerals", "consumer_goods", "industrial_goods"]
+
+def build_economy(region_count: int, seed: int = 0) -> EconomySystem:
+    """Economy with both the nested-loop regional markets and the vectorized engine set up identically"""
+    rng = np.random.default_rng(seed)
+    economy = EconomySystem()
+    economy.initialize_markets({resource: 10000.0 for resource in RESOURCES})
+    economy.state.prices = {resource: float(price) for resource, price in zip(RESOURCES, rng.uniform(5, 50, len(RESOURCES)))}
+    demand_factors = rng.uniform(0.8, 1.2, region_count)
+    economy.initialize_regional_markets(region_count, demand_factors)
+    economy.regional_markets = {
+        region: {
+            'prices': {resource: price * demand_factors[region] for resource, price in economy.state.prices.items()},
+            'demand_factor': float(demand_factors[region]),
+            'inventory': dict(zip(RESOURCES, economy.trade.inventory[region].tolist()))
+        }
+        for region in range(region_count)
+    }
+    return economy
+
+def run(region_count: int, repeats: int = 3) -> Dict[str, float]:
+    economy = build_economy(region_count)
+    engine = economy.trade
+    economy.trade = None
+
+    start = time.perf_counter()
+    economy._update_regional_markets()
+    nested = time.perf_counter() - start
+
+    economy.trade = engine
+    vectorized = float("inf")
+    for _ in range(repeats):
+        start = time.perf_counter()
+        economy._update_regional_markets()
+        vectorized = min(vectorized, time.perf_counter() - start)
+
+    return {"regions": region_count, "nested_loops_s": nested, "vectorized_s": vectorized,
+            "speedup": nested / vectorized}
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare the nested-loop and vectorized trade flows")
+    parser.add_argument("--regions", type=int, nargs="+", default=[10, 50, 200, 500])
+    args = parser.parse_args()
+    for region_count in args.regions:
+        result = run(region_count)
+        print(f"{result['regions']:>5} regiones: bucles {result['nested_loops_s']:.4f}s, "
+              f"vectorizado {result['vectorized_s']:.4f}s (x{result['speedup']:.0f})")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,155 @@
+from typing import Dict
+import numpy as np
+
+# Wealth histogram: negative wealth, [0, 1), eight log-spaced bins per decade up to 1e9, then overflow
+BINS_PER_DECADE = 8
+WEALTH_BINS = 2 + 9 * BINS_PER_DECADE + 1
+REFRESH_BLOCK = 1 << 20  # Rows per pass of a full refresh
+
+def wealth_bins(wealth: np.ndarray) -> np.ndarray:
+    """Histogram bin of each wealth value (computed arithmetically, no search over the edges)"""
+    bins = np.log10(np.maximum(wealth, 1.0))
+    bins *= BINS_PER_DECADE
+    bins = bins.astype(np.intp)
+    bins += 2
+    np.minimum(bins, WEALTH_BINS - 1, out=bins)
+    bins[wealth < 1.0] = 1
+    bins[wealth < 0.0] = 0
+    return bins
+
+class PopulationAggregates:
+    """
+    Running totals over a population: people and wealth per region,
+    happiness and health sums and a wealth histogram (count and wealth per
+    bin) for the Gini index. The household kernel, which runs every tick,
+    rebuilds them block by block in the same pass that updates the rows,
+    and every other write goes through PopulationTable.assign, which applies
+    the change as a delta, so reading any statistic is O(1) (O(regions) or
+    O(bins) at most). Other kernels that rewrite every row (the market
+    clearing) only mark the totals `stale`; the household kernel later in the
+    tick rebuilds them, and a read before that rebuilds them itself.
+    """
+    def __init__(self, region_count: int):
+        self.region_count = region_count
+        self.reset()
+
+    def reset(self):
+        self.region_population = np.zeros(self.region_count, dtype=np.int64)
+        self.region_wealth = np.zeros(self.region_count)
+        self.happiness_sum = 0.0
+        self.health_sum = 0.0
+        self.histogram = np.zeros(WEALTH_BINS, dtype=np.int64)
+        self.histogram_wealth = np.zeros(WEALTH_BINS)
+        self.stale = False  # Rows were rewritten wholesale since the totals were computed
+
+    def refresh(self, wealth: np.ndarray, happiness: np.ndarray, health: np.ndarray, location: np.ndarray):
+        """Recompute everything from the columns, in blocks so temporaries stay small"""
+        self.reset()
+        for start in range(0, len(wealth), REFRESH_BLOCK):
+            rows = slice(start, start + REFRESH_BLOCK)
+            self.add_rows(wealth[rows], happiness[rows], health[rows], location[rows])
+
+    def add_rows(self, wealth: np.ndarray, happiness: np.ndarray, health: np.ndarray, location: np.ndarray):
+        """Add the totals of a block of rows"""
+        self.region_population += np.bincount(location, minlength=self.region_count)
+        self.region_wealth += np.bincount(location, weights=wealth, minlength=self.region_count)
+        self.happiness_sum += float(happiness.sum(dtype=np.float64))
+        self.health_sum += float(health.sum(dtype=np.float64))
+        bins = wealth_bins(wealth)
+        self.histogram += np.bincount(bins, minlength=WEALTH_BINS)
+        self.histogram_wealth += np.bincount(bins, weights=wealth, minlength=WEALTH_BINS)
+
+    def __iadd__(self, other: 'PopulationAggregates') -> 'PopulationAggregates':
+        """Merge the totals of another set of rows (e.g. a shard stepped by a worker)"""
+        self.region_population += other.region_population
+        self.region_wealth += other.region_wealth
+        self.happiness_sum += other.happiness_sum
+        self.health_sum += other.health_sum
+        self.histogram += other.histogram
+        self.histogram_wealth += other.histogram_wealth
+        return self
+
+    def on_assign(self, table, column: str, rows, old: np.ndarray, new: np.ndarray):
+        """Apply the delta of a write to `rows` of `column` (called before the write)"""
+        if column == "wealth":
+            regions = np.atleast_1d(table.location[rows])
+            old, new = np.atleast_1d(old), np.atleast_1d(new)
+            self.region_wealth += (np.bincount(regions, weights=new, minlength=self.region_count) -
+                                   np.bincount(regions, weights=old, minlength=self.region_count))
+            old_bins, new_bins = wealth_bins(old), wealth_bins(new)
+            self.histogram += (np.bincount(new_bins, minlength=WEALTH_BINS) -
+                               np.bincount(old_bins, minlength=WEALTH_BINS))
+            self.histogram_wealth += (np.bincount(new_bins, weights=new, minlength=WEALTH_BINS) -
+                                      np.bincount(old_bins, weights=old, minlength=WEALTH_BINS))
+        elif column == "location":
+            wealth = np.atleast_1d(table.wealth[rows])
+            old, new = np.atleast_1d(old), np.atleast_1d(new)
+            self.region_population += (np.bincount(new, minlength=self.region_count) -
+                                       np.bincount(old, minlength=self.region_count))
+            self.region_wealth += (np.bincount(new, weights=wealth, minlength=self.region_count) -
+                                   np.bincount(old, weights=wealth, minlength=self.region_count))
+        elif column == "happiness":
+            self.happiness_sum += float(np.sum(new, dtype=np.float64) - np.sum(old, dtype=np.float64))
+        elif column == "health":
+            self.health_sum += float(np.sum(new, dtype=np.float64) - np.sum(old, dtype=np.float64))
+
+    @property
+    def population(self) -> int:
+        return int(self.region_population.sum())
+
+    @property
+    def total_wealth(self) -> float:
+        return float(self.region_wealth.sum())
+
+    def average_wealth(self) -> float:
+        return self.total_wealth / self.population if self.population else 0.0
+
+    def average_happiness(self) -> float:
+        return self.happiness_sum / self.population if self.population else 0.0
+
+    def average_health(self) -> float:
+        return self.health_sum / self.population if self.population else 0.0
+
+    def gini(self) -> float:
+        """Gini index from the histogram, treating everyone in a bin as equally wealthy"""
+        total = self.histogram_wealth.sum()
+        if total <= 0 or not self.population:
+            return 0.0
+        people = self.histogram / self.histogram.sum()
+        wealth = self.histogram_wealth / total
+        lorenz_before = np.concatenate(([0.0], np.cumsum(wealth)[:-1]))
+        return float(1.0 - np.sum(people * (2 * lorenz_before + wealth)))
+
+    def wealth_quantiles(self, quantiles) -> np.ndarray:
+        """
+        Approximate wealth quantiles from the histogram, interpolating
+        log-linearly inside a bin (negative and overflow bins use their mean)
+        """
+        counts = self.histogram
+        total = counts.sum()
+        if not total:
+            return np.zeros(len(quantiles))
+        cumulative = np.cumsum(counts)
+        ranks = np.asarray(quantiles, dtype=np.float64) * total
+        bins = np.minimum(np.searchsorted(cumulative, ranks, side="left"), WEALTH_BINS - 1)
+        inside = (ranks - (cumulative[bins] - counts[bins])) / np.maximum(counts[bins], 1)
+        low = (bins - 2) / BINS_PER_DECADE
+        values = 10.0 ** (low + inside / BINS_PER_DECADE)
+        values = np.where(bins == 1, inside, values)  # [0, 1) is linear
+        means = self.histogram_wealth[bins] / np.maximum(counts[bins], 1)
+        return np.where((bins == 0) | (bins == WEALTH_BINS - 1), means, values)
+
+    def differences(self, other: 'PopulationAggregates', rtol: float = 1e-6) -> Dict[str, str]:
+        """Aggregates that disagree with `other` (e.g. a full recompute), for debugging"""
+        scale = max(abs(other.total_wealth), 1.0)
+        checks = {
+            "region_population": np.array_equal(self.region_population, other.region_population),
+            "histogram": np.array_equal(self.histogram, other.histogram),
+            "region_wealth": np.allclose(self.region_wealth, other.region_wealth, rtol=rtol, atol=rtol * scale),
+            "histogram_wealth": np.allclose(self.histogram_wealth, other.histogram_wealth,
+                                            rtol=rtol, atol=rtol * scale),
+            "happiness_sum": np.isclose(self.happiness_sum, other.happiness_sum, rtol=rtol, atol=rtol),
+            "health_sum": np.isclose(self.health_sum, other.health_sum, rtol=rtol, atol=rtol),
+        }
+        return {name: f"{getattr(self, name)!r} != {getattr(other, name)!r}"
+                for name, ok in checks.items() if not ok}
@@ -0,0 +1,43 @@
+from typing import Dict, Iterator, Sequence
+from collections.abc import MutableMapping
+import numpy as np
+
+class ColumnMapping(MutableMapping):
+    """Dict-like view over one row of a 2-D array whose columns have names"""
+    __slots__ = ("_row", "_index")
+
+    def __init__(self, row: np.ndarray, index: Dict[str, int]):
+        self._row = row
+        self._index = index
+
+    def __getitem__(self, key: str) -> float:
+        return self._row[self._index[key]].item()
+
+    def __setitem__(self, key: str, value: float):
+        self._row[self._index[key]] = value
+
+    def __delitem__(self, key: str):
+        raise TypeError("Columns of a table row cannot be removed")
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._index)
+
+    def __len__(self) -> int:
+        return len(self._index)
+
+    def __repr__(self) -> str:
+        return repr(dict(self))
+
+def column_property(column: str) -> property:
+    """Property that reads `column` of the row a view points at and writes it through the table's `assign`"""
+    def fget(self):
+        return getattr(self._table, column)[self._row].item()
+
+    def fset(self, value):
+        self._table.assign(column, self._row, value)
+
+    return property(fget, fset, doc=f"Row value of the `{column}` column")
+
+def name_index(names: Sequence[str]) -> Dict[str, int]:
+    """Map each name to its column position"""
+    return {name: i for i, name in enumerate(names)}
@@ -1,14 +1,102 @@
-from typing import Dict, List
-from dataclasses import dataclass, field
-import random
+from typing import Dict, Iterable, List, Optional, Tuple
+from dataclasses import InitVar, dataclass, field
+import numpy as np
+from entities.employment import EmployeeRoster
+from utils.categorical import categories
+from utils.name_generator import NamePool
+from utils.rng import fallback
 
-def generate_company_name() -> str:
+NAME_PREFIXES = ["Global", "Advanced", "United", "International", "Strategic", "Dynamic", "Premier", "Elite"]
+NAME_CORES = ["Tech", "Industries", "Solutions", "Resources", "Energy", "Materials", "Systems", "Enterprises"]
+NAME_SUFFIXES = ["Corp", "Inc", "Ltd", "Group", "Holdings", "International", "Co", "Corporation"]
+COMPANY_NAMES = NamePool(NAME_PREFIXES, NAME_CORES, NAME_SUFFIXES)
+
+def generate_company_names(count: int, rng: Optional[np.random.Generator] = None) -> List[str]:
+    """Generate random but plausible company names, drawing all of them at once"""
+    return COMPANY_NAMES.names(COMPANY_NAMES.draw(count, rng))
+
+def generate_company_name(rng: Optional[np.random.Generator] = None) -> str:
     """Generate a random but plausible company name"""
-    prefixes = ["Global", "Advanced", "United", "International", "Strategic", "Dynamic", "Premier", "Elite"]
-    core_names = ["Tech", "Industries", "Solutions", "Resources", "Energy", "Materials", "Systems", "Enterprises"]
-    suffixes = ["Corp", "Inc", "Ltd", "Group", "Holdings", "International", "Co", "Corporation"]
-    
-    return f"{random.choice(prefixes)} {random.choice(core_names)} {random.choice(suffixes)}"
+    return generate_company_names(1, rng)[0]
+
+INDUSTRY_TYPES = ["manufacturing", "agriculture", "services", "technology", "energy", "mining"]
+INDUSTRIES = categories("industry", INDUSTRY_TYPES)  # Codes of every industry seen, the standard ones first
+
+# Job positions offered by each industry
+JOB_TYPES = {
+    "manufacturing": ["Production Worker", "Quality Control", "Plant Manager"],
+    "agriculture": ["Farm Worker", "Agricultural Technician", "Field Manager"],
+    "services": ["Service Representative", "Account Manager", "Operations Coordinator"],
+    "technology": ["Software Developer", "System Administrator", "IT Specialist"],
+    "energy": ["Plant Operator", "Maintenance Technician", "Energy Engineer"],
+    "mining": ["Mining Operator", "Safety Inspector", "Site Manager"]
+}
+DEFAULT_POSITIONS = ["General Worker"]
+
+BASE_SALARIES = {
+    "Worker": (30000, 45000),
+    "Technician": (40000, 60000),
+    "Manager": (60000, 100000),
+    "Specialist": (50000, 80000),
+    "Engineer": (70000, 110000)
+}
+
+def salary_range(position: str) -> Tuple[float, float]:
+    """Salary range for a position, based on its level"""
+    if "Manager" in position:
+        return BASE_SALARIES["Manager"]
+    elif "Engineer" in position or "Developer" in position:
+        return BASE_SALARIES["Engineer"]
+    elif "Technician" in position or "Specialist" in position:
+        return BASE_SALARIES["Specialist"]
+    return BASE_SALARIES["Worker"]
+
+# Resource types and their base production rates
+PRODUCTION_RATES = {
+    "food": (100, 500),
+    "water": (200, 1000),
+    "energy": (500, 2000),
+    "minerals": (50, 200),
+    "consumer_goods": (100, 400),
+    "industrial_goods": (50, 200)
+}
+RESOURCES = list(PRODUCTION_RATES)
+RESOURCE_INDEX = {resource: i for i, resource in enumerate(RESOURCES)}
+INDUSTRY_RESOURCES = {
+    "agriculture": ["food"],
+    "manufacturing": ["consumer_goods", "industrial_goods"],
+    "energy": ["energy"],
+    "mining": ["minerals"]
+}
+
+EMPLOYEE_COST = 5000  # Average monthly salary
+MAINTENANCE_COST = 100  # Per unit of production capacity
+
+def draw_initial_corporations(count: int, rng: Optional[np.random.Generator] = None):
+    """
+    Random attributes of `count` new corporations, drawn column by column:
+    industry codes, name codes (into COMPANY_NAMES), capitals, profit margins
+    and the capacity and starting inventory matrices (corporations x RESOURCES)
+    """
+    rng = fallback(rng)
+    industries = rng.integers(0, len(INDUSTRY_TYPES), count)
+    names = COMPANY_NAMES.draw(count, rng)
+    capitals = rng.uniform(500000, 5000000, count)
+    margins = rng.uniform(0.10, 0.25, count)
+    rates = np.stack([rng.uniform(low, high, count) for low, high in PRODUCTION_RATES.values()], axis=1)
+    stock_factors = rng.uniform(0.5, 2.0, (2, count))
+
+    # Position of each resource among its industry's resources (-1 if not produced)
+    slots = np.full((len(INDUSTRY_TYPES), len(RESOURCES)), -1)
+    for code, industry in enumerate(INDUSTRY_TYPES):
+        for slot, resource in enumerate(INDUSTRY_RESOURCES.get(industry, [])):
+            slots[code, RESOURCE_INDEX[resource]] = slot
+    slot = slots[industries]
+    produced = slot >= 0
+    capacity = np.where(produced, rates, 0.0)
+    factors = stock_factors[np.maximum(slot, 0), np.arange(count)[:, None]]
+    inventory = np.where(produced, capacity * factors, 0.0)
+    return industries, names, capitals, margins, capacity, inventory
 
 @dataclass
 class Corporation:
@@ -18,7 +106,7 @@ class Corporation:
     """
     id: int
     name: str
-    industry_type: str  # e.g., "manufacturing", "agriculture", "services"
+    industry_type: InitVar[str]  # e.g., "manufacturing", "agriculture", "services"
     capital: float = 1000000.0  # Initial capital
     employees: List[int] = field(default_factory=list)  # List of employee IDs
     inventory: Dict[str, float] = field(default_factory=dict)  # Resource -> quantity
@@ -26,53 +114,37 @@ class Corporation:
     operating_costs: float = 0.0
     revenue: float = 0.0
     profit_margin: float = 0.15  # 15% default profit margin
+    region: int = 0  # region_id
+    industry: int = field(default=0, init=False)  # Code in INDUSTRIES, read through `industry_type`
+
+    def __post_init__(self, industry_type: str):
+        self.industry = INDUSTRIES.code(industry_type)
+        # Employees are kept in a roster so membership checks and removals are O(1)
+        if not isinstance(self.employees, EmployeeRoster):
+            self.employees = EmployeeRoster(self.id, self.employees)
     
     @staticmethod
-    def generate_initial_corporations(count: int) -> List['Corporation']:
+    def generate_initial_corporations(count: int, rng: Optional[np.random.Generator] = None) -> List['Corporation']:
         """Generate a list of initial corporations with random but realistic attributes"""
+        industries, names, capitals, margins, capacity, inventory = draw_initial_corporations(count, rng)
+        industries, capitals, margins = industries.tolist(), capitals.tolist(), margins.tolist()
+        names = COMPANY_NAMES.names(names)
+        capacity, inventory = capacity.tolist(), inventory.tolist()
         corporations = []
-        industry_types = ["manufacturing", "agriculture", "services", "technology", "energy", "mining"]
-        
-        # Resource types and their base production rates
-        resource_production_rates = {
-            "food": (100, 500),
-            "water": (200, 1000),
-            "energy": (500, 2000),
-            "minerals": (50, 200),
-            "consumer_goods": (100, 400),
-            "industrial_goods": (50, 200)
-        }
-
         for i in range(count):
-            # Select random industry type
-            industry = random.choice(industry_types)
+            industry = INDUSTRY_TYPES[industries[i]]
             
-            # Generate initial production capacities based on industry
-            production_capacity = {}
-            if industry == "agriculture":
-                production_capacity["food"] = random.uniform(*resource_production_rates["food"])
-            elif industry == "manufacturing":
-                production_capacity["consumer_goods"] = random.uniform(*resource_production_rates["consumer_goods"])
-                production_capacity["industrial_goods"] = random.uniform(*resource_production_rates["industrial_goods"])
-            elif industry == "energy":
-                production_capacity["energy"] = random.uniform(*resource_production_rates["energy"])
-            elif industry == "mining":
-                production_capacity["minerals"] = random.uniform(*resource_production_rates["minerals"])
-            
-            # Create corporation with random initial values
+            # Only the resources of the industry are produced and stocked
+            produced = [RESOURCE_INDEX[resource] for resource in INDUSTRY_RESOURCES.get(industry, [])]
             corporation = Corporation(
                 id=i,
-                name=generate_company_name(),
+                name=names[i],
                 industry_type=industry,
-                capital=random.uniform(500000, 5000000),
-                production_capacity=production_capacity,
-                profit_margin=random.uniform(0.10, 0.25)
+                capital=capitals[i],
+                production_capacity={RESOURCES[j]: capacity[i][j] for j in produced},
+                profit_margin=margins[i]
             )
-            
-            # Initialize inventory with some starting resources
-            for resource, rate in corporation.production_capacity.items():
-                corporation.inventory[resource] = rate * random.uniform(0.5, 2.0)
-            
+            corporation.inventory.update({RESOURCES[j]: inventory[i][j] for j in produced})
             corporations.append(corporation)
         
         return corporations
@@ -91,21 +163,38 @@ class Corporation:
             return True
         return False
     
+    def hire_many(self, person_ids: Iterable[int]) -> int:
+        """Add several employees at once; returns how many were new"""
+        if self.employees.index is not None:
+            return self.employees.index.hire_many(self.id, person_ids)
+        before = len(self.employees)
+        self.employees.extend(person_ids)
+        return len(self.employees) - before
+
+    def fire_many(self, person_ids: Iterable[int]) -> np.ndarray:
+        """Remove several employees at once; returns the ids that were removed"""
+        return self.employees.discard_many(person_ids)
+
+    def lay_off(self, fraction: float, rng: np.random.Generator) -> np.ndarray:
+        """Mass layoff of a random share of the workforce, drawn from the caller's stream"""
+        staff = self.employees.to_array()
+        return self.fire_many(rng.choice(staff, int(round(len(staff) * fraction)), replace=False).tolist())
+    
     def update_inventory(self, resource: str, quantity: float):
         """Update the quantity of a resource in inventory"""
         self.inventory[resource] = self.inventory.get(resource, 0) + quantity
         
-    def produce_resources(self):
-        """Produce resources based on production capacity"""
+    def produce_resources(self, years: float = 1.0):
+        """Produce `years` worth of resources based on production capacity"""
         for resource, rate in self.production_capacity.items():
-            produced_amount = rate * len(self.employees)  # Production based on workforce
+            produced_amount = rate * len(self.employees) * years  # Production based on workforce
             self.update_inventory(resource, produced_amount)
             
     def calculate_operating_costs(self):
         """Calculate monthly operating costs"""
         # Basic implementation - can be expanded based on various factors
-        employee_costs = len(self.employees) * 5000  # Average monthly salary
-        maintenance_costs = sum(self.production_capacity.values()) * 100
+        employee_costs = len(self.employees) * EMPLOYEE_COST
+        maintenance_costs = sum(self.production_capacity.values()) * MAINTENANCE_COST
         self.operating_costs = employee_costs + maintenance_costs
         
     def calculate_revenue(self, market_prices: Dict[str, float]):
@@ -124,63 +213,50 @@ class Corporation:
             "profit": self.revenue - self.operating_costs
         }
         
-    def generate_job_openings(self) -> List[Dict]:
-        """Generate job openings based on corporation needs and growth"""
-        job_openings = []
-        
-        # Base number of desired employees based on production capacity
+    def desired_employees(self) -> int:
+        """Base number of desired employees based on production capacity"""
         total_production_rate = sum(self.production_capacity.values())
-        desired_employees = max(5, int(total_production_rate / 100))  # At least 5 employees
+        return max(5, int(total_production_rate / 100))  # At least 5 employees
+
+    def generate_job_openings(self, rng: Optional[np.random.Generator] = None) -> List[Dict]:
+        """Generate job openings based on corporation needs and growth"""
+        rng = fallback(rng)
         
         # Calculate how many positions to open
         current_employees = len(self.employees)
-        openings_count = max(0, desired_employees - current_employees)
+        openings_count = max(0, self.desired_employees() - current_employees)
         
         # Generate job positions based on industry type
-        job_types = {
-            "manufacturing": ["Production Worker", "Quality Control", "Plant Manager"],
-            "agriculture": ["Farm Worker", "Agricultural Technician", "Field Manager"],
-            "services": ["Service Representative", "Account Manager", "Operations Coordinator"],
-            "technology": ["Software Developer", "System Administrator", "IT Specialist"],
-            "energy": ["Plant Operator", "Maintenance Technician", "Energy Engineer"],
-            "mining": ["Mining Operator", "Safety Inspector", "Site Manager"]
-        }
-        
-        base_salaries = {
-            "Worker": (30000, 45000),
-            "Technician": (40000, 60000),
-            "Manager": (60000, 100000),
-            "Specialist": (50000, 80000),
-            "Engineer": (70000, 110000)
-        }
+        available_positions = JOB_TYPES.get(self.industry_type, DEFAULT_POSITIONS)
+        positions = [available_positions[i] for i in rng.integers(0, len(available_positions), openings_count)]
+        shares = rng.random(openings_count).tolist()
+        education = rng.integers(1, 6, openings_count).tolist()  # 1: Basic, 5: PhD
+        experience = rng.integers(0, 11, openings_count).tolist()
         
-        available_positions = job_types.get(self.industry_type, ["General Worker"])
-        
-        for _ in range(openings_count):
-            position = random.choice(available_positions)
-            
-            # Determine salary range based on position level
-            if "Manager" in position:
-                salary_range = base_salaries["Manager"]
-            elif "Engineer" in position or "Developer" in position:
-                salary_range = base_salaries["Engineer"]
-            elif "Technician" in position or "Specialist" in position:
-                salary_range = base_salaries["Specialist"]
-            else:
-                salary_range = base_salaries["Worker"]
-                
+        job_openings = []
+        for position, share, education_level, experience_years in zip(positions, shares, education, experience):
+            low, high = salary_range(position)
             job_opening = {
                 "corporation_id": self.id,
                 "corporation_name": self.name,
                 "position": position,
                 "industry": self.industry_type,
-                "salary": random.uniform(*salary_range),
+                "salary": low + (high - low) * share,
                 "requirements": {
-                    "education_level": random.randint(1, 5),  # 1: Basic, 5: PhD
-                    "experience_years": random.randint(0, 10)
+                    "education_level": education_level,
+                    "experience_years": experience_years
                 }
             }
             
             job_openings.append(job_opening)
             
-        return job_openings 
\ No newline at end of file
+        return job_openings
+
+def _get_industry_type(corporation: Corporation) -> str:
+    return INDUSTRIES[corporation.industry]
+
+def _set_industry_type(corporation: Corporation, industry_type: str):
+    corporation.industry = INDUSTRIES.code(industry_type)
+
+# Attached after the dataclass is built so `industry_type` stays an __init__ argument
+Corporation.industry_type = property(_get_industry_type, _set_industry_type)
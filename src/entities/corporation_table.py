@@ -0,0 +1,254 @@
+from typing import Dict, Iterator, List, Optional, Sequence, Union
+import numpy as np
+from entities.columnar import ColumnMapping, column_property, name_index
+from entities.corporation import (Corporation, COMPANY_NAMES, INDUSTRIES, RESOURCES, EMPLOYEE_COST,
+                                  MAINTENANCE_COST, draw_initial_corporations)
+from entities.employment import EmployeeRoster
+
+class CorporationTable:
+    """
+    Struct-of-arrays storage for every corporation. Row `i` holds the
+    corporation whose `id` is `i`; production capacity and inventory are
+    (corporations x resources) matrices, so a whole tick of production,
+    costs and revenue is a few array operations. Industries and names are
+    stored as codes (into INDUSTRIES and the table's name pool).
+    `employee_count` is kept current by the EmploymentIndex the table is
+    registered with.
+    """
+    COLUMNS = {
+        "industry": np.int8,  # code in INDUSTRIES
+        "name_code": np.int64,  # code in `name_pool`
+        "region": np.int32,
+        "capital": np.float64,
+        "operating_costs": np.float64,
+        "revenue": np.float64,
+        "profit_margin": np.float64,
+        "employee_count": np.int64,
+    }
+
+    def __init__(self, size: int, resources: Sequence[str] = RESOURCES):
+        self.size = size
+        for column, dtype in self.COLUMNS.items():
+            setattr(self, column, np.zeros(size, dtype=dtype))
+        self.capital.fill(1000000.0)
+        self.profit_margin.fill(0.15)
+        self.name_pool = COMPANY_NAMES
+        self.name_code.fill(self.name_pool.code(""))
+        self.resources = tuple(resources)
+        self.resource_index = name_index(self.resources)
+        self.capacity = np.zeros((size, len(self.resources)))
+        self.inventory = np.zeros((size, len(self.resources)))
+        self.rosters: List[EmployeeRoster] = [EmployeeRoster(row) for row in range(size)]
+
+    @classmethod
+    def generate(cls, count: int, rng: Optional[np.random.Generator] = None) -> 'CorporationTable':
+        """Same corporations as Corporation.generate_initial_corporations with the same generator"""
+        industries, names, capitals, margins, capacity, inventory = draw_initial_corporations(count, rng)
+        table = cls(count)
+        table.industry[:] = industries
+        table.name_code[:] = names
+        table.capital[:] = capitals
+        table.profit_margin[:] = margins
+        table.capacity[:] = capacity
+        table.inventory[:] = inventory
+        return table
+
+    @classmethod
+    def from_arrays(cls, columns: Dict[str, np.ndarray], resources: Sequence[str] = RESOURCES) -> 'CorporationTable':
+        """
+        Wrap existing arrays (e.g. shared memory) without copying them:
+        every column plus `capacity` and `inventory`. The table has no
+        rosters, only what the array kernels need.
+        """
+        table = cls.__new__(cls)
+        table.size = len(columns["capacity"])
+        for column in cls.COLUMNS:
+            setattr(table, column, columns[column])
+        table.name_pool = COMPANY_NAMES
+        table.resources = tuple(resources)
+        table.resource_index = name_index(table.resources)
+        table.capacity = columns["capacity"]
+        table.inventory = columns["inventory"]
+        table.rosters = []
+        return table
+
+    def slice(self, start: int, stop: int) -> 'CorporationTable':
+        """Table over rows `start:stop` that shares memory with this one (without rosters)"""
+        columns = {column: array[start:stop] for column, array in self.arrays().items()}
+        return CorporationTable.from_arrays(columns, self.resources)
+
+    @classmethod
+    def from_corporations(cls, corporations: Sequence[Corporation]) -> 'CorporationTable':
+        """Build a table from Corporation objects whose ids are 0..n-1"""
+        resources = list(RESOURCES)
+        for corporation in corporations:
+            for resource in list(corporation.production_capacity) + list(corporation.inventory):
+                if resource not in resources:
+                    resources.append(resource)
+        table = cls(len(corporations), resources)
+        for corporation in corporations:
+            view = table[corporation.id]
+            for column in ("capital", "operating_costs", "revenue", "profit_margin"):
+                setattr(view, column, getattr(corporation, column))
+            view.name = corporation.name
+            table.industry[corporation.id] = corporation.industry
+            table.region[corporation.id] = corporation.region
+            view.production_capacity = corporation.production_capacity
+            view.inventory = corporation.inventory
+            view.employees.extend(corporation.employees)
+        table.count_employees()
+        return table
+
+    def columns(self) -> Dict[str, np.ndarray]:
+        """Return the per-corporation arrays keyed by column name"""
+        return {column: getattr(self, column) for column in self.COLUMNS}
+
+    def arrays(self) -> Dict[str, np.ndarray]:
+        """Every column plus the capacity and inventory matrices"""
+        arrays = self.columns()
+        arrays["capacity"], arrays["inventory"] = self.capacity, self.inventory
+        return arrays
+
+    def assign(self, column: str, rows, values):
+        """Write `values` into `rows` of a column"""
+        getattr(self, column)[rows] = values
+
+    def count_employees(self):
+        """Recount `employee_count` from the rosters (only needed when no EmploymentIndex keeps it)"""
+        self.employee_count[:] = [len(roster) for roster in self.rosters]
+
+    def by_industry(self, values: Optional[np.ndarray] = None) -> Dict[str, float]:
+        """Corporations (or the sum of a per-corporation array) of every industry present"""
+        return INDUSTRIES.totals(self.industry, values)
+
+    def desired_employees(self) -> np.ndarray:
+        """Vectorized Corporation.desired_employees"""
+        return np.maximum(5, (self.capacity.sum(axis=1) / 100).astype(np.int64))
+
+    def produce_resources(self, years: float = 1.0):
+        """Add `years` of production (capacity x workforce) to every inventory"""
+        workforce = self.employee_count * years if years != 1.0 else self.employee_count
+        self.inventory += self.capacity * workforce[:, None]
+
+    def calculate_operating_costs(self):
+        np.add(self.employee_count * EMPLOYEE_COST, self.capacity.sum(axis=1) * MAINTENANCE_COST,
+               out=self.operating_costs)
+
+    def calculate_revenue(self, prices: np.ndarray):
+        """Revenue of every inventory at `prices`, one price per resource of the table"""
+        np.matmul(self.inventory, prices, out=self.revenue)
+
+    def update(self, prices: np.ndarray, years: float = 1.0):
+        """Production, operating costs and revenue of every corporation for one tick"""
+        self.produce_resources(years)
+        self.calculate_operating_costs()
+        self.calculate_revenue(prices)
+
+    def view(self, row: int) -> 'CorporationView':
+        return CorporationView(self, row)
+
+    def __len__(self) -> int:
+        return self.size
+
+    def __getitem__(self, row: Union[int, slice]) -> Union['CorporationView', List['CorporationView']]:
+        if isinstance(row, slice):
+            return [CorporationView(self, i) for i in range(*row.indices(self.size))]
+        if row < 0:
+            row += self.size
+        if not 0 <= row < self.size:
+            raise IndexError(row)
+        return CorporationView(self, row)
+
+    def __iter__(self) -> Iterator['CorporationView']:
+        for row in range(self.size):
+            yield CorporationView(self, row)
+
+class CorporationView:
+    """Lightweight Corporation backed by one row of a CorporationTable"""
+    __slots__ = ("_table", "_row")
+
+    region = column_property("region")
+    capital = column_property("capital")
+    operating_costs = column_property("operating_costs")
+    revenue = column_property("revenue")
+    profit_margin = column_property("profit_margin")
+
+    def __init__(self, table: CorporationTable, row: int):
+        self._table = table
+        self._row = row
+
+    @property
+    def id(self) -> int:
+        return self._row
+
+    @property
+    def name(self) -> str:
+        return self._table.name_pool.name(self._table.name_code[self._row])
+
+    @name.setter
+    def name(self, value: str):
+        self._table.name_code[self._row] = self._table.name_pool.code(value)
+
+    @property
+    def industry(self) -> int:
+        return self._table.industry[self._row].item()
+
+    @property
+    def industry_type(self) -> str:
+        return INDUSTRIES[self._table.industry[self._row]]
+
+    @industry_type.setter
+    def industry_type(self, value: str):
+        self._table.industry[self._row] = INDUSTRIES.code(value)
+
+    @property
+    def employees(self) -> EmployeeRoster:
+        return self._table.rosters[self._row]
+
+    @employees.setter
+    def employees(self, roster: EmployeeRoster):
+        self._table.rosters[self._row] = roster
+
+    @property
+    def production_capacity(self) -> ColumnMapping:
+        return ColumnMapping(self._table.capacity[self._row], self._table.resource_index)
+
+    @production_capacity.setter
+    def production_capacity(self, values: Dict[str, float]):
+        self._table.capacity[self._row] = 0.0
+        for resource, rate in values.items():
+            self._table.capacity[self._row, self._table.resource_index[resource]] = rate
+
+    @property
+    def inventory(self) -> ColumnMapping:
+        return ColumnMapping(self._table.inventory[self._row], self._table.resource_index)
+
+    @inventory.setter
+    def inventory(self, values: Dict[str, float]):
+        self._table.inventory[self._row] = 0.0
+        for resource, quantity in values.items():
+            self._table.inventory[self._row, self._table.resource_index[resource]] = quantity
+
+    def __eq__(self, other) -> bool:
+        return (isinstance(other, CorporationView) and
+                other._table is self._table and other._row == self._row)
+
+    def __hash__(self) -> int:
+        return hash((id(self._table), self._row))
+
+    def __repr__(self) -> str:
+        return f"CorporationView(id={self._row}, name={self.name!r}, capital={self.capital:.2f})"
+
+    # Behaviour is shared with the object-based Corporation
+    hire_employee = Corporation.hire_employee
+    fire_employee = Corporation.fire_employee
+    hire_many = Corporation.hire_many
+    fire_many = Corporation.fire_many
+    lay_off = Corporation.lay_off
+    update_inventory = Corporation.update_inventory
+    produce_resources = Corporation.produce_resources
+    calculate_operating_costs = Corporation.calculate_operating_costs
+    calculate_revenue = Corporation.calculate_revenue
+    get_financial_status = Corporation.get_financial_status
+    desired_employees = Corporation.desired_employees
+    generate_job_openings = Corporation.generate_job_openings
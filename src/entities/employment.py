@@ -0,0 +1,167 @@
+from typing import Dict, Iterable, Iterator, Optional, Sequence
+import numpy as np
+
+class EmployeeRoster:
+    """
+    Ordered set of the employee ids of one corporation. Supports the list
+    operations corporations use (append, extend, remove, `in`, len) in O(1)
+    per id and keeps the shared EmploymentIndex in sync.
+    """
+    __slots__ = ("corporation_id", "index", "_ids")
+
+    def __init__(self, corporation_id: int, ids: Iterable[int] = (), index: Optional['EmploymentIndex'] = None):
+        self.corporation_id = corporation_id
+        self.index = index
+        self._ids: Dict[int, None] = {}
+        self.extend(ids)
+
+    def __contains__(self, person_id: int) -> bool:
+        return person_id in self._ids
+
+    def __len__(self) -> int:
+        return len(self._ids)
+
+    def __iter__(self) -> Iterator[int]:
+        return iter(self._ids)
+
+    def __eq__(self, other) -> bool:
+        return list(self) == list(other)
+
+    def __repr__(self) -> str:
+        return f"EmployeeRoster({list(self._ids)})"
+
+    def __getstate__(self):
+        # Ids as one array: large rosters are checkpointed as binary blocks
+        return self.corporation_id, self.index, self.to_array()
+
+    def __setstate__(self, state):
+        self.corporation_id, self.index, ids = state
+        self._ids = dict.fromkeys(ids.tolist())
+
+    def append(self, person_id: int):
+        self.extend((person_id,))
+
+    def extend(self, person_ids: Iterable[int]):
+        ids = [int(person_id) for person_id in person_ids if person_id not in self._ids]
+        if self.index is not None and ids:
+            # Quien ya trabaja en otra corporación sale antes de su plantilla
+            self.index._release(np.array(ids, dtype=np.int64), self.corporation_id)
+        self._ids.update(dict.fromkeys(ids))
+        if self.index is not None and ids:
+            self.index._assign(np.array(ids, dtype=np.int64), self.corporation_id)
+
+    def remove(self, person_id: int):
+        if person_id not in self._ids:
+            raise ValueError(f"{person_id} is not an employee of corporation {self.corporation_id}")
+        self.discard_many((person_id,))
+
+    def discard_many(self, person_ids: Iterable[int]) -> np.ndarray:
+        """Remove every id that is on the roster and return the ones removed"""
+        removed = np.array([int(person_id) for person_id in person_ids if self._ids.pop(person_id, 0) is None],
+                           dtype=np.int64)
+        if self.index is not None and len(removed):
+            self.index._assign(removed, -1)
+        return removed
+
+    def to_array(self) -> np.ndarray:
+        return np.fromiter(self._ids, dtype=np.int64, count=len(self._ids))
+
+class EmploymentIndex:
+    """
+    Shared person -> employer mapping plus one roster per corporation. The
+    mapping can be the `employer_id` column of a PopulationTable, so both
+    always agree; over Person objects every change is also written to their
+    `employer_id`.
+    """
+    def __init__(self, employer_of: np.ndarray, people: Optional[Sequence] = None):
+        self.employer_of = employer_of  # -1 means unemployed
+        self.people = people  # Person objects kept in sync with the mapping, if any
+        self.employed = int(np.count_nonzero(employer_of != -1))
+        self.rosters: Dict[int, EmployeeRoster] = {}
+        self.employee_counts = np.zeros(0, dtype=np.int64)  # Per corporation id
+
+    @classmethod
+    def for_population(cls, people: Sequence) -> 'EmploymentIndex':
+        """Index over Person objects (ids 0..n-1), starting from their current employer_id"""
+        return cls(np.array([person.employer_id for person in people], dtype=np.int32), people)
+
+    def register(self, corporation) -> EmployeeRoster:
+        """Give a corporation a roster backed by this index, keeping its current employees"""
+        current = list(corporation.employees)
+        roster = EmployeeRoster(corporation.id, index=self)
+        self.rosters[corporation.id] = roster
+        self._reserve(corporation.id + 1)
+        corporation.employees = roster
+        roster.extend(current)
+        return roster
+
+    def register_table(self, table):
+        """
+        Register every corporation of a CorporationTable at once. The table's
+        `employee_count` column becomes the per-corporation counts, so both
+        always agree.
+        """
+        self._reserve(len(table))
+        if len(self.employee_counts) > len(table):
+            raise ValueError(f"Index already has {len(self.employee_counts)} corporations, table has {len(table)}")
+        table.employee_count[:] = self.employee_counts
+        self.employee_counts = table.employee_count
+        for row, current in enumerate(table.rosters):
+            if len(current):
+                self.register(table[row])
+            else:
+                # Nothing to move over: just attach an empty roster
+                self.rosters[row] = table.rosters[row] = EmployeeRoster(row, index=self)
+
+    def _reserve(self, size: int):
+        if size > len(self.employee_counts):
+            self.employee_counts = np.concatenate(
+                (self.employee_counts, np.zeros(size - len(self.employee_counts), dtype=np.int64)))
+
+    def _release(self, person_ids: np.ndarray, corporation_id: int):
+        """Take people joining `corporation_id` off the roster of any other employer"""
+        previous = self.employer_of[person_ids]
+        moving = (previous != -1) & (previous != corporation_id)
+        for employer in np.unique(previous[moving]).tolist():
+            roster = self.rosters.get(employer)
+            if roster is not None:
+                roster.discard_many(person_ids[previous == employer].tolist())
+
+    def _assign(self, person_ids: np.ndarray, corporation_id: int):
+        """Point people at a new employer (or -1) and keep the per-corporation counts current"""
+        previous = self.employer_of[person_ids]
+        was_employed = previous[previous != -1]
+        np.subtract.at(self.employee_counts, was_employed, 1)
+        self.employer_of[person_ids] = corporation_id
+        if self.people is not None:
+            for person_id in person_ids.tolist():
+                self.people[person_id].employer_id = corporation_id
+        self.employed -= len(was_employed)
+        if corporation_id != -1:
+            self.employee_counts[corporation_id] += len(person_ids)
+            self.employed += len(person_ids)
+
+    def employer(self, person_id: int) -> int:
+        return int(self.employer_of[person_id])
+
+    def employees(self, corporation_id: int) -> np.ndarray:
+        return self.rosters[corporation_id].to_array()
+
+    def hire_many(self, corporation_id: int, person_ids: Iterable[int]) -> int:
+        """Hire people in bulk, moving them off any previous employer's roster"""
+        person_ids = np.asarray(person_ids, dtype=np.int64)
+        roster = self.rosters[corporation_id]
+        person_ids = person_ids[self.employer_of[person_ids] != corporation_id]
+        before = len(roster)
+        roster.extend(person_ids.tolist())
+        return len(roster) - before
+
+    def fire_many(self, corporation_id: int, person_ids: Iterable[int]) -> np.ndarray:
+        """Fire the given employees of one corporation; returns the ids actually fired"""
+        return self.rosters[corporation_id].discard_many(np.asarray(person_ids).tolist())
+
+    def mass_layoff(self, corporation_id: int, fraction: float, rng: np.random.Generator) -> np.ndarray:
+        """Fire a random share of a corporation's workforce at once, drawn from the caller's stream"""
+        staff = self.employees(corporation_id)
+        count = int(round(len(staff) * fraction))
+        return self.fire_many(corporation_id, rng.choice(staff, count, replace=False))
@@ -1,7 +1,10 @@
-from dataclasses import dataclass, field
-from typing import List, Dict
-import random
+from dataclasses import MISSING, InitVar, dataclass, field, fields
+from typing import Any, Callable, List, Dict, Optional, Sequence, Union
 from enum import Enum
+import numpy as np
+from utils.rng import fallback
+
+BASIC_NEEDS_COST = 1000  # Basic needs cost per year (charged pro rata on shorter ticks)
 
 class PersonalityType(Enum):
     NEUROTIC = "Neurotic"
@@ -10,6 +13,19 @@ class PersonalityType(Enum):
     AGREEABLE = "Agreeable"
     EXTROVERT = "Extrovert"
 
+PERSONALITIES = list(PersonalityType)
+
+# Rarely used attributes; each is only created the first time it is accessed
+LAZY_DEFAULTS: Dict[str, Callable[[], Any]] = {
+    "name": lambda: "",
+    "relationships": list,
+    "needs": lambda: {'hunger': 0.0, 'energy': 100.0, 'happiness': 75.0},
+    "job": lambda: None,
+    "finances": lambda: {'cash': 1000.0, 'salary': 0.0, 'savings': 0.0, 'taxes_paid': 0.0},
+    "employment_status": lambda: "unemployed",
+    "region": lambda: None,  # Nueva propiedad para el sistema regional
+}
+
 @dataclass
 class Skill:
     name: str
@@ -22,6 +38,18 @@ class Relationship:
     type: str  # 'friend', 'family', 'romantic', etc.
     strength: float
 
+def _drawn_state(farming: float, manufacturing: float, intelligence: float, personality: int) -> Dict[str, Any]:
+    """Attributes a new Person gets from its initial random draws"""
+    return {
+        "health": 100.0,
+        "intelligence": intelligence,
+        "personality": PERSONALITIES[personality],
+        "skills": {
+            'farming': Skill(name='farming', level=farming),
+            'manufacturing': Skill(name='manufacturing', level=manufacturing)
+        }
+    }
+
 @dataclass
 class Person:
     """Represents an individual in the simulation"""
@@ -35,47 +63,86 @@ class Person:
     happiness: float = 0.5  # 0.0-1.0 scale
     health: float = 1.0  # 0.0-1.0 scale
     location: int = 0  # region_id
+    rng: InitVar[Optional[np.random.Generator]] = None  # Stream for the initial draws
+
+    @classmethod
+    def generate_many(cls, count: int, rng: Optional[np.random.Generator] = None,
+                      **columns: Union[Sequence, Any]) -> List['Person']:
+        """
+        Create `count` people with every random attribute drawn as one array.
+        `columns` gives the other fields, either one value for everyone or a
+        sequence with one value per person. The objects are filled in
+        directly (the same state __init__ would give, without its per-object
+        overhead); rarely used attributes stay lazy.
+        """
+        rng = fallback(rng)
+        skills = rng.normal(50, 15, (count, 2)).tolist()
+        intelligence = rng.uniform(70, 130, count).tolist()
+        personality = rng.integers(0, len(PERSONALITIES), count).tolist()
+        base = {f.name: f.default for f in fields(cls) if f.default is not MISSING}
+        varying = {key: value for key, value in columns.items() if isinstance(value, (list, tuple, np.ndarray))}
+        base.update({key: value for key, value in columns.items() if key not in varying})
+        rows = list(zip(*varying.values())) if varying else None
+        people = []
+        for i in range(count):
+            person = cls.__new__(cls)
+            state = person.__dict__
+            state.update(base)
+            state["person_id"] = i
+            if rows is not None:
+                state.update(zip(varying, rows[i]))
+            state.update(_drawn_state(skills[i][0], skills[i][1], intelligence[i], personality[i]))
+            people.append(person)
+        return people
     
-    def update(self, economy):
-        """Update person's state for one time step"""
+    def update(self, economy, rng: Optional[np.random.Generator] = None):
+        """Update person's state for one year"""
         # Age the person
         self.age += 1
         
         # Basic needs consumption
-        basic_needs_cost = 1000  # Monthly basic needs cost
-        if self.wealth >= basic_needs_cost:
-            self.wealth -= basic_needs_cost
+        paid = self.wealth >= BASIC_NEEDS_COST
+        if paid:
+            self.wealth -= BASIC_NEEDS_COST
             self.happiness = min(1.0, self.happiness + 0.1)
         else:
             self.happiness = max(0.0, self.happiness - 0.2)
             self.health = max(0.0, self.health - 0.1)
+        if economy is not None:
+            economy.record_spending(BASIC_NEEDS_COST if paid else 0.0, BASIC_NEEDS_COST)
         
         # Income from salary
         if self.employer_id != -1:
             self.wealth += self.salary
             
         # Random life events
-        self._handle_random_events()
+        self._handle_random_events(rng)
         
         # Update skills through experience
         if self.employer_id != -1:
-            for skill in self.skills:
-                if self.skills[skill] < 1.0:
-                    self.skills[skill] = min(1.0, self.skills[skill] + 0.01)
+            for name, skill in self.skills.items():
+                # Generated people hold Skill objects, tables and hand-set skills plain levels
+                if isinstance(skill, Skill):
+                    if skill.level < 1.0:
+                        skill.level = min(1.0, skill.level + 0.01)
+                elif skill < 1.0:
+                    self.skills[name] = min(1.0, skill + 0.01)
     
-    def _handle_random_events(self):
+    def _handle_random_events(self, rng: Optional[np.random.Generator] = None):
         """Handle random life events that affect the person"""
         # Small random fluctuations in happiness and health
-        self.happiness += random.uniform(-0.05, 0.05)
+        happiness_change, health_change = fallback(rng).uniform((-0.05, -0.02), (0.05, 0.02))
+        self.happiness += happiness_change
         self.happiness = max(0.0, min(1.0, self.happiness))
         
-        self.health += random.uniform(-0.02, 0.02)
+        self.health += health_change
         self.health = max(0.0, min(1.0, self.health))
     
     def get_employability(self) -> float:
         """Calculate person's employability score"""
         education_factor = self.education_level / 5.0
-        skills_factor = sum(self.skills.values()) / max(len(self.skills), 1)
+        levels = [getattr(skill, "level", skill) for skill in self.skills.values()]
+        skills_factor = sum(levels) / max(len(levels), 1)
         health_factor = self.health
         
         return (education_factor * 0.4 + skills_factor * 0.4 + health_factor * 0.2)
@@ -105,35 +172,24 @@ class Person:
             "skills": self.skills
         }
 
-    def __post_init__(self):
-        self.name: str = ""
-        self.health: float = 100.0
-        self.intelligence: float = random.uniform(70, 130)
-        self.personality: PersonalityType = random.choice(list(PersonalityType))
-        self.relationships: List[Relationship] = []
-        self.needs = {
-            'hunger': 0.0,
-            'energy': 100.0,
-            'happiness': 75.0
-        }
-        self.job = None
-        self.finances = {
-            'cash': 1000.0,
-            'salary': 0.0,
-            'savings': 0.0,
-            'taxes_paid': 0.0
-        }
-        self.employment_status = "unemployed"
-        self.skills = {
-            'farming': Skill(name='farming', level=random.normalvariate(50, 15)),
-            'manufacturing': Skill(name='manufacturing', level=random.normalvariate(50, 15))
-        }
-        self.region = None  # Nueva propiedad para el sistema regional
+    def __post_init__(self, rng: Optional[np.random.Generator]):
+        rng = fallback(rng)
+        farming, manufacturing = rng.normal(50, 15, 2).tolist()
+        self.__dict__.update(_drawn_state(farming, manufacturing, float(rng.uniform(70, 130)),
+                                          int(rng.integers(len(PERSONALITIES)))))
+
+    def __getattr__(self, attr: str) -> Any:
+        # Only reached when the attribute was never set: materialize lazy defaults
+        factory = LAZY_DEFAULTS.get(attr)
+        if factory is None:
+            raise AttributeError(f"'{type(self).__name__}' object has no attribute '{attr}'")
+        value = self.__dict__[attr] = factory()
+        return value
     
     @classmethod
-    def generate_random(cls):
+    def generate_random(cls, rng: Optional[np.random.Generator] = None):
         person = cls()
-        person.age = random.randint(18, 90)
+        person.age = int(fallback(rng).integers(18, 91))
         person.name = "Nombre Generado"  # Implementar generador de nombres
         return person
     
@@ -169,7 +225,9 @@ class Person:
         if self.job:
             # Recibir salario
             gross_salary = self.finances['salary']
-            tax = world.economy.tax_system.calculate_tax(gross_salary)
+            # Same bracket tables as the whole-population collection, regional brackets included
+            tax = float(world.economy.tax_system.calculate_tax_batch(
+                np.array([gross_salary]), np.array([self.location]))[0])
             net_salary = gross_salary - tax
             
             self.finances['cash'] += net_salary
@@ -0,0 +1,280 @@
+from typing import Any, Dict, Iterator, Optional, Sequence
+import numpy as np
+from entities.aggregates import PopulationAggregates
+from entities.columnar import ColumnMapping, column_property, name_index
+from entities.person import Person, PersonalityType, BASIC_NEEDS_COST, PERSONALITIES, LAZY_DEFAULTS
+
+# Attributes that live outside the arrays; they are only stored once a row touches them
+_EXTRA_DEFAULTS = LAZY_DEFAULTS
+KERNEL_BLOCK = 1 << 16  # Rows per block of the household kernel (a block's columns stay in cache)
+
+class PopulationTable:
+    """
+    Struct-of-arrays storage for the whole population. Row `i` holds the
+    person whose `person_id` is `i`.
+    """
+    COLUMNS = {
+        "age": np.int32,
+        "education_level": np.int8,
+        "wealth": np.float64,
+        "salary": np.float64,
+        "employer_id": np.int32,
+        "happiness": np.float32,
+        "health": np.float32,
+        "location": np.int32,
+        "intelligence": np.float32,
+        "personality": np.int8,  # index into PERSONALITIES
+    }
+    DEFAULT_SKILLS = ("farming", "manufacturing")
+
+    def __init__(self, size: int, skill_names: Sequence[str] = DEFAULT_SKILLS):
+        self.size = size
+        for column, dtype in self.COLUMNS.items():
+            setattr(self, column, np.zeros(size, dtype=dtype))
+        self.employer_id.fill(-1)
+        self.happiness.fill(0.5)
+        self.health.fill(1.0)
+        self.skill_names = tuple(skill_names)
+        self.skill_index = name_index(self.skill_names)
+        self.skills = np.zeros((size, len(self.skill_names)), dtype=np.float32)
+        self._extras: Dict[int, Dict[str, Any]] = {}
+        self.stats: Optional[PopulationAggregates] = None
+
+    @classmethod
+    def from_arrays(cls, columns: Dict[str, np.ndarray], skills: np.ndarray,
+                    skill_names: Sequence[str] = DEFAULT_SKILLS) -> 'PopulationTable':
+        """Wrap existing arrays (e.g. shared memory) without copying them"""
+        table = cls.__new__(cls)
+        table.size = len(skills)
+        for column in cls.COLUMNS:
+            setattr(table, column, columns[column])
+        table.skill_names = tuple(skill_names)
+        table.skill_index = name_index(table.skill_names)
+        table.skills = skills
+        table._extras = {}
+        table.stats = None
+        return table
+
+    def slice(self, start: int, stop: int) -> 'PopulationTable':
+        """Table over rows `start:stop` that shares memory with this one"""
+        return PopulationTable.from_arrays(
+            {column: array[start:stop] for column, array in self.columns().items()},
+            self.skills[start:stop], self.skill_names)
+
+    @classmethod
+    def from_people(cls, people: Sequence[Person]) -> 'PopulationTable':
+        """Build a table from existing Person objects (row order follows `people`)"""
+        skill_names = []
+        for person in people:
+            for skill in person.skills:
+                if skill not in skill_names:
+                    skill_names.append(skill)
+        table = cls(len(people), skill_names or cls.DEFAULT_SKILLS)
+        for row, person in enumerate(people):
+            for column in cls.COLUMNS:
+                if column == "personality":
+                    table.personality[row] = PERSONALITIES.index(person.personality)
+                else:
+                    getattr(table, column)[row] = getattr(person, column)
+            for skill, level in person.skills.items():
+                table.skills[row, table.skill_index[skill]] = getattr(level, "level", level)
+            for attr in _EXTRA_DEFAULTS:
+                if attr in vars(person):  # Attributes never touched stay lazy
+                    table.set_extra(row, attr, getattr(person, attr))
+        return table
+
+    def columns(self) -> Dict[str, np.ndarray]:
+        """Return the per-person arrays keyed by column name"""
+        return {column: getattr(self, column) for column in self.COLUMNS}
+
+    def assign(self, column: str, rows, values):
+        """
+        Write `values` into `rows` (distinct row indices) of a column, keeping
+        the running aggregates current. Writes that bypass this method must
+        be followed by `invalidate_stats`.
+        """
+        array = getattr(self, column)
+        if self.stats is not None and not self.stats.stale:
+            values = np.broadcast_to(np.asarray(values, dtype=array.dtype), np.shape(array[rows]))
+            self.stats.on_assign(self, column, rows, array[rows], values)
+        array[rows] = values
+
+    def refresh_stats(self):
+        self.stats.refresh(self.wealth, self.happiness, self.health, self.location)
+
+    def invalidate_stats(self):
+        """Mark the aggregates out of date after a write to (nearly) every row"""
+        if self.stats is not None:
+            self.stats.stale = True
+
+    def current_stats(self) -> Optional[PopulationAggregates]:
+        """The aggregates, rebuilt first if a bulk write left them stale"""
+        if self.stats is not None and self.stats.stale:
+            self.refresh_stats()
+        return self.stats
+
+    def get_extra(self, row: int, attr: str) -> Any:
+        """Read a non-columnar attribute, materializing mutable defaults on first use"""
+        extras = self._extras.get(row)
+        if extras is not None and attr in extras:
+            return extras[attr]
+        value = _EXTRA_DEFAULTS[attr]()
+        if isinstance(value, (list, dict)):
+            self._extras.setdefault(row, {})[attr] = value
+        return value
+
+    def set_extra(self, row: int, attr: str, value: Any):
+        """Store a non-columnar attribute for one row"""
+        self._extras.setdefault(row, {})[attr] = value
+
+    def view(self, row: int) -> 'PersonView':
+        return PersonView(self, row)
+
+    def __len__(self) -> int:
+        return self.size
+
+    def __getitem__(self, row: int) -> 'PersonView':
+        if row < 0:
+            row += self.size
+        if not 0 <= row < self.size:
+            raise IndexError(row)
+        return PersonView(self, row)
+
+    def __iter__(self) -> Iterator['PersonView']:
+        for row in range(self.size):
+            yield PersonView(self, row)
+
+class PersonView:
+    """Lightweight Person backed by one row of a PopulationTable"""
+    __slots__ = ("_table", "_row")
+
+    age = column_property("age")
+    education_level = column_property("education_level")
+    wealth = column_property("wealth")
+    salary = column_property("salary")
+    employer_id = column_property("employer_id")
+    happiness = column_property("happiness")
+    health = column_property("health")
+    location = column_property("location")
+    intelligence = column_property("intelligence")
+
+    def __init__(self, table: PopulationTable, row: int):
+        object.__setattr__(self, "_table", table)
+        object.__setattr__(self, "_row", row)
+
+    @property
+    def person_id(self) -> int:
+        return self._row
+
+    @property
+    def personality(self) -> PersonalityType:
+        return PERSONALITIES[self._table.personality[self._row]]
+
+    @personality.setter
+    def personality(self, value: PersonalityType):
+        self._table.personality[self._row] = PERSONALITIES.index(value)
+
+    @property
+    def skills(self) -> ColumnMapping:
+        return ColumnMapping(self._table.skills[self._row], self._table.skill_index)
+
+    @skills.setter
+    def skills(self, values: Dict[str, float]):
+        self._table.skills[self._row] = 0.0
+        for skill, level in values.items():
+            self._table.skills[self._row, self._table.skill_index[skill]] = getattr(level, "level", level)
+
+    def __getattr__(self, attr: str) -> Any:
+        if attr in _EXTRA_DEFAULTS:
+            return self._table.get_extra(self._row, attr)
+        raise AttributeError(f"'PersonView' object has no attribute '{attr}'")
+
+    def __setattr__(self, attr: str, value: Any):
+        if attr in _EXTRA_DEFAULTS:
+            self._table.set_extra(self._row, attr, value)
+        else:
+            object.__setattr__(self, attr, value)
+
+    def __eq__(self, other) -> bool:
+        return (isinstance(other, PersonView) and
+                other._table is self._table and other._row == self._row)
+
+    def __hash__(self) -> int:
+        return hash((id(self._table), self._row))
+
+    def __repr__(self) -> str:
+        return f"PersonView(person_id={self._row}, age={self.age}, wealth={self.wealth:.2f})"
+
+    # Behaviour is shared with the object-based Person
+    update = Person.update
+    _handle_random_events = Person._handle_random_events
+    get_employability = Person.get_employability
+    apply_for_job = Person.apply_for_job
+    get_status = Person.get_status
+    _make_decisions = Person._make_decisions
+    _satisfy_hunger = Person._satisfy_hunger
+    _find_job = Person._find_job
+    _meets_job_requirements = Person._meets_job_requirements
+    _accept_job = Person._accept_job
+    _handle_finances = Person._handle_finances
+
+def update_population(table: PopulationTable, economy, rng: np.random.Generator):
+    """Vectorized equivalent of calling Person.update on every row of the table"""
+    update_households(table, rng)
+    age_population(table)
+
+def update_households(table: PopulationTable, rng: np.random.Generator, years: float = 1.0) -> float:
+    """
+    Advance household life (basic needs, salary income and random life
+    events) by `years`; returns the amount spent on basic needs. Rows are
+    processed a block at a time and each block is added to the running
+    aggregates while it is still in cache, so they are current on return.
+    """
+    # Random life events: happiness and health noise drawn in a single call,
+    # scaled so that the variance per year does not depend on the tick length
+    noise = rng.random((2, table.size), dtype=np.float32)
+    noise -= np.float32(0.5)
+    scale = np.float32(np.sqrt(years))
+    noise[0] *= np.float32(0.1) * scale   # uniform(-0.05, 0.05) per year
+    noise[1] *= np.float32(0.04) * scale  # uniform(-0.02, 0.02) per year
+
+    cost = BASIC_NEEDS_COST * years
+    stats = table.stats
+    if stats is not None:
+        stats.reset()
+    payers = 0
+    for start in range(0, table.size, KERNEL_BLOCK):
+        rows = slice(start, start + KERNEL_BLOCK)
+        wealth, happiness, health = table.wealth[rows], table.happiness[rows], table.health[rows]
+
+        # Basic needs consumption
+        can_pay = wealth >= cost
+        payers += int(np.count_nonzero(can_pay))
+        np.subtract(wealth, cost, out=wealth, where=can_pay)
+        happiness += np.where(can_pay, np.float32(0.1 * years), np.float32(-0.2 * years))
+        np.clip(happiness, 0.0, 1.0, out=happiness)
+        np.subtract(health, np.float32(0.1 * years), out=health, where=~can_pay)
+        np.maximum(health, 0.0, out=health)
+
+        # Income from salary
+        employed = table.employer_id[rows] != -1
+        if years == 1.0:
+            np.add(wealth, table.salary[rows], out=wealth, where=employed)
+        else:
+            np.add(wealth, table.salary[rows] * years, out=wealth, where=employed)
+
+        happiness += noise[0, rows]
+        np.clip(happiness, 0.0, 1.0, out=happiness)
+        health += noise[1, rows]
+        np.clip(health, 0.0, 1.0, out=health)
+
+        if stats is not None:
+            stats.add_rows(wealth, happiness, health, table.location[rows])
+    return cost * float(payers)
+
+def age_population(table: PopulationTable, years: int = 1):
+    """Add `years` to every age and grow the skills of the employed through experience"""
+    table.age += years
+    employed = table.employer_id != -1
+    grows = employed[:, None] & (table.skills < 1.0)
+    np.minimum(table.skills + np.float32(0.01 * years), np.float32(1.0), out=table.skills, where=grows)
@@ -0,0 +1,88 @@
+from typing import List
+import numpy as np
+
+class RegionIndex:
+    """
+    Ids of the members (people or corporations) of every region, one id
+    array per region, so a region's members are an O(1) slice. Each array
+    has spare capacity at its end; `slot` is the position of every id in its
+    region's array. Moving a batch of ids fills the holes they leave with
+    the tail of their old region and appends them to the new one, so the
+    cost depends on the number of movers, not on the population.
+    """
+    def __init__(self, regions: np.ndarray, region_count: int):
+        self.region_count = region_count
+        self.region = np.array(regions, dtype=np.int32)  # Region of every id, as the index sees it
+        self.slot = np.empty(len(self.region), dtype=np.int32)
+        self.counts = np.bincount(self.region, minlength=region_count).astype(np.int64)
+        order = np.argsort(self.region, kind="stable").astype(np.int32)
+        starts = np.concatenate(([0], np.cumsum(self.counts)))
+        self._members: List[np.ndarray] = []
+        for region in range(region_count):
+            members = order[starts[region]:starts[region + 1]]
+            self.slot[members] = np.arange(len(members), dtype=np.int32)
+            self._members.append(np.concatenate((members, np.empty(len(members) // 8, dtype=np.int32))))
+        self._moving = np.zeros(len(self.region), dtype=bool)
+
+    def __len__(self) -> int:
+        return len(self.region)
+
+    def members(self, region: int) -> np.ndarray:
+        """Ids living in `region` (a view, in no particular order)"""
+        return self._members[region][:self.counts[region]]
+
+    def move(self, ids: np.ndarray, destinations: np.ndarray):
+        """Move a batch of distinct ids to new regions"""
+        ids = np.asarray(ids, dtype=np.int64)
+        destinations = np.broadcast_to(np.asarray(destinations, dtype=np.int32), ids.shape)
+        changed = self.region[ids] != destinations
+        ids, destinations = ids[changed], destinations[changed]
+        if not len(ids):
+            return
+        self._moving[ids] = True
+        for region, leavers in _group_by(ids, self.region[ids]):
+            self._remove(region, leavers)
+        self._moving[ids] = False
+        for region, arrivals in _group_by(ids, destinations):
+            self._append(region, arrivals)
+        self.region[ids] = destinations
+
+    def _remove(self, region: int, leavers: np.ndarray):
+        """Fill the slots of the leavers with the members at the end of the region that stay"""
+        members, count = self._members[region], self.counts[region]
+        end = count - len(leavers)
+        tail = members[end:count]
+        stayers = tail[~self._moving[tail]]
+        holes = self.slot[leavers]
+        holes = holes[holes < end]
+        members[holes] = stayers
+        self.slot[stayers] = holes
+        self.counts[region] = end
+
+    def _append(self, region: int, arrivals: np.ndarray):
+        members, count = self._members[region], self.counts[region]
+        if count + len(arrivals) > len(members):
+            grown = np.empty(max(2 * len(members), count + len(arrivals)), dtype=np.int32)
+            grown[:count] = members[:count]
+            members = self._members[region] = grown
+        members[count:count + len(arrivals)] = arrivals
+        self.slot[arrivals] = np.arange(count, count + len(arrivals), dtype=np.int32)
+        self.counts[region] = count + len(arrivals)
+
+    def check(self, regions: np.ndarray) -> bool:
+        """Whether the index agrees with a region column (a full scan, for tests and debugging)"""
+        if not np.array_equal(self.region, regions):
+            return False
+        for region in range(self.region_count):
+            members = self.members(region)
+            if (not np.array_equal(self.slot[members], np.arange(len(members))) or
+                    np.any(self.region[members] != region)):
+                return False
+        return int(self.counts.sum()) == len(self.region)
+
+def _group_by(ids: np.ndarray, keys: np.ndarray):
+    """(key, ids) for every distinct key of a batch"""
+    order = np.argsort(keys, kind="stable")
+    keys, ids = keys[order], ids[order]
+    values, starts = np.unique(keys, return_index=True)
+    return zip(values.tolist(), np.split(ids, starts[1:]))
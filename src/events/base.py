@@ -10,4 +10,19 @@ class Event(ABC):
         pass
 
 class EconomicEvent(Event):
-    TYPE = "economic" 
\ No newline at end of file
+    TYPE = "economic"
+
+class PoliticalEvent(Event):
+    TYPE = "political"
+
+class EntityEvent(Event):
+    """Event that strikes individual people; `probability` is per person and tick"""
+    TYPE = "entity"
+
+    def trigger(self, world):
+        self.apply(world, range(len(world.population)))
+
+    @abstractmethod
+    def apply(self, world, person_ids):
+        """Apply the event to the people it struck"""
+        pass
@@ -0,0 +1,29 @@
+import numpy as np
+from events.base import EntityEvent
+from entities.population import PopulationTable
+
+class Illness(EntityEvent):
+    """A person falls ill and loses part of their health"""
+    def __init__(self, name: str = "Illness", probability: float = 0.01, severity: float = 0.3):
+        super().__init__(name, probability)
+        self.severity = severity
+
+    def apply(self, world, person_ids):
+        population = world.population
+        if isinstance(population, PopulationTable):
+            population.assign("health", person_ids, np.maximum(population.health[person_ids] - self.severity, 0.0))
+        else:
+            for person_id in person_ids:
+                person = population[person_id]
+                person.health = max(0.0, person.health - self.severity)
+
+class Layoff(EntityEvent):
+    """A worker loses their job"""
+    def __init__(self, name: str = "Layoff", probability: float = 0.005):
+        super().__init__(name, probability)
+
+    def apply(self, world, person_ids):
+        person_ids = np.asarray(person_ids)
+        employers = world.employment.employer_of[person_ids]
+        for corporation_id in np.unique(employers[employers != -1]):
+            world.employment.fire_many(int(corporation_id), person_ids[employers == corporation_id])
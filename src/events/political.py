@@ -0,0 +1,13 @@
+from events.base import PoliticalEvent
+
+class PoliticalShock(PoliticalEvent):
+    """Sudden event that moves political stability and public approval"""
+    def __init__(self, name: str = "Political shock", probability: float = 0.1, max_impact: float = 0.2):
+        super().__init__(name, probability)
+        self.max_impact = max_impact
+
+    def trigger(self, world):
+        politics = world.politics
+        event_impact = world.rng.uniform(-self.max_impact, self.max_impact)
+        politics.stability = max(0.0, min(1.0, politics.stability + event_impact))
+        politics.public_approval = max(0.0, min(1.0, politics.public_approval + event_impact * 0.5))
@@ -0,0 +1,65 @@
+import heapq
+import itertools
+from typing import Dict, List, Optional, Tuple
+import numpy as np
+from events.base import Event, EntityEvent
+
+class EventScheduler:
+    """
+    Fires events without testing every event against every tick and entity.
+    World-level events wait in a priority queue keyed by their next firing
+    tick, drawn from a geometric distribution (the number of ticks until the
+    first success of a per-tick Bernoulli trial). Per-person events draw how
+    many people are struck with one binomial and who with one choice.
+    """
+    def __init__(self, rng: Optional[np.random.Generator] = None):
+        self.rng = rng if rng is not None else np.random.default_rng()
+        self.tick = 0
+        self.entity_events: List[EntityEvent] = []
+        self.fired: Dict[str, int] = {}  # Event name -> times fired (people struck for entity events)
+        self._queue: List[Tuple[int, int, Event]] = []
+        self._order = itertools.count()
+
+    def schedule(self, event: Event):
+        """Register an event; it keeps firing at its own rate until removed"""
+        if isinstance(event, EntityEvent):
+            self.entity_events.append(event)
+        else:
+            self._push(event)
+
+    def remove(self, event: Event):
+        if event in self.entity_events:
+            self.entity_events.remove(event)
+        self._queue = [entry for entry in self._queue if entry[2] is not event]
+        heapq.heapify(self._queue)
+
+    def _push(self, event: Event):
+        if event.probability > 0:
+            wait = int(self.rng.geometric(min(event.probability, 1.0)))
+            heapq.heappush(self._queue, (self.tick + wait, next(self._order), event))
+
+    def next_firing(self) -> Optional[int]:
+        return self._queue[0][0] if self._queue else None
+
+    def advance(self, world) -> int:
+        """Move to the next tick, fire what is due and return the number of firings"""
+        self.tick += 1
+        fired = 0
+        while self._queue and self._queue[0][0] <= self.tick:
+            _, _, event = heapq.heappop(self._queue)
+            event.trigger(world)
+            self._record(event, 1)
+            self._push(event)
+            fired += 1
+
+        population_size = len(world.population)
+        for event in self.entity_events:
+            struck = int(self.rng.binomial(population_size, event.probability))
+            if struck:
+                event.apply(world, self.rng.choice(population_size, struck, replace=False))
+                self._record(event, struck)
+                fired += struck
+        return fired
+
+    def _record(self, event: Event, count: int):
+        self.fired[event.name] = self.fired.get(event.name, 0) + count
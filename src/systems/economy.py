@@ -1,8 +1,15 @@
 from dataclasses import dataclass
-from typing import Dict, List
+from typing import Dict, List, Optional, Sequence, Tuple, Union
 from enum import Enum
+import numpy as np
 from entities.corporation import Corporation
+from entities.corporation_table import CorporationTable
 from entities.person import Person
+from entities.population import PopulationTable
+from systems.labor import JobMarket
+from systems.market import MarketClearing, HOUSEHOLD_DEMAND, reference_prices
+from systems.trade import TradeEngine, TRADE_THRESHOLD, trade_quantity
+from utils.profiler import Profiler
 
 @dataclass
 class EconomicState:
@@ -11,6 +18,8 @@ class EconomicState:
     demand: Dict[str, float]
     supply: Dict[str, float]
     unemployment_rate: float = 0.05
+    consumer_spending: float = 0.0  # Spent on basic needs since the previous market session
+    needs_met: float = 1.0  # Share of the basic needs paid for in that time; scales demand without an auction
 
 class TaxBracket:
     def __init__(self, min_income: float, max_income: float, rate: float):
@@ -27,6 +36,13 @@ class TaxSystem:
             TaxBracket(70001, float('inf'), 0.35)  # 35% más de 70k
         ]
         self.total_revenue = 0.0
+        self.regional_brackets: Dict[int, List[TaxBracket]] = {}  # region_id -> brackets
+        self.regional_revenue: Dict[int, float] = {}
+        self._tables: Dict[Optional[int], Tuple[tuple, Tuple[np.ndarray, ...]]] = {}
+
+    def set_regional_brackets(self, region_id: int, brackets: List[TaxBracket]):
+        """Use a separate bracket table for people living in `region_id`"""
+        self.regional_brackets[region_id] = brackets
 
     def calculate_tax(self, income: float) -> float:
         total_tax = 0.0
@@ -46,8 +62,72 @@ class TaxSystem:
 
         return total_tax
 
+    def calculate_tax_batch(self, incomes: np.ndarray, regions: Optional[np.ndarray] = None) -> np.ndarray:
+        """Compute the tax owed on every income at once (same result as calculate_tax)"""
+        incomes = np.asarray(incomes, dtype=np.float64)
+        if regions is None or not self.regional_brackets:
+            return self._apply_table(None, incomes)
+
+        taxes = np.empty_like(incomes)
+        regional = np.isin(regions, list(self.regional_brackets))
+        taxes[~regional] = self._apply_table(None, incomes[~regional])
+        for region_id in self.regional_brackets:
+            mask = regions == region_id
+            if mask.any():
+                taxes[mask] = self._apply_table(region_id, incomes[mask])
+        return taxes
+
+    def collect_batch(self, incomes: np.ndarray, regions: Optional[np.ndarray] = None,
+                      share: float = 1.0) -> Tuple[np.ndarray, Dict[int, float]]:
+        """
+        Tax every income, record the revenue and return the taxes and
+        per-region totals. `share` is the part of the annual tax collected
+        now (e.g. 1/12 for monthly withholding).
+        """
+        taxes = self.calculate_tax_batch(incomes, regions)
+        if share != 1.0:
+            taxes *= share
+        self.total_revenue = float(taxes.sum())
+        if regions is None:
+            self.regional_revenue = {}
+        else:
+            totals = np.bincount(regions, weights=taxes)
+            self.regional_revenue = {
+                region_id: float(total) for region_id, total in enumerate(totals) if total
+            }
+        return taxes, self.regional_revenue
+
+    def _apply_table(self, region_id: Optional[int], incomes: np.ndarray) -> np.ndarray:
+        thresholds, widths, rates, base = self._bracket_table(region_id)
+        # Índice del tramo en el que cae cada ingreso
+        index = np.searchsorted(thresholds, incomes, side="right") - 1
+        np.clip(index, 0, len(thresholds) - 1, out=index)
+        taxable = np.minimum(incomes - thresholds[index], widths[index])
+        return np.where(incomes > 0, base[index] + taxable * rates[index], 0.0)
+
+    def _bracket_table(self, region_id: Optional[int]) -> Tuple[np.ndarray, ...]:
+        """Cumulative thresholds and base taxes, rebuilt only when the brackets change"""
+        brackets = self.brackets if region_id is None else self.regional_brackets[region_id]
+        signature = tuple((b.min_income, b.max_income, b.rate) for b in brackets)
+        cached = self._tables.get(region_id)
+        if cached is not None and cached[0] == signature:
+            return cached[1]
+
+        widths = np.array([b.max_income - b.min_income for b in brackets], dtype=np.float64)
+        rates = np.array([b.rate for b in brackets], dtype=np.float64)
+        # Only the brackets below the last one have a base: the last may be unbounded (and untaxed)
+        thresholds = np.concatenate(([0.0], np.cumsum(widths[:-1])))
+        base = np.concatenate(([0.0], np.cumsum(widths[:-1] * rates[:-1])))
+        table = (thresholds, widths, rates, base)
+        self._tables[region_id] = (signature, table)
+        return table
+
+MIN_PRICE_RATIO = 0.5  # Bounds of the demand/supply ratio used to nudge prices
+MAX_PRICE_RATIO = 2.0
+
 class EconomySystem:
-    def __init__(self):
+    def __init__(self, rng: Optional[np.random.Generator] = None):
+        self.rng = rng if rng is not None else np.random.default_rng()
         self.state = EconomicState(
             resources={},
             prices={},
@@ -57,7 +137,12 @@ class EconomySystem:
         self.job_market = []
         self.tax_system = TaxSystem()
         self.regional_markets = {}
+        self.trade: Optional[TradeEngine] = None
+        self.market: Optional[MarketClearing] = None
         self.markets: Dict[str, float] = {}
+        self.pending_spending = 0.0
+        self.pending_needs = 0.0  # Cost of the basic needs due over the same time
+        self.profiler = Profiler()  # Disabled unless the world shares an enabled one
         
     def set_initial_resources(self, resources: Dict[str, float]):
         self.state.resources = resources
@@ -70,66 +155,161 @@ class EconomySystem:
     def initialize_markets(self, initial_resources: Dict[str, float]):
         """Initialize the markets with given resources"""
         self.markets = initial_resources.copy()
+        self.set_initial_resources(self.markets.copy())
+
+    def calibrate_prices(self, corporations: Union[List[Corporation], CorporationTable]):
+        """
+        Start the prices at the cost-based prices the corporations ask (see
+        market.reference_prices), so the first session does not jump to
+        another scale. Resources no corporation produces are left unpriced.
+        """
+        if not isinstance(corporations, CorporationTable):
+            corporations = CorporationTable.from_corporations(corporations)
+        self.state.prices = reference_prices(corporations)
+
+    def initialize_clearing(self, resources: List[str], region_count: int):
+        """Clear goods markets by auction between corporation inventories and households"""
+        resources = [resource for resource in resources if resource in self.state.prices]  # Only what is produced
+        self.market = MarketClearing(resources, region_count, self.state.prices)
+        # El comercio interregional mueve entonces los inventarios de las corporaciones a los precios de la subasta
+        self.trade = TradeEngine(resources, region_count)
+
+    def initialize_regional_markets(self, region_count: int, demand_factors: Optional[np.ndarray] = None):
+        """Create the vectorized inter-regional trade engine, splitting resources evenly"""
+        resources = list(self.markets)
+        stock = np.array([self.markets[resource] for resource in resources]) / max(region_count, 1)
+        self.trade = TradeEngine(resources, region_count, demand_factors,
+                                 inventory=np.tile(stock, (region_count, 1)))
         
-    def update(self, corporations: List[Corporation], population: List[Person]):
-        # Actualizar oferta y demanda
-        self._calculate_demand(population)
-        self._calculate_supply(corporations)
-        self._adjust_prices()
+    def update(self, corporations: Union[List[Corporation], CorporationTable],
+               population: Union[List[Person], PopulationTable], years: float = 1.0):
+        """Run one market session; taxes withheld cover `years` of income"""
+        profiler = self.profiler
+        # El gasto acumulado desde la sesión anterior pasa al estado; sin gasto nuevo se mantiene la cobertura
+        self.state.consumer_spending = self.pending_spending
+        if self.pending_needs > 0:
+            self.state.needs_met = self.pending_spending / self.pending_needs
+        self.pending_spending = self.pending_needs = 0.0
+
+        if (self.market is not None and isinstance(corporations, CorporationTable)
+                and isinstance(population, PopulationTable)):
+            # Subasta por región y recurso entre inventarios y hogares
+            with profiler.phase("clearing"):
+                profiler.count("market_fills", self.market.clear(corporations, population, years))
+                self._record_clearing()
+        else:
+            # Actualizar oferta y demanda
+            with profiler.phase("demand"):
+                self._calculate_demand(population, years)
+            with profiler.phase("supply"):
+                self._calculate_supply(corporations)
+            with profiler.phase("prices"):
+                self._adjust_prices()
         
         # Actualizar mercado laboral y recaudar impuestos
-        self._update_job_market(corporations, population)
-        self._collect_taxes(population)
+        with profiler.phase("job_market"):
+            self._update_job_market(corporations, population)
+        with profiler.phase("taxes"):
+            self._collect_taxes(population, years)
+        profiler.count("taxes_collected", self.tax_system.total_revenue)
         
         # Actualizar flujos económicos regionales
-        self._update_regional_markets()
+        with profiler.phase("regional_markets"):
+            self._update_regional_markets(corporations)
+
+    def record_spending(self, amount: float, due: float):
+        """
+        Accumulate what households spent on basic needs, and what those needs
+        cost in full, until the next market session
+        """
+        self.pending_spending += amount
+        self.pending_needs += due
     
-    def _calculate_demand(self, population: List[Person]):
-        # Calcular demanda basada en población
-        total_pop = len(population)
-        self.state.demand = {
-            'food': total_pop * 0.8,
-            'water': total_pop * 1.2,
-            'energy': total_pop * 0.5
-        }
+    def _record_clearing(self):
+        """Publish the national figures of the last clearing session"""
+        market = self.market
+        self.state.demand = dict(zip(market.resources, market.demand.sum(axis=0).tolist()))
+        self.state.supply = dict(zip(market.resources, market.supply.sum(axis=0).tolist()))
+        self.state.prices.update(market.national_prices())
+
+    def _calculate_demand(self, population: Union[List[Person], PopulationTable], years: float = 1.0):
+        # Calcular demanda basada en población: solo consume quien pudo cubrir sus necesidades básicas
+        consumers = len(population) * self.state.needs_met
+        self.state.demand = {resource: consumers * quantity * years for resource, quantity in HOUSEHOLD_DEMAND.items()}
     
-    def _calculate_supply(self, corporations: List[Corporation]):
-        # Calcular oferta basada en recursos
-        self.state.supply = {
-            resource: quantity * 0.8  # Eficiencia de producción
-            for resource, quantity in self.state.resources.items()
-        }
+    def _calculate_supply(self, corporations: Union[List[Corporation], CorporationTable]):
+        # La oferta es lo que las corporaciones tienen en inventario
+        if isinstance(corporations, CorporationTable):
+            totals = corporations.inventory.sum(axis=0)
+            self.state.supply = dict(zip(corporations.resources, totals.tolist()))
+            return
+        supply: Dict[str, float] = {}
+        for corp in corporations:
+            for resource, quantity in corp.inventory.items():
+                supply[resource] = supply.get(resource, 0.0) + quantity
+        self.state.supply = supply
     
     def _adjust_prices(self):
         # Ajustar precios basados en oferta/demanda
         for resource in self.state.prices:
             demand = self.state.demand.get(resource, 0)
             supply = self.state.supply.get(resource, 0)
-            ratio = demand / (supply + 1e-5)
+            # Acotado para que un recurso sin oferta no dispare el precio
+            ratio = min(max(demand / (supply + 1e-5), MIN_PRICE_RATIO), MAX_PRICE_RATIO)
             self.state.prices[resource] *= 1 + (ratio - 1) * 0.1  # Factor de ajuste
             
-    def _update_job_market(self, corporations: List[Corporation], population: List[Person]):
-        # Actualizar ofertas de empleo
-        self.job_market = [
-            job for corp in corporations
-            for job in corp.generate_job_openings()
-        ]
+    def _update_job_market(self, corporations: Union[List[Corporation], CorporationTable],
+                           population: Union[List[Person], PopulationTable]):
+        if isinstance(population, PopulationTable):
+            # El registro de vacantes persiste: solo cambia con contrataciones y despidos
+            if not isinstance(self.job_market, JobMarket):
+                self.job_market = JobMarket(corporations, self.rng)
+            self.job_market.sync(corporations)
+            # Emparejar a todos los desempleados con las vacantes en una sola pasada
+            self.profiler.count("hires", self.job_market.match(population))
+            # Las plantillas se mantienen al día con cada contratación: no hace falta recorrer la población
+            if isinstance(corporations, CorporationTable):
+                employed = int(corporations.employee_count.sum())
+            else:
+                employed = sum(len(corp.employees) for corp in corporations)
+        else:
+            # Actualizar ofertas de empleo
+            self.job_market = [
+                job for corp in corporations
+                for job in corp.generate_job_openings(self.rng)
+            ]
+            employed = sum(1 for p in population if p.job)
         # Calcular tasa de desempleo
-        employed = sum(1 for p in population if p.job)
-        self.state.unemployment_rate = 1 - (employed / len(population)) 
+        self.state.unemployment_rate = 1 - (employed / len(population))
     
-    def _collect_taxes(self, population: List[Person]):
+    def _collect_taxes(self, population: Union[List[Person], PopulationTable], years: float = 1.0):
         """Recauda impuestos de la población activa"""
-        total_revenue = 0.0
-        for person in population:
-            if person.job and person.finances['salary'] > 0:
-                tax = self.tax_system.calculate_tax(person.finances['salary'])
-                person.finances['cash'] -= tax
-                total_revenue += tax
-        self.tax_system.total_revenue = total_revenue
+        if isinstance(population, PopulationTable):
+            # En la tabla el efectivo de cada persona es su riqueza
+            taxed = np.flatnonzero((population.employer_id != -1) & (population.salary > 0))
+            taxes, _ = self.tax_system.collect_batch(population.salary[taxed], population.location[taxed], years)
+            population.assign("wealth", taxed, population.wealth[taxed] - taxes)
+            return
+
+        # Con objetos se reúnen los salarios y se aplica la misma tabla de tramos de una vez
+        taxed = [person for person in population if person.job and person.finances['salary'] > 0]
+        salaries = np.array([person.finances['salary'] for person in taxed], dtype=np.float64)
+        regions = np.array([person.location for person in taxed], dtype=np.int64)
+        taxes, _ = self.tax_system.collect_batch(salaries, regions, years)
+        for person, tax in zip(taxed, taxes.tolist()):
+            person.finances['cash'] -= tax
     
-    def _update_regional_markets(self):
+    def _update_regional_markets(self, corporations: Union[List[Corporation], CorporationTable, None] = None):
         """Actualiza los mercados regionales y sus interacciones"""
+        if self.trade is not None:
+            if self.market is not None and isinstance(corporations, CorporationTable):
+                # Los envíos llegan a los inventarios que se subastan en la próxima sesión
+                self.profiler.count("trades_executed", self.trade.exchange(corporations, self.market.prices))
+                return
+            self.trade.update_prices(self.state.prices)
+            self.profiler.count("trades_executed", self.trade.step())
+            return
+
         for region, market in self.regional_markets.items():
             # Actualizar precios regionales
             for resource, base_price in self.state.prices.items():
@@ -145,9 +325,25 @@ class EconomySystem:
                 for resource in self.state.prices:
                     price_diff = (self.regional_markets[region]['prices'][resource] - 
                                 other_market['prices'][resource])
-                    if abs(price_diff) > 0.1:  # Umbral mínimo para comercio
-                        self._execute_trade(region, other_region, resource, price_diff) 
+                    if abs(price_diff) > TRADE_THRESHOLD:  # Umbral mínimo para comercio
+                        self._execute_trade(region, other_region, resource, price_diff)
+
+    def _execute_trade(self, region, other_region, resource, price_diff):
+        """Ejecuta un intercambio: la región más cara importa de la más barata"""
+        if price_diff <= 0:
+            return  # Se resuelve al recorrer la otra región
+        importer = self.regional_markets[region]
+        exporter = self.regional_markets[other_region]
+        stock = exporter['inventory'].get(resource, 0.0)
+        quantity = trade_quantity(importer['prices'][resource], price_diff, stock)
+        exporter['inventory'][resource] = stock - quantity
+        importer['inventory'][resource] = importer['inventory'].get(resource, 0.0) + quantity
 
     def get_market_prices(self) -> Dict[str, float]:
         """Get current market prices"""
-        return self.markets.copy() 
\ No newline at end of file
+        return self.state.prices.copy()
+
+    def price_vector(self, resources: Sequence[str]) -> np.ndarray:
+        """Market prices as an array in the order of `resources` (0 for untraded ones)"""
+        prices = self.get_market_prices()
+        return np.array([prices.get(resource, 0.0) for resource in resources], dtype=np.float64) 
\ No newline at end of file
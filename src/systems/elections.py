@@ -0,0 +1,154 @@
+from dataclasses import dataclass
+from typing import Dict, List, Sequence, Union
+import numpy as np
+from entities.person import Person, PERSONALITIES, PersonalityType
+from entities.population import PopulationTable
+
+VOTER_BLOCK = 1 << 20  # Voters scored at once; bounds the (voters x parties) scratch matrices
+SUPPORT_WEIGHT = 1.0  # Pull of a party's support level
+APPROVAL_WEIGHT = 2.0  # Pull of (approval - 0.5) towards the ruling party
+WEALTH_REFERENCE = 3.0  # log10 of the wealth a voter is neutral at
+
+# Lean of each ideology on the voter features: log10 wealth (relative to the
+# reference), happiness and employment (both centred on 0.5)
+IDEOLOGY_WEIGHTS = {
+    "progressive": (-0.3, -0.4, -0.3),
+    "conservative": (0.3, 0.4, 0.3),
+    "moderate": (0.0, 0.1, 0.0),
+}
+PERSONALITY_LEAN = {
+    "progressive": {PersonalityType.OPEN: 0.3, PersonalityType.EXTROVERT: 0.1},
+    "conservative": {PersonalityType.CONSCIENTIOUS: 0.3, PersonalityType.NEUROTIC: 0.1},
+    "moderate": {PersonalityType.AGREEABLE: 0.3},
+}
+
+@dataclass
+class ElectionResult:
+    """Vote counts of one election, by region (regions x parties)"""
+    parties: List[str]
+    votes: np.ndarray
+
+    @property
+    def national_votes(self) -> np.ndarray:
+        return self.votes.sum(axis=0)
+
+    @property
+    def shares(self) -> np.ndarray:
+        """National vote share of every party"""
+        total = self.votes.sum()
+        return self.national_votes / total if total else np.zeros(len(self.parties))
+
+    @property
+    def regional_shares(self) -> np.ndarray:
+        """Vote share of every party in every region (zero where nobody lives)"""
+        totals = self.votes.sum(axis=1, keepdims=True)
+        return np.divide(self.votes, totals, out=np.zeros(self.votes.shape), where=totals > 0)
+
+    @property
+    def winner(self) -> int:
+        return int(self.national_votes.argmax())
+
+    @property
+    def regional_winners(self) -> np.ndarray:
+        return self.votes.argmax(axis=1)
+
+class ElectionEngine:
+    """
+    Every voter scores every party from their own attributes: a linear
+    model of wealth, happiness and employment per ideology, a lean per
+    personality and the party's standing in the voter's region (support,
+    plus the approval of the regional government for the ruling party).
+    Voters choose by multinomial logit on those scores, sampled by inverse
+    CDF: one uniform draw per voter against the running totals of the
+    exp-scores. Region, personality and employment are discrete, so their part
+    of the score is one lookup per party in a (parties x groups) table;
+    voters are processed a block at a time and ballots are tallied per
+    region with one bincount per block.
+    """
+    def __init__(self, region_count: int):
+        self.region_count = region_count
+
+    def run(self, population: Union[PopulationTable, Sequence[Person]], ideologies: Sequence[str],
+            standing: np.ndarray, rng: np.random.Generator) -> np.ndarray:
+        """
+        Votes (regions x parties). `standing` (regions x parties) is each
+        party's baseline score in each region.
+        """
+        parties = len(ideologies)
+        weights = np.array([IDEOLOGY_WEIGHTS.get(ideology, (0.0, 0.0, 0.0)) for ideology in ideologies],
+                           dtype=np.float32)  # parties x features
+        lean = np.array([[PERSONALITY_LEAN.get(ideology, {}).get(personality, 0.0) for personality in PERSONALITIES]
+                         for ideology in ideologies], dtype=np.float32)  # parties x personalities
+        # Score of every (region, personality, employed) group, flattened in that order
+        employed = np.array([-0.5, 0.5], dtype=np.float32)
+        groups = (standing.T[:, :, None, None] + lean[:, None, :, None] +
+                  weights[:, 2, None, None, None] * employed).reshape(parties, -1).astype(np.float32)
+
+        columns = _voter_columns(population)
+        _check_codes(columns["location"], self.region_count, "region")
+        _check_codes(columns["personality"], len(PERSONALITIES), "personality")
+        votes = np.zeros(self.region_count * parties, dtype=np.int64)
+        # Scratch buffers are reused by every block (fresh ones would be paged in each time)
+        capacity = min(VOTER_BLOCK, len(columns["location"]))
+        buffers = {"group": np.empty(capacity, dtype=np.int32), "wealth": np.empty(capacity, dtype=np.float32),
+                   "happiness": np.empty(capacity, dtype=np.float32), "scratch": np.empty(capacity, dtype=np.float32),
+                   "draw": np.empty(capacity, dtype=np.float32), "choice": np.empty(capacity, dtype=np.int32),
+                   "odds": np.empty((parties, capacity), dtype=np.float32)}
+        for start in range(0, len(columns["location"]), VOTER_BLOCK):
+            block = {name: column[start:start + VOTER_BLOCK] for name, column in columns.items()}
+            size = len(block["location"])
+            group, wealth, happiness, scratch, draw, choice = (buffers[name][:size] for name in
+                                                               ("group", "wealth", "happiness", "scratch",
+                                                                "draw", "choice"))
+            odds = buffers["odds"][:, :size]
+            np.multiply(block["location"], len(PERSONALITIES), out=group, casting="unsafe")
+            group += block["personality"]
+            group *= 2
+            group += block["employer_id"] != -1
+            np.maximum(block["wealth"], 0.0, out=wealth, casting="same_kind")
+            wealth += np.float32(1.0)
+            np.log10(wealth, out=wealth)
+            wealth -= np.float32(WEALTH_REFERENCE)
+            np.subtract(block["happiness"], np.float32(0.5), out=happiness, casting="same_kind")
+
+            # Peso de cada partido para cada votante: exp(puntuación)
+            for party in range(parties):
+                np.take(groups[party], group, out=odds[party], mode="clip")  # Codes were checked up front
+                np.multiply(wealth, weights[party, 0], out=scratch)
+                odds[party] += scratch
+                np.multiply(happiness, weights[party, 1], out=scratch)
+                odds[party] += scratch
+                np.exp(odds[party], out=odds[party])
+            for party in range(1, parties):
+                odds[party] += odds[party - 1]  # Running totals (np.cumsum is much slower on this layout)
+            rng.random(dtype=np.float32, out=draw)
+            draw *= odds[-1]
+            choice.fill(0)
+            for party in range(parties - 1):
+                choice += draw >= odds[party]
+
+            group //= 2 * len(PERSONALITIES)
+            group *= parties
+            group += choice
+            votes += np.bincount(group, minlength=len(votes))
+        return votes.reshape(self.region_count, parties)
+
+def _check_codes(codes: np.ndarray, count: int, name: str):
+    """Reject codes outside 0..count-1, which the group lookup would otherwise clip onto the last group"""
+    if len(codes) and (codes.min() < 0 or codes.max() >= count):
+        bad = codes[(codes < 0) | (codes >= count)]
+        raise ValueError(f"{len(bad)} voters have a {name} code outside 0..{count - 1} (e.g. {bad[0]})")
+
+def _voter_columns(population: Union[PopulationTable, Sequence[Person]]) -> Dict[str, np.ndarray]:
+    """The columns a vote depends on, straight from the table or gathered from Person objects"""
+    if isinstance(population, PopulationTable):
+        return {name: getattr(population, name)
+                for name in ("location", "personality", "wealth", "happiness", "employer_id")}
+    codes = {personality: code for code, personality in enumerate(PERSONALITIES)}
+    return {
+        "location": np.array([person.location for person in population], dtype=np.int64),
+        "personality": np.array([codes[person.personality] for person in population], dtype=np.int64),
+        "wealth": np.array([person.wealth for person in population], dtype=np.float64),
+        "happiness": np.array([person.happiness for person in population], dtype=np.float32),
+        "employer_id": np.array([person.employer_id for person in population], dtype=np.int64),
+    }
@@ -0,0 +1,341 @@
+from typing import Dict, Iterable, Iterator, List, Optional, Sequence, Set, Tuple, Union
+import numpy as np
+from entities.corporation import Corporation, INDUSTRIES, JOB_TYPES, DEFAULT_POSITIONS, salary_range
+from entities.corporation_table import CorporationTable
+from entities.population import PopulationTable
+from utils.categorical import Categories, categories
+
+MIN_EMPLOYABILITY = 0.5  # Same threshold as Person.apply_for_job
+
+# Integer codes for every known position and the salary range each one pays
+POSITIONS = categories("position", [position for positions in JOB_TYPES.values() for position in positions] +
+                       DEFAULT_POSITIONS)
+SALARY_LOW = np.array([salary_range(position)[0] for position in POSITIONS], dtype=np.float32)
+SALARY_HIGH = np.array([salary_range(position)[1] for position in POSITIONS], dtype=np.float32)
+
+class JobMarket:
+    """
+    Persistent vacancy ledger. Openings are stored as integer-coded columns
+    (corporation, position, industry, education requirement) in buffers
+    that grow geometrically; the slots of filled or withdrawn openings go on
+    a free list and are reused by the next ones. Each corporation keeps the
+    set of its open slots, and openings are filed in buckets by required
+    education level and industry, each bucket a few runs sorted by salary
+    (highest first). Creating, filling and withdrawing openings costs in
+    proportion to the openings involved, not to the size of the ledger.
+    """
+    COLUMNS = {
+        "corporation_id": np.int32,
+        "position": np.int16,
+        "industry": np.int16,
+        "education_level": np.int8,
+        "experience_years": np.int8,
+        "salary": np.float32,
+        "open": bool,
+        "_stamp": np.uint32,  # Bumped whenever a slot is reused, so old bucket entries for it are recognised as dead
+    }
+    RUN_GROWTH = 2  # A bucket's last two runs are merged once the older is at most this many times longer
+
+    def __init__(self, corporations: Sequence[Corporation] = (), rng: Optional[np.random.Generator] = None):
+        self.corporations: Dict[int, Corporation] = {corp.id: corp for corp in corporations}
+        self.rng = rng if rng is not None else np.random.default_rng()
+        self.industries: Categories = INDUSTRIES
+        self.positions: Categories = POSITIONS
+        for column, dtype in self.COLUMNS.items():
+            setattr(self, column, np.zeros(0, dtype=dtype))
+        self._size = 0  # Slots ever used; the rest of the buffers is spare capacity
+        self._free = np.empty(0, dtype=np.int64)  # Stack of reusable slots
+        self._free_count = 0
+        self.open_count = np.zeros(0, dtype=np.int32)  # Open seats per corporation id
+        self.open_total = 0
+        self._open_slots: Dict[int, Set[int]] = {}  # Corporation id -> its open slots
+        # (education level, industry) -> runs of (slots, their stamps), each run ordered by salary
+        self._buckets: Dict[Tuple[int, int], List[Tuple[np.ndarray, np.ndarray]]] = {}
+        self._build_position_table()
+
+    @classmethod
+    def from_openings(cls, openings: List[Dict], corporations: Sequence[Corporation] = ()) -> 'JobMarket':
+        """Build the ledger from job-opening dicts as produced by Corporation.generate_job_openings"""
+        market = cls(corporations)
+        count = len(openings)
+        market._append(
+            np.fromiter((job["corporation_id"] for job in openings), np.int32, count),
+            market.positions.encode(job["position"] for job in openings),
+            np.fromiter((market._industry_code(job["industry"]) for job in openings), np.int16, count),
+            np.fromiter((job["requirements"]["education_level"] for job in openings), np.int8, count),
+            np.fromiter((job["requirements"]["experience_years"] for job in openings), np.int8, count),
+            np.fromiter((job["salary"] for job in openings), np.float32, count)
+        )
+        return market
+
+    def _industry_code(self, industry: str) -> int:
+        code = self.industries.code(industry)
+        if code >= len(self._position_counts):
+            self._build_position_table()
+        return code
+
+    def _build_position_table(self):
+        """Position codes each industry can offer, padded into a matrix"""
+        rows = [[self.positions.code(position) for position in JOB_TYPES.get(industry, DEFAULT_POSITIONS)]
+                for industry in self.industries]
+        self._position_counts = np.array([len(row) for row in rows], dtype=np.int64)
+        self._position_table = np.zeros((len(rows), self._position_counts.max()), dtype=np.int16)
+        for code, row in enumerate(rows):
+            self._position_table[code, :len(row)] = row
+
+    def sync(self, corporations: Union[Iterable[Corporation], CorporationTable]):
+        """Open or withdraw seats for the corporations whose staffing gap changed"""
+        if isinstance(corporations, CorporationTable):
+            # Staffing of the whole table in a few array operations
+            if len(self.corporations) < len(corporations):
+                self.corporations.update((corp.id, corp) for corp in corporations)
+            ids = np.arange(len(corporations))
+            desired, staffed = corporations.desired_employees(), corporations.employee_count
+            industries = corporations.industry.astype(np.int64)
+            if len(industries) and industries.max() >= len(self._position_counts):
+                self._build_position_table()
+        else:
+            ids, desired, staffed, industries = [], [], [], []
+            for corp in corporations:
+                if corp.id not in self.corporations:
+                    self.corporations[corp.id] = corp
+                ids.append(corp.id)
+                desired.append(corp.desired_employees())
+                staffed.append(len(corp.employees))
+                industries.append(self._industry_code(corp.industry_type))
+            ids = np.array(ids, dtype=np.int64)
+        if not len(ids):
+            return
+        self._reserve_corporations(int(ids.max()) + 1)
+        gap = np.maximum(np.asarray(desired) - np.asarray(staffed), 0) - self.open_count[ids]
+
+        # Withdraw first, so the new openings can reuse the freed slots
+        for corporation_id, excess in zip(ids[gap < 0].tolist(), (-gap[gap < 0]).tolist()):
+            self._withdraw(corporation_id, excess)
+        grow = gap > 0
+        if grow.any():
+            self._create(np.repeat(ids[grow], gap[grow]),
+                         np.repeat(np.array(industries, dtype=np.int64)[grow], gap[grow]))
+
+    def _reserve_corporations(self, size: int):
+        if size > len(self.open_count):
+            self.open_count = np.concatenate((self.open_count, np.zeros(size - len(self.open_count), np.int32)))
+
+    def _create(self, corporation_ids: np.ndarray, industries: np.ndarray):
+        """Draw positions, salaries and requirements for new openings in a few array calls"""
+        count = len(corporation_ids)
+        choice = (self.rng.random(count) * self._position_counts[industries]).astype(np.int64)
+        position = self._position_table[industries, choice]
+        low, high = SALARY_LOW[position], SALARY_HIGH[position]
+        self._append(
+            corporation_ids.astype(np.int32),
+            position,
+            industries.astype(np.int16),
+            self.rng.integers(1, 6, count, dtype=np.int8),  # 1: Basic, 5: PhD
+            self.rng.integers(0, 11, count, dtype=np.int8),
+            low + (high - low) * self.rng.random(count, dtype=np.float32)
+        )
+
+    def _append(self, corporation_id, position, industry, education_level, experience_years, salary):
+        slots = self._allocate(len(salary))
+        self.corporation_id[slots] = corporation_id
+        self.position[slots] = position
+        self.industry[slots] = industry
+        self.education_level[slots] = education_level
+        self.experience_years[slots] = experience_years
+        self.salary[slots] = salary
+        self.open[slots] = True
+        if not len(slots):
+            return
+        self._reserve_corporations(int(np.max(corporation_id)) + 1)
+        np.add.at(self.open_count, corporation_id, 1)
+        self.open_total += len(slots)
+        for corporation_id, group in _groups(self.corporation_id[slots], slots):
+            self._open_slots.setdefault(corporation_id, set()).update(group.tolist())
+        self._file(slots)
+
+    def _allocate(self, count: int) -> np.ndarray:
+        """Slots for `count` new openings: reused ones first, then fresh ones past the end"""
+        reused = min(count, self._free_count)
+        self._free_count -= reused
+        fresh = count - reused
+        if self._size + fresh > len(self.salary):
+            self._grow(self._size + fresh)
+        slots = np.concatenate((self._free[self._free_count:self._free_count + reused],
+                                np.arange(self._size, self._size + fresh)))
+        self._size += fresh
+        self._stamp[slots] += 1
+        return slots
+
+    def _grow(self, size: int):
+        capacity = max(size, 2 * len(self.salary))
+        for column in self.COLUMNS:
+            grown = np.zeros(capacity, dtype=getattr(self, column).dtype)
+            grown[:self._size] = getattr(self, column)[:self._size]
+            setattr(self, column, grown)
+
+    def _withdraw(self, corporation_id: int, count: int):
+        """Withdraw the lowest-paid open seats of one corporation"""
+        candidates = np.fromiter(self._open_slots.get(corporation_id, ()), dtype=np.int64)
+        withdrawn = candidates[np.argsort(self.salary[candidates], kind="stable")[:count]]
+        self._close(withdrawn)
+
+    def _close(self, slots: np.ndarray):
+        """Close filled or withdrawn openings and put their slots on the free list"""
+        if not len(slots):
+            return
+        corporation_ids = self.corporation_id[slots]
+        self.open[slots] = False
+        np.subtract.at(self.open_count, corporation_ids, 1)
+        self.open_total -= len(slots)
+        for corporation_id, group in _groups(corporation_ids, slots):
+            self._open_slots[corporation_id].difference_update(group.tolist())
+        if self._free_count + len(slots) > len(self._free):
+            self._free = np.concatenate((self._free[:self._free_count],
+                                         np.empty(max(len(self._free), len(slots)), dtype=np.int64)))
+        self._free[self._free_count:self._free_count + len(slots)] = slots
+        self._free_count += len(slots)
+
+    def _file(self, slots: np.ndarray):
+        """Add new openings to their buckets, as one salary-ordered run per bucket"""
+        education, industry = self.education_level[slots], self.industry[slots]
+        slots = slots[np.lexsort((-self.salary[slots], industry, education))]
+        keys = self.education_level[slots].astype(np.int64) << 16 | self.industry[slots]
+        starts = np.flatnonzero(np.diff(keys, prepend=-1))
+        for key, run in zip(keys[starts].tolist(), np.split(slots, starts[1:])):
+            runs = self._buckets.setdefault((key >> 16, key & 0xFFFF), [])
+            runs.append((run, self._stamp[run]))
+            # Logarithmic merging: a bucket holds O(log n) runs and each opening is re-sorted O(log n) times
+            while len(runs) > 1 and len(runs[-2][0]) <= self.RUN_GROWTH * len(runs[-1][0]):
+                newer, older = runs.pop(), runs.pop()
+                merged = tuple(np.concatenate((old, new)) for old, new in zip(older, newer))
+                live = self._live(*merged)
+                merged_slots, stamps = merged[0][live], merged[1][live]
+                order = np.argsort(-self.salary[merged_slots], kind="stable")
+                if len(order):
+                    runs.append((merged_slots[order], stamps[order]))
+
+    def _live(self, slots: np.ndarray, stamps: np.ndarray) -> np.ndarray:
+        """Which bucket entries still stand for an open seat"""
+        return self.open[slots] & (self._stamp[slots] == stamps)
+
+    def _top(self, runs: List[Tuple[np.ndarray, np.ndarray]], count: int) -> np.ndarray:
+        """
+        Up to `count` best-paid open slots from every run of a bucket. Dead
+        entries found at the top of a run are dropped for good.
+        """
+        found = []
+        for index, (slots, stamps) in enumerate(runs):
+            window = count
+            while True:
+                live = np.flatnonzero(self._live(slots[:window], stamps[:window]))
+                if len(live) >= count or window >= len(slots):
+                    break
+                window *= 2
+            first = live[0] if len(live) else len(slots)
+            found.append(slots[live[:count]])
+            runs[index] = slots[first:], stamps[first:]
+        runs[:] = [run for run in runs if len(run[0])]
+        return np.concatenate(found) if found else np.empty(0, dtype=np.int64)
+
+    def __len__(self) -> int:
+        return self.open_total
+
+    def __iter__(self) -> Iterator[Dict]:
+        for index in np.flatnonzero(self.open):
+            yield self.get_opening(int(index))
+
+    def get_opening(self, index: int) -> Dict:
+        """Return one opening in the dict layout used by Corporation.generate_job_openings"""
+        corporation_id = int(self.corporation_id[index])
+        corporation = self.corporations.get(corporation_id)
+        return {
+            "corporation_id": corporation_id,
+            "corporation_name": corporation.name if corporation else "",
+            "position": self.positions[self.position[index]],
+            "industry": self.industries[self.industry[index]],
+            "salary": float(self.salary[index]),
+            "requirements": {
+                "education_level": int(self.education_level[index]),
+                "experience_years": int(self.experience_years[index])
+            }
+        }
+
+    def open_by(self, column: str) -> Dict[str, int]:
+        """Open seats per name of a coded column ("position" or "industry")"""
+        names = self.positions if column == "position" else self.industries
+        return names.totals(getattr(self, column)[self.open])
+
+    def best_opening(self, education_level: int, industry: Optional[str] = None) -> Optional[int]:
+        """Index of the best-paid open position a person with `education_level` qualifies for"""
+        industry_code = None
+        if industry is not None:
+            if industry not in self.industries:
+                return None
+            industry_code = self.industries.index(industry)
+
+        best = None
+        for (education, code), runs in self._buckets.items():
+            if education > education_level or (industry_code is not None and code != industry_code):
+                continue
+            for slot in self._top(runs, 1).tolist():
+                if best is None or self.salary[slot] > self.salary[best]:
+                    best = slot
+        return best
+
+    def match(self, population: PopulationTable, seekers: Optional[np.ndarray] = None) -> int:
+        """
+        Assign job seekers to the best-paid opening they qualify for and return
+        the number of hires. More educated seekers choose first; within an
+        education level seekers are served in the order given. Each level
+        only reads the tops of the buckets it qualifies for.
+        """
+        if seekers is None:
+            seekers = np.flatnonzero(population.employer_id == -1)
+        else:
+            seekers = seekers[population.employer_id[seekers] == -1]
+        seekers = seekers[employability(population, seekers) > MIN_EMPLOYABILITY]
+
+        hired_rows, filled = [], []
+        for level, group in reversed(list(_groups(population.education_level[seekers], seekers))):
+            eligible = [self._top(runs, len(group)) for (education, _), runs in self._buckets.items()
+                        if education <= level]
+            if not eligible:
+                continue
+            candidates = np.concatenate(eligible)
+            if len(candidates) > len(group):
+                candidates = candidates[np.argpartition(-self.salary[candidates], len(group) - 1)[:len(group)]]
+            taken = candidates[np.argsort(-self.salary[candidates], kind="stable")]
+            self.open[taken] = False  # Less educated seekers must not see them
+            hired_rows.append(group[:len(taken)])
+            filled.append(taken)
+
+        if not hired_rows:
+            return 0
+        rows = np.concatenate(hired_rows)
+        filled = np.concatenate(filled)
+        self._close(filled)
+        self._add_employees(rows, self.corporation_id[filled])
+        population.employer_id[rows] = self.corporation_id[filled]
+        population.salary[rows] = self.salary[filled]
+        return len(rows)
+
+    def _add_employees(self, rows: np.ndarray, corporation_ids: np.ndarray):
+        """Add new hires to each corporation's roster, one bulk extend per corporation"""
+        for corporation_id, group in _groups(corporation_ids, rows):
+            self.corporations[corporation_id].employees.extend(group.tolist())
+
+def employability(population: PopulationTable, rows: np.ndarray) -> np.ndarray:
+    """Vectorized Person.get_employability for the given rows"""
+    education_factor = population.education_level[rows] / 5.0
+    skills_factor = population.skills[rows].mean(axis=1) if population.skills.shape[1] else 0.0
+    health_factor = population.health[rows]
+    return education_factor * 0.4 + skills_factor * 0.4 + health_factor * 0.2
+
+def _groups(keys: np.ndarray, values: np.ndarray) -> Iterator[Tuple[int, np.ndarray]]:
+    """(key, values) for every distinct key, in key order (values keep their order within a key)"""
+    order = np.argsort(keys, kind="stable")
+    keys, values = keys[order], values[order]
+    distinct, starts = np.unique(keys, return_index=True)
+    bounds = starts.tolist() + [len(keys)]
+    return ((key, values[start:stop]) for key, start, stop in zip(distinct.tolist(), bounds, bounds[1:]))
@@ -0,0 +1,159 @@
+from typing import Dict, Optional, Sequence
+import numpy as np
+from entities.corporation import EMPLOYEE_COST, MAINTENANCE_COST
+from entities.corporation_table import CorporationTable
+from entities.population import PopulationTable
+
+# Prices are quoted on a fixed logarithmic grid from 10**MIN_PRICE_EXPONENT up
+LEVELS_PER_DECADE = 8
+MIN_PRICE_EXPONENT = -3
+PRICE_LEVELS = 72
+LEVEL_PRICES = 10.0 ** (MIN_PRICE_EXPONENT + np.arange(PRICE_LEVELS) / LEVELS_PER_DECADE)
+BID_PADDING = 32  # Extra wealth levels kept so every resource's shifted bids stay on the grid
+
+# Household consumption (units per person per year) and the share of wealth a
+# household is willing to spend on a year's worth of each resource
+HOUSEHOLD_DEMAND = {"food": 0.8, "water": 1.2, "energy": 0.5, "consumer_goods": 0.2}
+BUDGET_SHARE = {"food": 0.15, "water": 0.05, "energy": 0.1, "consumer_goods": 0.1}
+
+def price_level(prices: np.ndarray, round_up: bool = False) -> np.ndarray:
+    """Grid level of each price (rounded down for bids, up for asks), unclipped; zero or less is far below the grid"""
+    position = np.log10(np.maximum(prices, 1e-300))
+    position -= MIN_PRICE_EXPONENT
+    position *= LEVELS_PER_DECADE
+    return (np.ceil(position, out=position) if round_up else np.floor(position, out=position)).astype(np.int64)
+
+def asking_prices(corporations: CorporationTable) -> np.ndarray:
+    """
+    Unit cost of each corporation's output plus its profit margin
+    (corporations x 1). A corporation without staff quotes the cost at its
+    desired staffing, the workforce it is hiring towards.
+    """
+    staffed = corporations.employee_count > 0
+    workforce = np.where(staffed, corporations.employee_count, corporations.desired_employees())
+    capacity = corporations.capacity.sum(axis=1)
+    annual_cost = 12 * (EMPLOYEE_COST * workforce + MAINTENANCE_COST * capacity)
+    unit_cost = np.divide(annual_cost, capacity * workforce, out=np.zeros_like(capacity), where=capacity > 0)
+    return (unit_cost * (1 + corporations.profit_margin))[:, None]
+
+def reference_prices(corporations: CorporationTable) -> Dict[str, float]:
+    """
+    Capacity-weighted average asking price of every resource some
+    corporation produces, i.e. the price scale the clearing sessions trade
+    at. Resources nobody produces have no sellers and get no price.
+    """
+    capacity = corporations.capacity
+    total = capacity.sum(axis=0)
+    prices = asking_prices(corporations)[:, 0] @ capacity / np.maximum(total, 1e-300)
+    return {resource: float(price) for resource, price, produced in zip(corporations.resources, prices, total > 0)
+            if produced}
+
+class MarketClearing:
+    """
+    Call auction per region and resource. Corporations ask their whole
+    inventory at unit cost plus margin, households bid for a session's
+    worth of consumption at a price set by their wealth. Markets start at
+    the sellers' reference prices, and one where nothing trades keeps its
+    last price. Asks and bids are
+    binned into order books on a shared price grid (regions x resources x
+    levels) with bincount, cumulative sums give supply and demand at every
+    level, and each market clears at the level that trades the most. Fills
+    are pro rata: every order on the short side at the clearing price is
+    filled in the same proportion.
+    """
+    def __init__(self, resources: Sequence[str], region_count: int,
+                 initial_prices: Optional[Dict[str, float]] = None):
+        self.resources = list(resources)
+        self.region_count = region_count
+        shape = (region_count, len(self.resources))
+        initial_prices = initial_prices or {}
+        self.prices = np.tile([initial_prices.get(resource, np.nan) for resource in self.resources],
+                              (region_count, 1))
+        self.volume = np.zeros(shape)
+        self.supply = np.zeros(shape)  # Quantities offered at any price
+        self.demand = np.zeros(shape)  # Quantities wanted at any price
+        self.household_demand = np.array([HOUSEHOLD_DEMAND.get(resource, 0.0) for resource in self.resources])
+        budget = np.array([BUDGET_SHARE.get(resource, 0.0) for resource in self.resources])
+        # Bid level of resource k = wealth level + shift[k]
+        with np.errstate(divide="ignore", invalid="ignore"):
+            ratio = np.log10(budget / self.household_demand)
+        self.bid_shift = np.rint(np.nan_to_num(ratio) * LEVELS_PER_DECADE).astype(np.int64)
+
+    def clear(self, corporations: CorporationTable, population: PopulationTable, years: float = 1.0) -> int:
+        """Run one session covering `years` of consumption and return the number of seller fills"""
+        regions, resources = self.region_count, len(self.resources)
+        columns = [corporations.resource_index[resource] for resource in self.resources]
+
+        # Libro de ofertas: todo el inventario a coste unitario más margen
+        inventory = corporations.inventory[:, columns]
+        ask_level = np.clip(price_level(asking_prices(corporations), round_up=True), 0, PRICE_LEVELS - 1)
+        ask_level = np.broadcast_to(ask_level, inventory.shape)
+        seller_region = corporations.region[:, None]
+        book = (seller_region * resources + np.arange(resources)) * PRICE_LEVELS + ask_level
+        asks = np.bincount(book.ravel(), weights=inventory.ravel(),
+                           minlength=regions * resources * PRICE_LEVELS).reshape(regions, resources, PRICE_LEVELS)
+
+        # Libro de demanda: hogares agrupados por región y nivel de riqueza
+        # (sin riqueza se cae al nivel 0, que queda por debajo de la rejilla para todo recurso)
+        width = PRICE_LEVELS + 2 * BID_PADDING
+        wealth_level = price_level(population.wealth)
+        wealth_level += BID_PADDING
+        np.clip(wealth_level, 0, width - 1, out=wealth_level)
+        cell = population.location * width
+        cell += wealth_level
+        households = np.bincount(cell, minlength=regions * width).reshape(regions, width)
+        # bid_levels[k, w]: grid level of resource k for wealth level w (-1 if below the grid)
+        bid_levels = np.arange(width)[None, :] - BID_PADDING + self.bid_shift[:, None]
+        bid_levels = np.where(bid_levels < 0, -1, np.minimum(bid_levels, PRICE_LEVELS - 1))
+        on_grid = (bid_levels[:, :, None] == np.arange(PRICE_LEVELS)).astype(np.float64)
+        quantity = self.household_demand * years
+        bids = np.einsum("rw,kwl->rkl", households, on_grid) * quantity[None, :, None]
+
+        # Precio de equilibrio: el nivel que maximiza el volumen negociado
+        supply = np.cumsum(asks, axis=2)
+        demand = np.cumsum(bids[:, :, ::-1], axis=2)[:, :, ::-1]
+        crossed = supply >= demand
+        level = np.where(crossed.any(axis=2), crossed.argmax(axis=2), PRICE_LEVELS - 1)
+        below = np.maximum(level - 1, 0)
+        traded = np.minimum(supply, demand)
+        at_level = np.take_along_axis(traded, level[:, :, None], axis=2)[:, :, 0]
+        at_below = np.take_along_axis(traded, below[:, :, None], axis=2)[:, :, 0]
+        level = np.where(at_below > at_level, below, level)
+        volume = np.maximum(at_level, at_below)
+        offered = np.take_along_axis(supply, level[:, :, None], axis=2)[:, :, 0]
+        wanted = np.take_along_axis(demand, level[:, :, None], axis=2)[:, :, 0]
+        seller_fill = np.divide(volume, offered, out=np.zeros_like(volume), where=offered > 0)
+        buyer_fill = np.divide(volume, wanted, out=np.zeros_like(volume), where=wanted > 0)
+        price = LEVEL_PRICES[level]
+        self.prices = np.where(volume > 0, price, self.prices)
+        self.volume, self.supply, self.demand = volume, supply[:, :, -1], demand[:, :, 0]
+
+        # Ventas: cada vendedor con precio aceptado coloca la misma fracción de su inventario
+        accepted = ask_level <= level[seller_region[:, 0]]
+        sold = inventory * np.where(accepted, seller_fill[seller_region[:, 0]], 0.0)
+        corporations.inventory[:, columns] = inventory - sold
+        corporations.capital += (sold * price[seller_region[:, 0]]).sum(axis=1)
+
+        # Compras: el gasto depende solo de la región y del nivel de riqueza
+        buys = bid_levels[None, :, :] >= level[:, :, None]  # (regions, resources, wealth levels)
+        unit_spend = quantity * buyer_fill * price  # (regions, resources)
+        spend_table = np.einsum("rkw,rk->rw", buys.astype(np.float64), unit_spend)
+        population.wealth -= spend_table.ravel()[cell]
+        # Casi todas las filas cambian, así que los agregados se recalculan en la próxima lectura
+        population.invalidate_stats()
+        return int(np.count_nonzero(sold))
+
+    def national_prices(self) -> Dict[str, float]:
+        """Volume-weighted average of the regional prices (plain average where nothing traded)"""
+        known = ~np.isnan(self.prices)
+        prices = np.where(known, self.prices, 0.0)
+        volume = self.volume.sum(axis=0)
+        weighted = (prices * self.volume).sum(axis=0) / np.maximum(volume, 1e-300)
+        average = prices.sum(axis=0) / np.maximum(known.sum(axis=0), 1)
+        national = np.where(volume > 0, weighted, average)
+        return {resource: float(price) for resource, price, seen in zip(self.resources, national, known.any(axis=0))
+                if seen}
+
+    def get_regional_prices(self, region_id: int) -> Dict[str, float]:
+        return {resource: float(price) for resource, price in zip(self.resources, self.prices[region_id])
+                if not np.isnan(price)}
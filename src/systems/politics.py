@@ -1,7 +1,8 @@
 from typing import Dict, List, Optional
 from dataclasses import dataclass, field
 from enum import Enum
-import random
+import numpy as np
+from systems.elections import APPROVAL_WEIGHT, SUPPORT_WEIGHT, ElectionEngine, ElectionResult
 
 class GovernmentType(Enum):
     DEMOCRACY = "Democracy"
@@ -47,7 +48,8 @@ class RegionalGovernment:
 
 class PoliticalSystem:
     """Manages the political aspects of the simulation"""
-    def __init__(self):
+    def __init__(self, rng: Optional[np.random.Generator] = None):
+        self.rng = rng if rng is not None else np.random.default_rng()
         self.government_type: GovernmentType = GovernmentType.DEMOCRACY
         self.stability: float = 1.0  # 0.0 to 1.0
         self.parties: List[PoliticalParty] = []
@@ -57,6 +59,9 @@ class PoliticalSystem:
         self.election_cycle: int = 4  # Years between elections
         self.current_ruling_party: Optional[PoliticalParty] = None
         self.regional_governments: Dict[int, RegionalGovernment] = {}
+        self.random_shocks: bool = True  # Off when an event scheduler fires the shocks instead
+        self.elections: Optional[ElectionEngine] = None
+        self.last_election: Optional[ElectionResult] = None
         
     def add_party(self, party: PoliticalParty):
         """Add a new political party to the system"""
@@ -68,15 +73,41 @@ class PoliticalSystem:
         self.public_approval += policy.public_approval * 0.1
         self.public_approval = max(0.0, min(1.0, self.public_approval))
         
-    def hold_election(self) -> Optional[PoliticalParty]:
+    def hold_election(self, population=None) -> Optional[PoliticalParty]:
         """Simulate an election and return the winning party"""
         if not self.parties:
             return None
-            
-        # Simple election simulation based on party support levels
-        winner = max(self.parties, key=lambda p: p.support_level)
-        self.current_ruling_party = winner
+        if population is None or self.elections is None or not len(population):
+            # Without voters the party with most support wins
+            winner = max(self.parties, key=lambda p: p.support_level)
+            self.current_ruling_party = winner
+            return winner
+
+        votes = self.elections.run(population, [party.ideology for party in self.parties],
+                                   self._standing(), self.rng)
+        result = self.last_election = ElectionResult([party.name for party in self.parties], votes)
+        winner = self.current_ruling_party = self.parties[result.winner]
+        for party, share in zip(self.parties, result.shares.tolist()):
+            party.support_level = share
+        # Los gobiernos regionales se aprueban según el voto local al partido gobernante
+        for region_id, share in enumerate(result.regional_shares[:, result.winner].tolist()):
+            government = self.regional_governments.get(region_id)
+            if government is not None:
+                government.local_approval = share
         return winner
+
+    def _standing(self) -> np.ndarray:
+        """Baseline score of every party in every region (regions x parties)"""
+        support = SUPPORT_WEIGHT * np.array([party.support_level for party in self.parties])
+        standing = np.tile(support, (self.elections.region_count, 1))
+        if self.current_ruling_party in self.parties:
+            ruling = self.parties.index(self.current_ruling_party)
+            approval = np.full(self.elections.region_count, self.public_approval)
+            for region_id, government in self.regional_governments.items():
+                if region_id < len(approval):
+                    approval[region_id] = government.local_approval
+            standing[:, ruling] += APPROVAL_WEIGHT * (approval - 0.5)
+        return standing
         
     def update_stability(self):
         """Update the political stability based on various factors"""
@@ -119,6 +150,7 @@ class PoliticalSystem:
 
     def initialize_governments(self, region_count: int):
         """Initialize regional governments for all regions"""
+        self.elections = ElectionEngine(region_count)
         for region_id in range(region_count):
             self.regional_governments[region_id] = RegionalGovernment(
                 region_id=region_id,
@@ -149,24 +181,25 @@ class PoliticalSystem:
                 if hasattr(gov, key):
                     setattr(gov, key, value)
                     
-    def update(self, current_year: int):
-        """Update the political system for the current year"""
-        # Check for elections
-        if current_year % self.election_cycle == 0:
-            self.hold_election()
-            
-        # Update regional governments
-        for gov in self.regional_governments.values():
+    def update(self, current_year: int, population=None):
+        """Update the political system for the current year; elections are voted by `population` if given"""
+        # Update regional governments (one draw per column for all regions)
+        governments = list(self.regional_governments.values())
+        approval_changes = self.rng.uniform(-0.1, 0.1, len(governments)).tolist()
+        collected = self.rng.uniform(100000, 1000000, len(governments)).tolist()
+        spending = self.rng.uniform(50000, 500000, len(governments)).tolist()
+        for gov, approval_change, income, expense in zip(governments, approval_changes, collected, spending):
             # Update local approval based on various factors
-            gov.local_approval += random.uniform(-0.1, 0.1)
+            gov.local_approval += approval_change
             gov.local_approval = max(0.0, min(1.0, gov.local_approval))
             
             # Adjust budget based on tax revenue and spending
-            gov.budget += gov.tax_rate * random.uniform(100000, 1000000)  # Simplified tax collection
-            gov.budget -= random.uniform(50000, 500000)  # Basic spending simulation
+            gov.budget += gov.tax_rate * income  # Simplified tax collection
+            gov.budget -= expense  # Basic spending simulation
             
         # Update party support levels
-        for party in self.parties:
+        fluctuations = self.rng.uniform(-0.05, 0.05, len(self.parties)).tolist()
+        for party, fluctuation in zip(self.parties, fluctuations):
             # Parties in power are more affected by public approval
             if party == self.current_ruling_party:
                 party.support_level += (self.public_approval - 0.5) * 0.1
@@ -175,8 +208,12 @@ class PoliticalSystem:
                 party.support_level += (0.5 - self.public_approval) * 0.05
             
             # Add some random fluctuation
-            party.support_level += random.uniform(-0.05, 0.05)
+            party.support_level += fluctuation
             party.support_level = max(0.0, min(1.0, party.support_level))
+
+        # Check for elections once the year's drift is applied, so the vote is what stands
+        if current_year % self.election_cycle == 0:
+            self.hold_election(population)
             
         # Update policy effects
         for policy in self.active_policies:
@@ -187,13 +224,13 @@ class PoliticalSystem:
             self.public_approval += policy.effect_strength * 0.1
             
         # Random events that could affect stability
-        if random.random() < 0.1:  # 10% chance of a political event
-            event_impact = random.uniform(-0.2, 0.2)
+        if self.random_shocks and self.rng.random() < 0.1:  # 10% chance of a political event
+            event_impact = self.rng.uniform(-0.2, 0.2)
             self.stability += event_impact
             self.public_approval += event_impact * 0.5
             
         # Update corruption level with small random changes
-        self.corruption_level += random.uniform(-0.05, 0.05)
+        self.corruption_level += self.rng.uniform(-0.05, 0.05)
         self.corruption_level = max(0.0, min(1.0, self.corruption_level))
         
         # Ensure all values stay within bounds
@@ -1,10 +1,188 @@
+from typing import Dict, List, Optional, Tuple
+import numpy as np
+from entities.person import Relationship
+from utils.categorical import categories
+
+RELATIONSHIP_TYPES = categories("relationship", ['friend', 'family', 'romantic', 'colleague'])
+TYPE_WEIGHTS = np.array([0.6, 0.25, 0.05, 0.1])  # Share of each type among generated ties
+
+class SocialGraph:
+    """
+    Relationships stored as CSR arrays: the edges of person `i` are
+    `indptr[i]:indptr[i + 1]` in `targets` (int32), `types` (int8 codes into
+    RELATIONSHIP_TYPES) and `strengths` (float32), i.e. 9 bytes per edge.
+    """
+    def __init__(self, size: int, indptr: Optional[np.ndarray] = None, targets: Optional[np.ndarray] = None,
+                 types: Optional[np.ndarray] = None, strengths: Optional[np.ndarray] = None):
+        self.size = size
+        self.indptr = np.zeros(size + 1, dtype=np.int64) if indptr is None else indptr
+        self.targets = np.empty(0, dtype=np.int32) if targets is None else targets
+        self.types = np.empty(0, dtype=np.int8) if types is None else types
+        self.strengths = np.empty(0, dtype=np.float32) if strengths is None else strengths
+
+    @classmethod
+    def from_edges(cls, size: int, sources: np.ndarray, targets: np.ndarray,
+                   types: np.ndarray, strengths: np.ndarray) -> 'SocialGraph':
+        """Build the CSR layout from an unordered edge list (tie order within a person is arbitrary)"""
+        sources = sources.astype(np.int32, copy=False)
+        order = np.argsort(sources)
+        indptr = np.zeros(size + 1, dtype=np.int64)
+        np.cumsum(np.bincount(sources, minlength=size), out=indptr[1:])
+        return cls(size, indptr, targets[order].astype(np.int32), types[order].astype(np.int8),
+                   strengths[order].astype(np.float32))
+
+    @classmethod
+    def small_world(cls, locations: np.ndarray, degree: int, rng: np.random.Generator,
+                    rewire: float = 0.1, cross_region: float = 0.05) -> 'SocialGraph':
+        """
+        Watts-Strogatz style graph: everyone is tied to their `degree` nearest
+        neighbours on a ring of their region, then a share of ties is rewired
+        to random people of the same region (or, rarely, of any region).
+        """
+        members, starts, sizes, block_of = _region_blocks(locations)
+        position = np.arange(len(members))
+        block = block_of[members]
+        sources, targets = [], []
+        for offset in range(1, max(degree // 2, 1) + 1):
+            ring = starts[block] + (position - starts[block] + offset) % sizes[block]
+            sources.append(members[position])
+            targets.append(members[ring])
+        sources = np.concatenate(sources)
+        targets = np.concatenate(targets)
+
+        rewired = rng.random(len(targets)) < rewire
+        local = rewired & (rng.random(len(targets)) >= cross_region)
+        region = block_of[sources[local]]
+        targets[local] = members[starts[region] + (rng.random(local.sum()) * sizes[region]).astype(np.int64)]
+        distant = rewired & ~local
+        targets[distant] = rng.integers(0, len(locations), distant.sum())
+        return cls._undirected(len(locations), sources, targets, rng)
+
+    @classmethod
+    def preferential_attachment(cls, locations: np.ndarray, degree: int, rng: np.random.Generator,
+                                cross_region: float = 0.05, exponent: float = 2.5) -> 'SocialGraph':
+        """
+        Scale-free graph: each person creates `degree // 2` ties to people of
+        their region chosen with probability proportional to a heavy-tailed
+        attractiveness, which yields a power-law degree distribution without
+        growing the graph one node at a time.
+        """
+        size = len(locations)
+        members, starts, sizes, block_of = _region_blocks(locations)
+        weight = rng.pareto(exponent - 1.0, size) + 1.0
+        cumulative = np.cumsum(weight[members])
+        low = np.concatenate(([0.0], cumulative))[starts]
+        high = cumulative[starts + sizes - 1]
+
+        ties = max(degree // 2, 1)
+        sources = np.repeat(np.arange(size), ties)
+        region = np.repeat(block_of, ties)
+        draw = low[region] + rng.random(len(sources)) * (high[region] - low[region])
+        targets = members[np.minimum(np.searchsorted(cumulative, draw, side="right"), size - 1)]
+        distant = rng.random(len(sources)) < cross_region
+        targets[distant] = rng.integers(0, size, distant.sum())
+        return cls._undirected(size, sources, targets, rng)
+
+    @classmethod
+    def _undirected(cls, size: int, sources: np.ndarray, targets: np.ndarray,
+                    rng: np.random.Generator) -> 'SocialGraph':
+        """Drop self-loops, give each tie a type and strength and store it in both directions"""
+        keep = sources != targets
+        sources, targets = sources[keep], targets[keep]
+        types = rng.choice(len(TYPE_WEIGHTS), len(sources), p=TYPE_WEIGHTS).astype(np.int8)
+        strengths = rng.uniform(0.2, 0.8, len(sources)).astype(np.float32)
+        return cls.from_edges(size,
+                              np.concatenate((sources, targets)), np.concatenate((targets, sources)),
+                              np.concatenate((types, types)), np.concatenate((strengths, strengths)))
+
+    @property
+    def edge_count(self) -> int:
+        return len(self.targets)
+
+    def memory_bytes(self) -> int:
+        return self.indptr.nbytes + self.targets.nbytes + self.types.nbytes + self.strengths.nbytes
+
+    def ties_by_type(self) -> Dict[str, int]:
+        """Number of directed edges of every relationship type present"""
+        return RELATIONSHIP_TYPES.totals(self.types)
+
+    def degree(self) -> np.ndarray:
+        return np.diff(self.indptr)
+
+    def sources(self) -> np.ndarray:
+        """Source person of every edge (built on demand, not stored)"""
+        return np.repeat(np.arange(self.size, dtype=np.int32), self.degree())
+
+    def neighbors(self, person_id: int) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """Targets, type codes and strengths of one person's ties (views, not copies)"""
+        edges = slice(self.indptr[person_id], self.indptr[person_id + 1])
+        return self.targets[edges], self.types[edges], self.strengths[edges]
+
+    def relationships(self, person_id: int) -> List[Relationship]:
+        """One person's ties as Relationship objects"""
+        targets, types, strengths = self.neighbors(person_id)
+        return [Relationship(target_id=int(target), type=RELATIONSHIP_TYPES[code], strength=float(strength))
+                for target, code, strength in zip(targets, types, strengths)]
+
+    def decay(self, rate: float):
+        """Weaken every tie by the same proportion"""
+        self.strengths *= np.float32(1.0 - rate)
+
+    def reinforce(self, mask: np.ndarray, amount: float):
+        """Strengthen the ties selected by an edge mask, capped at 1.0"""
+        np.minimum(self.strengths + np.float32(amount), np.float32(1.0), out=self.strengths, where=mask)
+
+    def prune(self, threshold: float) -> int:
+        """Remove ties weaker than `threshold` and return how many were dropped"""
+        keep = self.strengths >= threshold
+        dropped = int(keep.size - np.count_nonzero(keep))
+        if dropped:
+            kept_before = np.concatenate(([0], np.cumsum(keep)))
+            self.indptr = kept_before[self.indptr]
+            self.targets = self.targets[keep]
+            self.types = self.types[keep]
+            self.strengths = self.strengths[keep]
+        return dropped
+
+def _region_blocks(locations: np.ndarray) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+    """
+    People ordered by region, the start and size of each non-empty region
+    block in that order, and the block each person belongs to
+    """
+    members = np.argsort(locations, kind="stable")
+    _, starts, sizes = np.unique(locations[members], return_index=True, return_counts=True)
+    block_of = np.empty(len(locations), dtype=np.int64)
+    block_of[members] = np.repeat(np.arange(len(starts)), sizes)
+    return members, starts, sizes, block_of
+
 class SocialSystem:
-    def __init__(self):
+    def __init__(self, decay_rate: float = 0.05, reinforcement: float = 0.1, prune_below: float = 0.05):
         self.relationships = {}
-        
+        self.graph: Optional[SocialGraph] = None
+        self.decay_rate = decay_rate
+        self.reinforcement = reinforcement
+        self.prune_below = prune_below
+
+    def initialize_graph(self, locations: np.ndarray, degree: int, rng: np.random.Generator,
+                         model: str = "small_world"):
+        """Generate the relationship graph for the whole population at once"""
+        if model == "small_world":
+            self.graph = SocialGraph.small_world(locations, degree, rng)
+        elif model == "preferential_attachment":
+            self.graph = SocialGraph.preferential_attachment(locations, degree, rng)
+        else:
+            raise ValueError(f"Unknown social graph model: {model}")
+
     def update(self, world):
         self._update_relationships(world)
-        
+
     def _update_relationships(self, world):
-        # Lógica para actualizar relaciones sociales
-        pass 
\ No newline at end of file
+        # Todas las relaciones se debilitan; las de compañeros de trabajo se refuerzan
+        if self.graph is None:
+            return
+        self.graph.decay(self.decay_rate)
+        employer = world.employment.employer_of
+        sources = self.graph.sources()
+        colleagues = (employer[sources] != -1) & (employer[sources] == employer[self.graph.targets])
+        self.graph.reinforce(colleagues, self.reinforcement)
+        self.graph.prune(self.prune_below)
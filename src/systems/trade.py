@@ -0,0 +1,96 @@
+from typing import Dict, List, Optional, Sequence
+import numpy as np
+from entities.corporation_table import CorporationTable
+
+TRADE_THRESHOLD = 0.1  # Umbral mínimo de diferencia de precio para comerciar
+TRADE_RATE = 0.1  # Share of the exporter's stock offered per unit of relative price gap
+
+def trade_quantity(importer_price: float, price_diff: float, exporter_stock: float) -> float:
+    """Quantity shipped from a cheaper region to a dearer one for a given price gap"""
+    return min(exporter_stock, TRADE_RATE * exporter_stock * price_diff / importer_price)
+
+class TradeEngine:
+    """
+    Inter-regional trade computed on R x K arrays (regions x resources).
+    Every tick the full price-difference tensor is built at once, gaps above
+    TRADE_THRESHOLD become flows from the cheaper to the dearer region, and
+    all flows are executed together, scaled down where an exporter would
+    ship more than it holds.
+
+    With a clearing market (see `exchange`) the stocks are the corporations'
+    inventories and the prices are the regional clearing prices, so imports
+    are on sale at the importer's next session. Without one the engine
+    trades its own regional stocks at the national prices scaled by each
+    region's demand factor.
+    """
+    def __init__(self, resources: Sequence[str], region_count: int,
+                 demand_factors: Optional[np.ndarray] = None,
+                 inventory: Optional[np.ndarray] = None):
+        self.resources: List[str] = list(resources)
+        shape = (region_count, len(self.resources))
+        self.demand_factor = np.ones(region_count) if demand_factors is None else np.asarray(demand_factors, float)
+        self.prices = np.zeros(shape)
+        self.inventory = np.zeros(shape) if inventory is None else np.asarray(inventory, float)
+        self.imports = np.zeros(shape)  # Net quantities received during the last step
+        self.trades_executed = 0
+
+    @property
+    def region_count(self) -> int:
+        return len(self.demand_factor)
+
+    def update_prices(self, base_prices: Dict[str, float]):
+        """Regional prices are the national price scaled by each region's demand factor"""
+        base = np.array([base_prices.get(resource, 0.0) for resource in self.resources])
+        np.multiply(self.demand_factor[:, None], base[None, :], out=self.prices)
+
+    def step(self) -> int:
+        """Execute every profitable flow for this tick and return the number of trades"""
+        # diff[i, j, k] > 0: region i pays more than region j for resource k, so i imports from j
+        diff = self.prices[:, None, :] - self.prices[None, :, :]
+        profitable = (diff > TRADE_THRESHOLD) & (self.prices[None, :, :] > 0)  # Unpriced markets do not export
+        relative_gap = np.divide(diff, self.prices[:, None, :], out=np.zeros_like(diff), where=profitable)
+        flows = np.minimum(TRADE_RATE * relative_gap, 1.0) * self.inventory[None, :, :]
+
+        # Ningún exportador puede enviar más de lo que tiene
+        shipped = flows.sum(axis=0)
+        scale = np.divide(self.inventory, shipped, out=np.ones_like(shipped), where=shipped > self.inventory)
+        flows *= scale[None, :, :]
+
+        received = flows.sum(axis=1)
+        self.imports = received - flows.sum(axis=0)
+        self.inventory += self.imports
+        self.trades_executed = int(np.count_nonzero(flows))
+        return self.trades_executed
+
+    def exchange(self, corporations: CorporationTable, prices: np.ndarray) -> int:
+        """
+        Trade the corporations' inventories at the given regional prices
+        (regions x the engine's resources). A region's stock is what its
+        corporations hold, and its imports are shared among its producers.
+        Markets without producers or without a price do not trade.
+        """
+        columns = [corporations.resource_index[resource] for resource in self.resources]
+        inventory = corporations.inventory[:, columns]
+        capacity = corporations.capacity[:, columns]
+        region = corporations.region
+        stock = self._regional_totals(inventory, region)
+        self.inventory = stock.copy()
+        self.prices = np.where(self._regional_totals(capacity, region) > 0, np.nan_to_num(prices), 0.0)
+        trades = self.step()
+
+        # Lo recibido se reparte según el inventario, o según la capacidad donde no había existencias
+        weight = np.where(stock[region] > 0, inventory, capacity)
+        total = self._regional_totals(weight, region)
+        share = np.divide(self.inventory, total, out=np.zeros_like(total), where=total > 0)
+        corporations.inventory[:, columns] = weight * share[region]
+        return trades
+
+    def _regional_totals(self, values: np.ndarray, region: np.ndarray) -> np.ndarray:
+        """Sum of the rows of a (corporations x resources) matrix by region"""
+        resources = len(self.resources)
+        cell = region[:, None] * resources + np.arange(resources)
+        return np.bincount(cell.ravel(), weights=values.ravel(),
+                           minlength=self.region_count * resources).reshape(self.region_count, resources)
+
+    def get_regional_prices(self, region_id: int) -> Dict[str, float]:
+        return dict(zip(self.resources, self.prices[region_id].tolist()))
@@ -0,0 +1,94 @@
+"""
+Categorical encoding for the strings that hot entities repeat (industries,
+positions, relationship types...). Each kind of category has one shared,
+append-only name table; entities and systems store small integer codes into
+it, so group-by-industry or group-by-position aggregations are bincounts on
+integer arrays.
+"""
+from typing import Dict, Iterable, Iterator, List, Optional, Sequence
+import numpy as np
+
+class Categories:
+    """
+    Append-only table of names and their codes. Behaves like the list of
+    names (len, iteration, `[code]`, `index`, `in`), and `code` interns
+    names that are not in the table yet.
+    """
+    def __init__(self, names: Iterable[str] = (), kind: Optional[str] = None):
+        self.kind = kind  # Name in the shared registry, if registered
+        self.names: List[str] = []
+        self._codes: Dict[str, int] = {}
+        self.extend(names)
+
+    def code(self, name: str) -> int:
+        """Code of `name`, adding it to the table if it is new"""
+        code = self._codes.get(name)
+        if code is None:
+            code = self._codes[name] = len(self.names)
+            self.names.append(name)
+        return code
+
+    def extend(self, names: Iterable[str]):
+        for name in names:
+            self.code(name)
+
+    def index(self, name: str) -> int:
+        """Code of a known name; raises ValueError like list.index"""
+        try:
+            return self._codes[name]
+        except KeyError:
+            raise ValueError(f"{name!r} is not a known {self.kind or 'category'}") from None
+
+    def encode(self, names: Iterable[str], dtype=np.int16) -> np.ndarray:
+        """Codes of many names at once (new names are interned)"""
+        return np.fromiter((self.code(name) for name in names), dtype=dtype)
+
+    def decode(self, codes: Iterable[int]) -> List[str]:
+        names = self.names
+        return [names[code] for code in np.asarray(codes).tolist()]
+
+    def counts(self, codes: np.ndarray, weights: Optional[np.ndarray] = None) -> np.ndarray:
+        """Occurrences (or summed weights) of every code, one entry per name"""
+        return np.bincount(codes, weights=weights, minlength=len(self.names))
+
+    def totals(self, codes: np.ndarray, weights: Optional[np.ndarray] = None) -> Dict[str, float]:
+        """`counts` keyed by name, leaving out names that never occur"""
+        counts = self.counts(codes, weights)
+        present = np.bincount(codes, minlength=len(self.names)) > 0
+        return {self.names[code]: counts[code].item() for code in np.flatnonzero(present)}
+
+    def to_pandas(self, codes: np.ndarray):
+        """Codes as a pandas Categorical with this table's names as categories"""
+        import pandas as pd
+        return pd.Categorical.from_codes(np.asarray(codes, dtype=np.int64), self.names)
+
+    def __getitem__(self, code: int) -> str:
+        return self.names[code]
+
+    def __len__(self) -> int:
+        return len(self.names)
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self.names)
+
+    def __contains__(self, name: str) -> bool:
+        return name in self._codes
+
+    def __repr__(self) -> str:
+        return f"Categories({self.names!r}, kind={self.kind!r})"
+
+    def __reduce__(self):
+        # Registered tables are restored into the registry, so codes stay shared after unpickling
+        if self.kind is not None:
+            return categories, (self.kind, self.names)
+        return Categories, (self.names,)
+
+REGISTRY: Dict[str, Categories] = {}
+
+def categories(kind: str, names: Sequence[str] = ()) -> Categories:
+    """The shared table of `kind`, created on first use; `names` are interned in order"""
+    table = REGISTRY.get(kind)
+    if table is None:
+        table = REGISTRY[kind] = Categories(kind=kind)
+    table.extend(names)
+    return table
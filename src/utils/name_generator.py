@@ -1,9 +1,62 @@
-import random
+from typing import Iterable, List, Optional, Sequence
+import numpy as np
+from utils.categorical import Categories
+from utils.rng import fallback
+
+class NamePool:
+    """
+    Names built from one word list per part ("first last", "prefix core
+    suffix"...). A name is stored as one integer code, the mixed-radix index
+    of its parts, and only turned into a string when it is read. Other
+    names (set by hand) are interned after the generated ones.
+    """
+    def __init__(self, *parts: Sequence[str], separator: str = " "):
+        self.parts = [list(words) for words in parts]
+        self._positions = [{word: i for i, word in enumerate(words)} for words in self.parts]
+        self.separator = separator
+        self.size = int(np.prod([len(words) for words in self.parts]))
+        self.custom = Categories()
+
+    def draw(self, count: int, rng: Optional[np.random.Generator] = None) -> np.ndarray:
+        """Codes of `count` random generated names"""
+        return fallback(rng).integers(0, self.size, count)
+
+    def code(self, name: str) -> int:
+        """Code of any name: generated ones map back to their parts, others are interned"""
+        words = name.split(self.separator)
+        if len(words) == len(self.parts):
+            code = 0
+            for word, positions, part in zip(words, self._positions, self.parts):
+                position = positions.get(word)
+                if position is None:
+                    break
+                code = code * len(part) + position
+            else:
+                return code
+        return self.size + self.custom.code(name)
+
+    def name(self, code: int) -> str:
+        code = int(code)
+        if code >= self.size:
+            return self.custom[code - self.size]
+        words = []
+        for part in reversed(self.parts):
+            code, position = divmod(code, len(part))
+            words.append(part[position])
+        return self.separator.join(reversed(words))
+
+    def names(self, codes: Iterable[int]) -> List[str]:
+        return [self.name(code) for code in np.asarray(codes).tolist()]
 
 class NameGenerator:
     FIRST_NAMES = ["Juan", "María", "Carlos", "Ana", "Luis", "Laura"]
     LAST_NAMES = ["García", "Rodríguez", "González", "Fernández", "López"]
-    
+    POOL = NamePool(FIRST_NAMES, LAST_NAMES)
+
+    @classmethod
+    def generate_name(cls, rng: Optional[np.random.Generator] = None):
+        return cls.generate_names(1, rng)[0]
+
     @classmethod
-    def generate_name(cls):
-        return f"{random.choice(cls.FIRST_NAMES)} {random.choice(cls.LAST_NAMES)}" 
\ No newline at end of file
+    def generate_names(cls, count: int, rng: Optional[np.random.Generator] = None) -> List[str]:
+        return cls.POOL.names(cls.POOL.draw(count, rng))
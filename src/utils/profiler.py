@@ -0,0 +1,104 @@
+import json
+import time
+import tracemalloc
+from contextlib import contextmanager, nullcontext
+from typing import Dict, List, Optional
+
+_DISABLED = nullcontext()
+
+class PhaseStats:
+    """Accumulated timings (and optionally allocations) of one phase"""
+    __slots__ = ("calls", "total", "last", "max", "allocated", "peak")
+
+    def __init__(self):
+        self.calls = 0
+        self.total = 0.0
+        self.last = 0.0
+        self.max = 0.0
+        self.allocated = 0  # Net bytes still allocated when the phase ended (last call)
+        self.peak = 0  # Highest traced memory above the phase's starting point (bytes)
+
+    def to_dict(self) -> Dict:
+        return {"calls": self.calls, "total_s": self.total, "last_s": self.last, "max_s": self.max,
+                "mean_s": self.total / self.calls if self.calls else 0.0,
+                "allocated_bytes": self.allocated, "peak_bytes": self.peak}
+
+class Profiler:
+    """
+    Phase timers, counters and optional tracemalloc snapshots. Phases nest
+    and are reported by dotted path ("economy.taxes"). When disabled,
+    `phase` returns a shared no-op context manager and `count` returns
+    immediately, so instrumented code costs a method call per phase.
+    """
+    def __init__(self, enabled: bool = False, trace_memory: bool = False):
+        self.enabled = enabled
+        self.trace_memory = trace_memory
+        self.phases: Dict[str, PhaseStats] = {}
+        self.counters: Dict[str, float] = {}
+        self._stack: List[List] = []  # [path, peak seen so far] of the open phases
+
+    def phase(self, name: str):
+        if not self.enabled:
+            return _DISABLED
+        return self._timed(name)
+
+    @contextmanager
+    def _timed(self, name: str):
+        path = f"{self._stack[-1][0]}.{name}" if self._stack else name
+        tracing = self.trace_memory
+        if tracing:
+            if not tracemalloc.is_tracing():
+                tracemalloc.start()
+            self._propagate_peak()
+            memory_start = tracemalloc.get_traced_memory()[0]
+        frame = [path, 0]
+        self._stack.append(frame)
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            elapsed = time.perf_counter() - start
+            self._stack.pop()
+            stats = self.phases.get(path)
+            if stats is None:
+                stats = self.phases[path] = PhaseStats()
+            stats.calls += 1
+            stats.total += elapsed
+            stats.last = elapsed
+            stats.max = max(stats.max, elapsed)
+            if tracing:
+                current, peak = tracemalloc.get_traced_memory()
+                frame[1] = max(frame[1], peak)
+                stats.allocated = current - memory_start
+                stats.peak = max(stats.peak, frame[1] - memory_start)
+                if self._stack:
+                    self._stack[-1][1] = max(self._stack[-1][1], frame[1])
+                tracemalloc.reset_peak()
+
+    def _propagate_peak(self):
+        # A nested phase resets the tracemalloc peak, so the enclosing phase keeps what it saw so far
+        if self._stack:
+            self._stack[-1][1] = max(self._stack[-1][1], tracemalloc.get_traced_memory()[1])
+        tracemalloc.reset_peak()
+
+    def count(self, name: str, amount: float = 1):
+        if self.enabled:
+            self.counters[name] = self.counters.get(name, 0) + amount
+
+    def reset(self):
+        self.phases.clear()
+        self.counters.clear()
+
+    def report(self) -> Dict:
+        return {
+            "phases": {path: stats.to_dict() for path, stats in self.phases.items()},
+            "counters": dict(self.counters),
+        }
+
+    def to_json(self, path: Optional[str] = None) -> str:
+        """Serialize the report; also write it to `path` if given"""
+        text = json.dumps(self.report(), indent=2)
+        if path is not None:
+            with open(path, "w") as file:
+                file.write(text)
+        return text
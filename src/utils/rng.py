@@ -0,0 +1,86 @@
+import zlib
+from typing import Dict, List, Optional, Tuple
+import numpy as np
+
+ROW_BLOCK = 1 << 16  # Rows per independent stream in a RowStream
+
+def stream_key(name: str) -> int:
+    """Stable integer key of a stream name (the same in every process and run)"""
+    return zlib.crc32(name.encode())
+
+class RowStream:
+    """
+    Random numbers for rows `start:stop` of a population on one tick. Rows
+    are grouped in fixed blocks of ROW_BLOCK with one generator per
+    (stream, tick, block), so a row gets the same numbers whether it is
+    drawn by the whole population at once or by any shard containing it.
+    Small and picklable, so it can be sent to worker processes.
+    """
+    def __init__(self, entropy: int, spawn_key: Tuple[int, ...], start: int, stop: int):
+        self.entropy = entropy
+        self.spawn_key = spawn_key
+        self.start = start
+        self.stop = stop
+
+    def _block(self, block: int) -> np.random.Generator:
+        return np.random.Generator(np.random.PCG64(
+            np.random.SeedSequence(self.entropy, spawn_key=self.spawn_key + (block,))))
+
+    def random(self, shape, dtype=np.float64) -> np.ndarray:
+        """Uniform [0, 1) numbers of shape (..., stop - start)"""
+        shape = (shape,) if isinstance(shape, int) else tuple(shape)
+        if shape[-1] != self.stop - self.start:
+            raise ValueError(f"Last dimension must be {self.stop - self.start} rows, got {shape[-1]}")
+        out = np.empty(shape, dtype=dtype)
+        first, last = self.start // ROW_BLOCK, (self.stop - 1) // ROW_BLOCK
+        for block in range(first, last + 1):
+            values = self._block(block).random(shape[:-1] + (ROW_BLOCK,), dtype=dtype)
+            low = max(self.start, block * ROW_BLOCK)
+            high = min(self.stop, (block + 1) * ROW_BLOCK)
+            out[..., low - self.start:high - self.start] = values[..., low - block * ROW_BLOCK:high - block * ROW_BLOCK]
+        return out
+
+    def uniform(self, low: float, high: float, shape, dtype=np.float64) -> np.ndarray:
+        values = self.random(shape, dtype)
+        values *= values.dtype.type(high - low)
+        values += values.dtype.type(low)
+        return values
+
+class RngRegistry:
+    """
+    Every random stream of a World, derived from one seed. Each subsystem
+    asks for a named stream; names are turned into SeedSequence spawn keys,
+    so streams are independent of each other and of the order they are
+    requested in. `spawn` gives a list of generators for shards (e.g. one
+    per region) and `rows` gives block-keyed per-row streams for the
+    population kernels.
+    """
+    def __init__(self, seed: Optional[int] = None):
+        self.seed_sequence = np.random.SeedSequence(seed)
+        self.streams: Dict[str, np.random.Generator] = {}
+
+    def _child(self, *key: int) -> np.random.SeedSequence:
+        return np.random.SeedSequence(self.seed_sequence.entropy, spawn_key=self.seed_sequence.spawn_key + key)
+
+    def stream(self, name: str) -> np.random.Generator:
+        """The generator of a subsystem (created once, then shared)"""
+        generator = self.streams.get(name)
+        if generator is None:
+            generator = self.streams[name] = np.random.Generator(np.random.PCG64(self._child(stream_key(name))))
+        return generator
+
+    def spawn(self, name: str, count: int) -> List[np.random.Generator]:
+        """`count` independent generators for the shards of a subsystem"""
+        return [np.random.Generator(np.random.PCG64(child))
+                for child in self._child(stream_key(name)).spawn(count)]
+
+    def rows(self, name: str, tick: int, start: int, stop: int) -> RowStream:
+        """Per-row stream of `name` on `tick` for rows start:stop"""
+        return RowStream(self.seed_sequence.entropy,
+                         self.seed_sequence.spawn_key + (stream_key(name), tick), start, stop)
+
+_fallback = np.random.default_rng()
+
+def fallback(rng: Optional[np.random.Generator]) -> np.random.Generator:
+    """`rng`, or a shared unseeded generator for code that runs outside a World"""
+    return rng if rng is not None else _fallback
@@ -0,0 +1,72 @@
+from dataclasses import dataclass
+from typing import Callable, List
+from .time_manager import TimeManager
+
+@dataclass(frozen=True)
+class Cadence:
+    """Calendar rhythm of a system: every `every` days or months (a quarter is 3 months, a year 12)"""
+    unit: str  # "day" or "month"
+    every: int = 1
+
+    def periods(self, start: TimeManager, end: TimeManager) -> int:
+        """How many of this cadence's boundaries fall in [start, end)"""
+        if self.unit == "day":
+            first, stop = start.ordinal(), end.ordinal()
+        else:
+            # A month boundary is the first day of the month
+            first = start.month_index() + (0 if start.current_day == 1 else 1)
+            stop = end.month_index() + (1 if end.current_day > 1 else 0)
+        return max(0, -(-stop // self.every) - -(-first // self.every))
+
+    def years(self, periods: int, start: TimeManager) -> float:
+        """Length of `periods` of this cadence in years"""
+        if self.unit == "day":
+            return periods * self.every / start.days_in_year()
+        return periods * self.every / 12
+
+DAILY = Cadence("day")
+MONTHLY = Cadence("month")
+QUARTERLY = Cadence("month", 3)
+YEARLY = Cadence("month", 12)
+
+def every_years(years: int) -> Cadence:
+    return Cadence("month", 12 * years)
+
+@dataclass
+class Task:
+    name: str
+    cadence: Cadence
+    callback: Callable[[int, float], None]  # (periods elapsed, years elapsed)
+
+class CadenceScheduler:
+    """
+    Runs each registered system only on the ticks where one of its cadence
+    boundaries falls, whatever the length of the world's tick. A system due
+    on a tick runs once and is told how many of its periods and how many
+    years the tick covered, so with yearly ticks a daily system runs once
+    with 365 days' worth of change and with daily ticks a yearly system runs
+    only on the first of January.
+    """
+    def __init__(self):
+        self.tasks: List[Task] = []
+
+    def register(self, name: str, cadence: Cadence, callback: Callable[[int, float], None]):
+        """Add a system; systems due on the same tick run in registration order"""
+        self.tasks.append(Task(name, cadence, callback))
+
+    def due(self, start: TimeManager, end: TimeManager) -> List[tuple]:
+        """(task, periods, years) of every task due on the tick from `start` to `end`"""
+        due = []
+        for task in self.tasks:
+            periods = task.cadence.periods(start, end)
+            if periods:
+                due.append((task, periods, task.cadence.years(periods, start)))
+        return due
+
+    def run(self, time: TimeManager, unit: str, profiler):
+        """Run the tasks due on the tick that starts now and lasts one `unit`"""
+        end = time.copy()
+        end.advance(unit)
+        for task, periods, years in self.due(time, end):
+            with profiler.phase(task.name):
+                task.callback(periods, years)
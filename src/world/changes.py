@@ -0,0 +1,220 @@
+"""
+Change-data-capture feed of a World.
+
+Subscribers get, after every tick, only the rows and fields that changed
+during it, as one column batch per field: the ids of the changed rows and
+their new values, in the column's own dtype. Four entities are tracked:
+
+    population      one row per person (PopulationTable columns, plus skills.<name> for tables)
+    corporations    one row per corporation (scalar columns, plus inventory.<resource>)
+    market          one row per region (price.<resource>, volume.<resource>)
+    government      one row per region (local_approval, budget, tax_rate, autonomy_level)
+
+Most state is rewritten by whole-array operations, so there is no write
+barrier to hang dirty flags on. Instead the feed keeps a shadow copy of
+every field some subscriber watches and diffs it against the live columns
+once per tick; only those fields are copied and compared, and what is
+emitted is proportional to the churn.
+"""
+from dataclasses import dataclass
+from typing import Callable, Dict, FrozenSet, Iterable, List, Optional, Tuple
+import numpy as np
+from entities.corporation_table import CorporationTable
+from entities.person import PERSONALITIES
+from entities.population import PopulationTable
+
+ENTITIES = ("population", "corporations", "market", "government")
+GOVERNMENT_FIELDS = ("local_approval", "budget", "tax_rate", "autonomy_level")
+CORPORATION_FIELDS = ("region", "capital", "operating_costs", "revenue", "profit_margin", "employee_count")
+REGION_FIELDS = {"population": "location", "corporations": "region"}  # Fields holding the region of a row
+
+@dataclass
+class ChangeBatch:
+    """New values of one field for the rows of one entity that changed"""
+    entity: str
+    field: str
+    ids: np.ndarray
+    values: np.ndarray
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+@dataclass(eq=False)
+class Subscription:
+    callback: Callable[[int, List[ChangeBatch]], None]  # (tick, batches)
+    entities: Optional[FrozenSet[str]] = None  # None means every entity
+    fields: Optional[FrozenSet[str]] = None  # None means every field
+    regions: Optional[np.ndarray] = None  # Only rows in (or leaving) these regions; arrivals are sent whole
+
+    def wants(self, entity: str, field: str) -> bool:
+        return ((self.entities is None or entity in self.entities) and
+                (self.fields is None or field in self.fields))
+
+    def watches(self, entity: str, field: str) -> bool:
+        """Whether the feed must diff a field for this subscription (region filters need the region field)"""
+        return self.wants(entity, field) or (
+            self.regions is not None and field == REGION_FIELDS.get(entity) and
+            (self.entities is None or entity in self.entities))
+
+class ChangeFeed:
+    def __init__(self):
+        self.subscriptions: List[Subscription] = []
+        self.tick = 0  # Ticks published so far; the initial snapshot of a subscriber is tick 0
+        self._shadow: Dict[Tuple[str, str], np.ndarray] = {}
+
+    def subscribe(self, world, callback: Callable[[int, List[ChangeBatch]], None],
+                  entities: Optional[Iterable[str]] = None, fields: Optional[Iterable[str]] = None,
+                  regions: Optional[Iterable[int]] = None, initial: bool = True) -> Subscription:
+        """
+        Call `callback(tick, batches)` after every tick with the changes the
+        subscription selects. With `initial` the callback first gets every
+        selected row as it is now, so it can build its mirror from there.
+        """
+        entities = None if entities is None else frozenset(entities)
+        unknown = set(entities or ()) - set(ENTITIES)
+        if unknown:
+            raise ValueError(f"Unknown entities {sorted(unknown)}; expected some of {ENTITIES}")
+        subscription = Subscription(callback, entities, None if fields is None else frozenset(fields),
+                                    None if regions is None else np.unique(np.asarray(list(regions))))
+        self.subscriptions.append(subscription)
+        snapshot = []
+        for entity in ENTITIES:
+            if entities is not None and entity not in entities:
+                continue
+            columns, region = entity_columns(world, entity)
+            for field, values in columns.items():
+                if subscription.watches(entity, field) and (entity, field) not in self._shadow:
+                    self._shadow[entity, field] = values.copy()
+                if not subscription.wants(entity, field):
+                    continue
+                ids = np.arange(len(values))
+                if subscription.regions is not None and region is not None:
+                    ids = ids[np.isin(region, subscription.regions)]
+                snapshot.append(ChangeBatch(entity, field, ids, values[ids]))
+        if initial:
+            callback(0, snapshot)
+        return subscription
+
+    def unsubscribe(self, subscription: Subscription):
+        self.subscriptions.remove(subscription)
+        # Stop diffing fields nobody watches any more
+        for key in [key for key in self._shadow if not any(sub.watches(*key) for sub in self.subscriptions)]:
+            del self._shadow[key]
+
+    def publish(self, world):
+        """Diff the watched fields against the shadow and hand each subscriber its share of the changes"""
+        if not self.subscriptions:
+            return
+        self.tick += 1
+        batches: Dict[int, List[ChangeBatch]] = {id(sub): [] for sub in self.subscriptions}
+        for entity in ENTITIES:
+            watched = [key for key in self._shadow if key[0] == entity]
+            if not watched:
+                continue
+            columns, region = entity_columns(world, entity)
+            moved_from = None
+            changes = []
+            for key in watched:
+                field = key[1]
+                values, shadow = columns.get(field), self._shadow[key]
+                if values is None:
+                    continue
+                if values.shape != shadow.shape:
+                    # Rows were added or removed: resend the whole field
+                    ids = np.arange(len(values))
+                    self._shadow[key] = values.copy()
+                else:
+                    ids = _changed_rows(values, shadow)
+                    if field == REGION_FIELDS.get(entity):
+                        moved_from = (ids, shadow[ids])
+                    shadow[ids] = values[ids]
+                changes.append((field, ids))
+            for subscription in self.subscriptions:
+                arrived = None
+                if subscription.regions is not None and moved_from is not None:
+                    # Rows that entered the subscriber's regions are sent whole: it has never seen them
+                    moved, previous = moved_from
+                    arrived = moved[np.isin(region[moved], subscription.regions) &
+                                    ~np.isin(previous, subscription.regions)]
+                for field, ids in changes:
+                    if not subscription.wants(entity, field):
+                        continue
+                    if subscription.regions is not None and region is not None:
+                        ids = ids[_in_regions(ids, region, moved_from, subscription.regions)]
+                        if arrived is not None and len(arrived):
+                            ids = np.union1d(ids, arrived)
+                    batches[id(subscription)].append(ChangeBatch(entity, field, ids, columns[field][ids]))
+        for subscription in list(self.subscriptions):
+            subscription.callback(self.tick, batches[id(subscription)])
+
+    def __getstate__(self):
+        # Callbacks belong to the running process: a restored world starts without subscribers
+        return {"subscriptions": [], "tick": self.tick, "_shadow": {}}
+
+def _changed_rows(values: np.ndarray, shadow: np.ndarray) -> np.ndarray:
+    """Rows whose value differs from the shadow (a NaN still being NaN is no change)"""
+    ids = np.flatnonzero(values != shadow)
+    if values.dtype.kind == "f" and len(ids):
+        ids = ids[~(np.isnan(values[ids]) & np.isnan(shadow[ids]))]
+    return ids
+
+def _in_regions(ids: np.ndarray, region: np.ndarray, moved_from: Optional[Tuple[np.ndarray, np.ndarray]],
+                regions: np.ndarray) -> np.ndarray:
+    """Mask of the rows now in `regions`, or that were there before moving this tick"""
+    inside = np.isin(region[ids], regions)
+    if moved_from is not None and len(moved_from[0]):
+        moved, previous = moved_from
+        position = np.minimum(np.searchsorted(moved, ids), len(moved) - 1)
+        inside |= (moved[position] == ids) & np.isin(previous[position], regions)
+    return inside
+
+def entity_columns(world, entity: str) -> Tuple[Dict[str, np.ndarray], Optional[np.ndarray]]:
+    """Current columns of an entity and the region of each of its rows (None if rows have no region)"""
+    if entity == "population":
+        population = world.population
+        if isinstance(population, PopulationTable):
+            columns = dict(population.columns())
+            for skill, index in population.skill_index.items():
+                columns[f"skills.{skill}"] = population.skills[:, index]
+        else:
+            columns = {column: np.array([getattr(person, column) for person in population], dtype=dtype)
+                       for column, dtype in PopulationTable.COLUMNS.items() if column != "personality"}
+            codes = {personality: code for code, personality in enumerate(PERSONALITIES)}
+            columns["personality"] = np.array([codes[person.personality] for person in population],
+                                              dtype=PopulationTable.COLUMNS["personality"])
+        return columns, columns["location"]
+    if entity == "corporations":
+        corporations = world.corporations
+        if isinstance(corporations, CorporationTable):
+            columns = {column: getattr(corporations, column) for column in CORPORATION_FIELDS}
+            for resource, index in corporations.resource_index.items():
+                columns[f"inventory.{resource}"] = corporations.inventory[:, index]
+        else:
+            columns = {column: np.array([getattr(corporation, column) for corporation in corporations])
+                       for column in CORPORATION_FIELDS if column != "employee_count"}
+            columns["employee_count"] = np.array([len(corporation.employees) for corporation in corporations],
+                                                 dtype=np.int64)
+            resources = sorted({resource for corporation in corporations for resource in corporation.inventory})
+            for resource in resources:
+                columns[f"inventory.{resource}"] = np.array(
+                    [corporation.inventory.get(resource, 0.0) for corporation in corporations])
+        return columns, columns["region"]
+    if entity == "market":
+        market = world.economy.market
+        if market is None:
+            # Sin subasta regional solo hay precios nacionales: una única fila
+            prices = world.economy.get_market_prices()
+            return {f"price.{resource}": np.array([price], dtype=np.float64)
+                    for resource, price in prices.items()}, None
+        columns = {}
+        for index, resource in enumerate(market.resources):
+            columns[f"price.{resource}"] = market.prices[:, index]
+            columns[f"volume.{resource}"] = market.volume[:, index]
+        return columns, np.arange(market.region_count)
+    if entity == "government":
+        governments = world.politics.regional_governments
+        ids = sorted(governments)
+        columns = {field: np.array([getattr(governments[region], field) for region in ids], dtype=np.float64)
+                   for field in GOVERNMENT_FIELDS}
+        return columns, np.array(ids, dtype=np.int64)
+    raise ValueError(f"Unknown entity {entity!r}; expected one of {ENTITIES}")
@@ -0,0 +1,104 @@
+"""
+Binary checkpoints of a whole World.
+
+A checkpoint is a directory holding one `.npy` block per large array (every
+population column, the skill matrix, the vacancy ledger, the social graph,
+trade matrices...) plus a small header. The header pickles everything else
+(corporations, politics, event queue, time, RNG states) with the large
+arrays replaced by references to their blocks, so shared references (e.g.
+the employer column used by both the population and the employment index)
+are restored as one array. Blocks are loaded with copy-on-write memory
+maps: restoring costs almost nothing and pages are read when first touched,
+while the files on disk are never modified by the resumed run. A checkpoint
+is written to a temporary sibling directory and moved into place at the end,
+so saving over the checkpoint a world was loaded from never truncates the
+blocks its memory maps still read.
+"""
+import json
+import os
+import pickle
+import random
+import shutil
+import tempfile
+from typing import Dict
+import numpy as np
+
+FORMAT_VERSION = 1
+HEADER_FILE = "header.json"
+STATE_FILE = "state.pkl"
+MIN_BLOCK_BYTES = 4096  # Smaller arrays are kept inline in the pickled state
+
+class _CheckpointPickler(pickle.Pickler):
+    def __init__(self, file, directory: str):
+        super().__init__(file, protocol=pickle.HIGHEST_PROTOCOL)
+        self.directory = directory
+        self.blocks: Dict[int, str] = {}  # id(array) -> block name
+        self._keep_alive = []
+
+    def persistent_id(self, obj):
+        if type(obj) not in (np.ndarray, np.memmap) or obj.nbytes < MIN_BLOCK_BYTES or obj.dtype.hasobject:
+            return None
+        name = self.blocks.get(id(obj))
+        if name is None:
+            name = f"block{len(self.blocks):05d}"
+            np.save(os.path.join(self.directory, name + ".npy"), obj, allow_pickle=False)
+            self.blocks[id(obj)] = name
+            self._keep_alive.append(obj)  # Ids must stay unique while pickling
+        return name
+
+class _CheckpointUnpickler(pickle.Unpickler):
+    def __init__(self, file, directory: str, mmap: bool):
+        super().__init__(file)
+        self.directory = directory
+        self.mmap_mode = "c" if mmap else None
+        self.blocks: Dict[str, np.ndarray] = {}
+
+    def persistent_load(self, name):
+        if name not in self.blocks:
+            self.blocks[name] = np.load(os.path.join(self.directory, name + ".npy"), mmap_mode=self.mmap_mode)
+        return self.blocks[name]
+
+def save_checkpoint(world, path: str):
+    """Write `world` to the directory `path`, replacing any checkpoint already there"""
+    path = os.path.abspath(path)
+    parent, name = os.path.split(path)
+    os.makedirs(parent, exist_ok=True)
+    staging = tempfile.mkdtemp(prefix=f".{name}.", dir=parent)
+    try:
+        with open(os.path.join(staging, STATE_FILE), "wb") as file:
+            pickler = _CheckpointPickler(file, staging)
+            pickler.dump({"world": world, "python_random": random.getstate()})
+        header = {
+            "version": FORMAT_VERSION,
+            "year": world.time.current_year,
+            "population": len(world.population),
+            "blocks": sorted(pickler.blocks.values())
+        }
+        with open(os.path.join(staging, HEADER_FILE), "w") as file:
+            json.dump(header, file, indent=2)
+    except BaseException:
+        shutil.rmtree(staging, ignore_errors=True)
+        raise
+    # Los bloques antiguos se desenlazan pero siguen legibles para los memmaps que los usan
+    previous = None
+    if os.path.exists(path):
+        previous = tempfile.mkdtemp(prefix=f".{name}.old.", dir=parent)
+        os.replace(path, previous)
+    os.replace(staging, path)
+    if previous is not None:
+        shutil.rmtree(previous, ignore_errors=True)
+
+def load_checkpoint(path: str, mmap: bool = True):
+    """
+    Restore a world written by save_checkpoint. All RNG streams (including
+    the global `random` module) are restored, so the run continues exactly
+    as the original would have.
+    """
+    with open(os.path.join(path, HEADER_FILE)) as file:
+        header = json.load(file)
+    if header["version"] != FORMAT_VERSION:
+        raise ValueError(f"Unsupported checkpoint version {header['version']} (expected {FORMAT_VERSION})")
+    with open(os.path.join(path, STATE_FILE), "rb") as file:
+        state = _CheckpointUnpickler(file, path, mmap).load()
+    random.setstate(state["python_random"])
+    return state["world"]
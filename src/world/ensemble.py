@@ -0,0 +1,245 @@
+import multiprocessing
+import queue
+import struct
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, replace
+from typing import Dict, Iterator, List, Optional, Sequence
+import numpy as np
+from .world import World, WorldConfig
+
+DEFAULT_METRICS = ("average_wealth", "average_happiness", "average_health", "employment_rate", "gini",
+                   "unemployment_rate", "stability", "public_approval")
+Z_95 = 1.959963984540054  # Two-sided 95% normal quantile
+
+def snapshot(world: World) -> Dict[str, float]:
+    """Scalar statistics of a world at the end of a tick"""
+    stats = world.get_statistics()
+    values = {key: value for key, value in stats.items() if isinstance(value, (int, float))}
+    values["unemployment_rate"] = world.economy.state.unemployment_rate
+    values["stability"] = world.politics.stability
+    values["public_approval"] = world.politics.public_approval
+    return values
+
+def replica_ticks(config: WorldConfig, ticks: int, metrics: Sequence[str]) -> Iterator[np.ndarray]:
+    """Statistics of one replica, one float64 row per tick as it is computed; stops at a failed update"""
+    world = World(config)
+    try:
+        for _ in range(ticks):
+            if not world.update():
+                return
+            current = snapshot(world)
+            yield np.array([current.get(metric, np.nan) for metric in metrics])
+    finally:
+        world.close()
+
+# Channel back to the parent: a fixed header (run, replica, tick) followed by the raw float64 row.
+# The last message of a replica has tick DONE and no row.
+HEADER = struct.Struct("<iii")
+DONE = -1
+POLL_S = 1.0  # How often a parent waiting on the channel checks for dead workers
+
+_channel = None  # Set in every worker by the pool initializer
+
+def _init_worker(channel):
+    global _channel
+    _channel = channel
+
+def run_replica(config: WorldConfig, ticks: int, metrics: Sequence[str], run: int, replica: int):
+    """Run one replica in a worker, sending every tick to the parent as soon as it is done"""
+    try:
+        for tick, values in enumerate(replica_ticks(config, ticks, metrics)):
+            _channel.put(HEADER.pack(run, replica, tick) + values.tobytes())
+    finally:
+        _channel.put(HEADER.pack(run, replica, DONE))
+
+@dataclass
+class TickUpdate:
+    """Statistics of one replica at the end of one tick"""
+    replica: int
+    tick: int
+    values: np.ndarray  # One value per metric of the runner
+
+@dataclass
+class EnsembleResult:
+    metrics: List[str]
+    samples: np.ndarray  # (replicas, ticks, metrics), in seed order
+    quantile_levels: Sequence[float]
+    converged: bool
+
+    @property
+    def replicas(self) -> int:
+        return len(self.samples)
+
+    @property
+    def mean(self) -> np.ndarray:
+        return np.nanmean(self.samples, axis=0)
+
+    @property
+    def std(self) -> np.ndarray:
+        return np.nanstd(self.samples, axis=0, ddof=1) if self.replicas > 1 else np.zeros_like(self.mean)
+
+    @property
+    def quantiles(self) -> np.ndarray:
+        """(levels, ticks, metrics)"""
+        return np.nanquantile(self.samples, self.quantile_levels, axis=0)
+
+    def band(self, z: float = Z_95) -> np.ndarray:
+        """Half-width of the confidence band of the mean, per tick and metric"""
+        return z * self.std / np.sqrt(max(self.replicas, 1))
+
+    def series(self, metric: str) -> Dict[str, np.ndarray]:
+        """Time series of one metric: mean, confidence band and quantiles"""
+        column = self.metrics.index(metric)
+        mean, half_width = self.mean[:, column], self.band()[:, column]
+        series = {"mean": mean, "low": mean - half_width, "high": mean + half_width}
+        for level, values in zip(self.quantile_levels, self.quantiles[:, :, column]):
+            series[f"q{round(level * 100):02d}"] = values
+        return series
+
+class EnsembleRunner:
+    """
+    Run many replicas of one WorldConfig with independent seeds on a pool of
+    long-lived worker processes (imports and pool startup are paid once per
+    worker, not per replica). Workers send every tick of every replica back
+    over a queue as soon as it is computed, a small binary header plus one
+    raw float64 row. `stream` yields those ticks as they arrive while the
+    running sums behind the means and bands are updated. The ensemble can
+    stop early once the 95% band of every mean is narrower than `tolerance`
+    relative to that mean; that is checked each time a replica finishes.
+    """
+    def __init__(self, config: WorldConfig, replicas: int = 200, ticks: int = 10, workers: int = 4,
+                 metrics: Sequence[str] = DEFAULT_METRICS, quantiles: Sequence[float] = (0.05, 0.5, 0.95),
+                 seed: Optional[int] = None, tolerance: Optional[float] = None, min_replicas: int = 20):
+        self.config = config
+        self.replicas = replicas
+        self.ticks = ticks
+        self.workers = workers  # 0 runs the replicas in this process
+        self.metrics = list(metrics)
+        self.quantiles = tuple(quantiles)
+        self.tolerance = tolerance
+        self.min_replicas = min_replicas
+        children = np.random.SeedSequence(seed).spawn(replicas)
+        self.seeds = [int(child.generate_state(1, np.uint64)[0]) for child in children]
+        self._pool: Optional[ProcessPoolExecutor] = None
+        self._channel = None
+        self._run = 0  # Messages of earlier (abandoned) runs still in the channel are dropped
+        self._reset()
+
+    def _reset(self):
+        shape = (self.ticks, len(self.metrics))
+        self.samples = np.full((self.replicas,) + shape, np.nan)
+        self.done = np.zeros(self.replicas, dtype=bool)
+        self.converged = False
+        self.count = np.zeros(shape)
+        self.total = np.zeros(shape)
+        self.total_squares = np.zeros(shape)
+
+    def _add(self, replica: int, tick: int, values: np.ndarray) -> TickUpdate:
+        self.samples[replica, tick] = values
+        valid = ~np.isnan(values)
+        self.count[tick] += valid
+        self.total[tick] += np.where(valid, values, 0.0)
+        self.total_squares[tick] += np.where(valid, values * values, 0.0)
+        return TickUpdate(replica, tick, values)
+
+    def running_mean(self) -> np.ndarray:
+        """Mean of every tick and metric over the ticks received so far (NaN where none has arrived)"""
+        with np.errstate(invalid="ignore", divide="ignore"):
+            return self.total / self.count
+
+    def running_band(self, z: float = Z_95) -> np.ndarray:
+        """Half-width of the confidence band of the running mean, per tick and metric"""
+        mean = self.running_mean()
+        with np.errstate(invalid="ignore", divide="ignore"):
+            variance = (self.total_squares - self.count * mean * mean) / (self.count - 1)
+            return z * np.sqrt(np.maximum(variance, 0.0) / self.count)
+
+    def band_width(self) -> float:
+        """Largest 95% band width relative to its mean, over every tick and metric"""
+        with np.errstate(invalid="ignore", divide="ignore"):
+            relative = 2 * self.running_band() / np.maximum(np.abs(self.running_mean()), 1e-12)
+        relative = relative[np.isfinite(relative)]
+        return float(relative.max()) if len(relative) else float("inf")
+
+    def _converged(self) -> bool:
+        return (self.tolerance is not None and self.done.sum() >= self.min_replicas
+                and self.band_width() <= self.tolerance)
+
+    def stream(self) -> Iterator[TickUpdate]:
+        """
+        Run the ensemble, yielding every tick of every replica as it
+        arrives (ticks of different replicas interleave). Stopping the
+        iteration early cancels the replicas that have not started.
+        """
+        self._reset()
+        self._run += 1
+        configs = [replace(self.config, seed=seed, record_history=False) for seed in self.seeds]
+        if self.workers <= 0:
+            for replica, config in enumerate(configs):
+                for tick, values in enumerate(replica_ticks(config, self.ticks, self.metrics)):
+                    yield self._add(replica, tick, values)
+                self.done[replica] = True
+                if self._converged():
+                    self.converged = True
+                    return
+            return
+
+        if self._pool is None:
+            self._channel = multiprocessing.Queue()
+            self._pool = ProcessPoolExecutor(max_workers=self.workers, initializer=_init_worker,
+                                             initargs=(self._channel,))
+        pending, queued = {}, iter(enumerate(configs))
+        try:
+            self._submit(pending, queued)
+            while pending:
+                try:
+                    message = self._channel.get(timeout=POLL_S)
+                except queue.Empty:
+                    for future in pending.values():
+                        if future.done():
+                            future.result()  # A worker died without reporting: raise its error
+                    continue
+                run, replica, tick = HEADER.unpack_from(message)
+                if run != self._run:
+                    continue
+                if tick != DONE:
+                    yield self._add(replica, tick, np.frombuffer(message, dtype=np.float64, offset=HEADER.size))
+                    continue
+                pending.pop(replica).result()  # Re-raise an exception of the replica
+                self.done[replica] = True
+                if self._converged():
+                    self.converged = True
+                    break
+                self._submit(pending, queued)
+        finally:
+            for future in pending.values():
+                future.cancel()
+
+    def _submit(self, pending: Dict, queued: Iterator):
+        """Keep only a few replicas queued so stopping early leaves little work to cancel"""
+        for replica, config in queued:
+            pending[replica] = self._pool.submit(run_replica, config, self.ticks, self.metrics, self._run, replica)
+            if len(pending) >= 2 * self.workers:
+                break
+
+    def result(self) -> EnsembleResult:
+        """Statistics of the replicas finished so far"""
+        return EnsembleResult(self.metrics, self.samples[self.done], self.quantiles, self.converged)
+
+    def run(self) -> EnsembleResult:
+        for _ in self.stream():
+            pass
+        return self.result()
+
+    def close(self):
+        if self._pool is not None:
+            self._pool.shutdown(cancel_futures=True)
+            self._pool = None
+            self._channel.close()
+            self._channel = None
+
+    def __enter__(self) -> 'EnsembleRunner':
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
@@ -0,0 +1,218 @@
+"""
+Per-tick history of a run, stored column by column.
+
+HistoryRecorder appends one row of scalar metrics per tick (market prices,
+supply and demand, unemployment, the political report, regional budgets,
+wealth quantiles...) to a preallocated (columns x ticks) buffer and, when a
+path is given, flushes it every `chunk_size` ticks to a directory:
+
+    meta.json              column names, categories of text columns, chunk list
+    metrics-00000.npy      float64 matrix, one contiguous row per column
+    agents-00000-<field>.npy   optional per-agent samples (ticks x sampled people)
+
+`load_history` turns the directory back into a pandas DataFrame straight
+from the column arrays.
+"""
+import json
+import os
+from typing import Dict, List, Optional
+import numpy as np
+from entities.population import PopulationTable
+
+WEALTH_QUANTILES = (0.1, 0.25, 0.5, 0.75, 0.9, 0.99)
+AGENT_FIELDS = ("wealth", "happiness", "health", "location", "employer_id")
+META_FILE = "meta.json"
+
+class HistoryRecorder:
+    def __init__(self, path: Optional[str] = None, chunk_size: int = 256, sample_stride: int = 0):
+        self.path = path
+        self.chunk_size = chunk_size
+        self.sample_stride = sample_stride  # Record every n-th person each tick (0 disables sampling)
+        self.columns: Dict[str, int] = {}
+        self.categories: Dict[str, List[str]] = {}  # Text columns are stored as codes into these lists
+        self._buffer = np.full((0, chunk_size), np.nan)
+        self._agents: Dict[str, np.ndarray] = {}
+        self._rows = 0
+        self.chunks: List[int] = []  # Rows of each chunk already on disk
+        self._flushed_metrics: List[np.ndarray] = []  # In-memory chunks when there is no path
+        self._flushed_agents: List[Dict[str, np.ndarray]] = []
+        if path is not None:
+            os.makedirs(path, exist_ok=True)
+
+    @property
+    def ticks(self) -> int:
+        return sum(self.chunks) + self._rows
+
+    def record(self, world):
+        """Append the current state of `world` as one tick"""
+        row = self._rows
+        for name, value in self._metrics(world).items():
+            column = self.columns.get(name)
+            if column is None:
+                column = self._add_column(name)
+            if isinstance(value, str) or (value is None and name in self.categories):
+                value = self._code(name, value)
+            self._buffer[column, row] = np.nan if value is None else value
+        if self.sample_stride > 0:
+            self._record_agents(world.population, row)
+        self._rows += 1
+        if self._rows == self.chunk_size:
+            self.flush()
+
+    def _metrics(self, world) -> Dict[str, Optional[float]]:
+        economy, politics = world.economy, world.politics
+        stats = world.get_statistics()
+        metrics = {"year": stats["year"], "population": stats["population"],
+                   "corporations": stats["corporations"]}
+        for resource, price in stats["market_prices"].items():
+            metrics[f"price.{resource}"] = price
+        if economy.market is not None:
+            for resource, volume in zip(economy.market.resources, economy.market.volume.sum(axis=0).tolist()):
+                metrics[f"volume.{resource}"] = volume
+        for resource, demand in economy.state.demand.items():
+            metrics[f"demand.{resource}"] = demand
+        for resource, supply in economy.state.supply.items():
+            metrics[f"supply.{resource}"] = supply
+        metrics["unemployment_rate"] = economy.state.unemployment_rate
+        for key, value in stats["political_state"].items():
+            metrics[f"politics.{key}"] = value
+        for region_id, government in politics.regional_governments.items():
+            metrics[f"budget.{region_id}"] = government.budget
+        for key in ("average_wealth", "average_happiness", "average_health", "employment_rate", "gini"):
+            metrics[key] = stats[key]
+        for quantile, value in zip(WEALTH_QUANTILES, self._wealth_quantiles(world)):
+            metrics[f"wealth.q{round(quantile * 100):02d}"] = value
+        return metrics
+
+    def _wealth_quantiles(self, world) -> np.ndarray:
+        population = world.population
+        if isinstance(population, PopulationTable) and population.stats is not None:
+            return population.current_stats().wealth_quantiles(WEALTH_QUANTILES)  # O(bins), not O(people)
+        if not len(population):
+            return np.zeros(len(WEALTH_QUANTILES))
+        return np.quantile(np.array([p.wealth for p in population], dtype=np.float64), WEALTH_QUANTILES)
+
+    def _add_column(self, name: str) -> int:
+        # Ticks recorded before the column existed stay NaN
+        self.columns[name] = len(self.columns)
+        if len(self.columns) > len(self._buffer):
+            grown = np.full((max(2 * len(self._buffer), 16), self.chunk_size), np.nan)
+            grown[:len(self._buffer)] = self._buffer
+            self._buffer = grown
+        return self.columns[name]
+
+    def _code(self, name: str, value: Optional[str]) -> float:
+        categories = self.categories.setdefault(name, [])
+        if value is None:
+            return np.nan
+        if value not in categories:
+            categories.append(value)
+        return categories.index(value)
+
+    def _record_agents(self, population, row: int):
+        if not self._agents:
+            sampled = len(range(0, len(population), self.sample_stride))
+            for field in AGENT_FIELDS:
+                dtype = getattr(population, field).dtype if isinstance(population, PopulationTable) else np.float64
+                self._agents[field] = np.zeros((self.chunk_size, sampled), dtype=dtype)
+        for field, buffer in self._agents.items():
+            if isinstance(population, PopulationTable):
+                buffer[row] = getattr(population, field)[::self.sample_stride]
+            else:
+                buffer[row] = [getattr(person, field) for person in population[::self.sample_stride]]
+
+    def flush(self):
+        """Move the buffered ticks into a chunk (on disk if there is a path)"""
+        rows = self._rows
+        if not rows:
+            return
+        metrics = self._buffer[:len(self.columns), :rows].copy()
+        agents = {field: buffer[:rows].copy() for field, buffer in self._agents.items()}
+        if self.path is None:
+            self._flushed_metrics.append(metrics)
+            self._flushed_agents.append(agents)
+        else:
+            chunk = len(self.chunks)
+            np.save(os.path.join(self.path, f"metrics-{chunk:05d}.npy"), metrics)
+            for field, samples in agents.items():
+                np.save(os.path.join(self.path, f"agents-{chunk:05d}-{field}.npy"), samples)
+        self.chunks.append(rows)
+        self._buffer[:] = np.nan
+        self._rows = 0
+        if self.path is not None:
+            self._write_meta()
+
+    def close(self):
+        self.flush()
+
+    def _write_meta(self):
+        meta = {
+            "columns": list(self.columns),
+            "categories": self.categories,
+            "chunks": self.chunks,
+            "sample_stride": self.sample_stride,
+            "agent_fields": list(self._agents),
+        }
+        with open(os.path.join(self.path, META_FILE), "w") as file:
+            json.dump(meta, file, indent=2)
+
+    def to_arrays(self) -> Dict[str, np.ndarray]:
+        """Every recorded column, including ticks not flushed yet"""
+        chunks = self._flushed_metrics if self.path is None else _read_chunks(self.path, len(self.chunks))
+        chunks = chunks + [self._buffer[:len(self.columns), :self._rows]]
+        return _concatenate(chunks, list(self.columns))
+
+    def to_dataframe(self):
+        return _to_dataframe(self.to_arrays(), self.categories)
+
+def _read_chunks(path: str, count: int) -> List[np.ndarray]:
+    return [np.load(os.path.join(path, f"metrics-{chunk:05d}.npy")) for chunk in range(count)]
+
+def _concatenate(chunks: List[np.ndarray], columns: List[str]) -> Dict[str, np.ndarray]:
+    """Join chunks column-wise; columns that appeared later are NaN in earlier chunks"""
+    ticks = sum(chunk.shape[1] for chunk in chunks)
+    matrix = np.full((len(columns), ticks), np.nan)
+    start = 0
+    for chunk in chunks:
+        matrix[:len(chunk), start:start + chunk.shape[1]] = chunk
+        start += chunk.shape[1]
+    return {name: matrix[index] for index, name in enumerate(columns)}
+
+def _to_dataframe(arrays: Dict[str, np.ndarray], categories: Dict[str, List[str]]):
+    import pandas as pd
+    data = {}
+    for name, values in arrays.items():
+        if name in categories:
+            codes = np.where(np.isnan(values), -1, values).astype(np.int64)
+            data[name] = pd.Categorical.from_codes(codes, categories[name])
+        else:
+            data[name] = values
+    return pd.DataFrame(data)
+
+def load_history_arrays(path: str) -> Dict[str, np.ndarray]:
+    """Columns of a history directory as NumPy arrays"""
+    with open(os.path.join(path, META_FILE)) as file:
+        meta = json.load(file)
+    return _concatenate(_read_chunks(path, len(meta["chunks"])), meta["columns"])
+
+def load_history(path: str):
+    """A history directory as a pandas DataFrame with one row per tick"""
+    with open(os.path.join(path, META_FILE)) as file:
+        meta = json.load(file)
+    return _to_dataframe(load_history_arrays(path), meta["categories"])
+
+def load_agent_samples(path: str):
+    """Per-agent samples as a long pandas DataFrame (tick, person_id, one column per field)"""
+    import pandas as pd
+    with open(os.path.join(path, META_FILE)) as file:
+        meta = json.load(file)
+    fields = {field: np.concatenate([np.load(os.path.join(path, f"agents-{chunk:05d}-{field}.npy"))
+                                     for chunk in range(len(meta["chunks"]))])
+              for field in meta["agent_fields"]}
+    if not fields:
+        return pd.DataFrame()
+    ticks, sampled = next(iter(fields.values())).shape
+    data = {"tick": np.repeat(np.arange(ticks), sampled),
+            "person_id": np.tile(np.arange(sampled) * meta["sample_stride"], ticks)}
+    data.update({field: values.ravel() for field, values in fields.items()})
+    return pd.DataFrame(data)
@@ -0,0 +1,209 @@
+from dataclasses import replace
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing.shared_memory import SharedMemory
+from typing import Dict, List, Optional, Tuple
+import numpy as np
+from entities.aggregates import PopulationAggregates
+from entities.corporation_table import CorporationTable
+from entities.person import BASIC_NEEDS_COST
+from entities.population import PopulationTable, update_households, age_population
+from utils.rng import RowStream
+from .world import World, WorldConfig
+
+ArraySpec = Tuple[str, Tuple[int, ...], str]  # Shared block name, shape, dtype
+CORPORATION_PREFIX = "corporations."  # Shared keys of the corporation arrays
+
+class SharedArrays:
+    """NumPy arrays placed in named shared-memory blocks that worker processes can map"""
+    def __init__(self):
+        self.blocks: Dict[str, SharedMemory] = {}
+        self.spec: Dict[str, ArraySpec] = {}
+
+    def share(self, key: str, array: np.ndarray) -> np.ndarray:
+        block = SharedMemory(create=True, size=max(array.nbytes, 1))
+        shared = np.ndarray(array.shape, dtype=array.dtype, buffer=block.buf)
+        shared[...] = array
+        self.blocks[key] = block
+        self.spec[key] = (block.name, array.shape, array.dtype.str)
+        return shared
+
+    def release(self):
+        for block in self.blocks.values():
+            try:
+                block.close()
+            except BufferError:
+                pass  # Still referenced by an array; the mapping goes away with the process
+            block.unlink()
+        self.blocks.clear()
+        self.spec.clear()
+
+def attach(spec: Dict[str, ArraySpec]) -> Tuple[Dict[str, np.ndarray], List[SharedMemory]]:
+    """Map blocks created by the parent process; the parent stays responsible for unlinking them"""
+    arrays, blocks = {}, []
+    for key, (name, shape, dtype) in spec.items():
+        block = SharedMemory(name=name)
+        arrays[key] = np.ndarray(shape, dtype=np.dtype(dtype), buffer=block.buf)
+        blocks.append(block)
+    return arrays, blocks
+
+# Worker-process state, set once by the pool initializer
+_table: Optional[PopulationTable] = None
+_corporations: Optional[CorporationTable] = None
+_blocks: List[SharedMemory] = []
+
+def _init_worker(spec: Dict[str, ArraySpec], skill_names: Tuple[str, ...], resources: Tuple[str, ...]):
+    global _table, _corporations, _blocks
+    arrays, _blocks = attach(spec)
+    corporations = {key[len(CORPORATION_PREFIX):]: arrays.pop(key)
+                    for key in list(arrays) if key.startswith(CORPORATION_PREFIX)}
+    skills = arrays.pop("skills")
+    _table = PopulationTable.from_arrays(arrays, skills, skill_names)
+    _corporations = CorporationTable.from_arrays(corporations, resources)
+
+def _step_shard(rows: RowStream, region_count: int, years: float) -> Tuple[PopulationAggregates, float]:
+    """
+    Advance the households in rows.start:rows.stop by `years` inside a worker
+    and return their aggregates and spending
+    """
+    shard = _table.slice(rows.start, rows.stop)
+    shard.stats = PopulationAggregates(region_count)
+    spent = update_households(shard, rows, years)
+    return shard.current_stats(), spent
+
+def _age_shard(start: int, stop: int, periods: int):
+    age_population(_table.slice(start, stop), periods)
+
+def _update_corporation_shard(start: int, stop: int, prices: np.ndarray, years: float):
+    """Production, operating costs and revenue of the corporations in rows start:stop"""
+    _corporations.slice(start, stop).update(prices, years)
+
+class ParallelWorld(World):
+    """
+    World whose row-local kernels (households, aging and the corporations'
+    accounts) are stepped by long-lived worker processes. The population and
+    corporation arrays live in shared memory, so a tick only sends each
+    worker its row range (plus a RowStream seed key for households, or the
+    price vector for corporations). Household draws are keyed by row block,
+    so a sharded run gives exactly the same results as a serial World with
+    the same seed. People start grouped by region and each population shard
+    owns a contiguous block of whole regions; a person who migrates stays in
+    the shard that owns their row. Corporations are split into even row
+    ranges. Everything that crosses regions (politics, the economy with its
+    clearing, trade, hiring and taxes, migration) runs in the parent
+    between shard steps, so it bounds the speedup.
+    """
+    def __init__(self, config: WorldConfig, workers: int = 4):
+        super().__init__(replace(config, columnar=True))
+        self.workers = workers
+        self.shared = SharedArrays()
+        self._share_population()
+        self.shards = self._partition(workers)
+        self.corporation_shards = self._even_shards(len(self.corporations), workers)
+        self._start_pool()
+
+    def __getstate__(self):
+        # Workers and shared blocks belong to this process; a restored world starts its own
+        state = self.__dict__.copy()
+        state["pool"] = None
+        state["shared"] = None
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self.shared = SharedArrays()
+        self._share_population()
+        self._start_pool()
+
+    def _start_pool(self):
+        self.pool = ProcessPoolExecutor(max_workers=max(len(self.shards), len(self.corporation_shards)),
+                                        initializer=_init_worker,
+                                        initargs=(self.shared.spec, self.population.skill_names,
+                                                  self.corporations.resources))
+
+    def _share_population(self):
+        table = self.population
+        for column, array in table.columns().items():
+            setattr(table, column, self.shared.share(column, array))
+        table.skills = self.shared.share("skills", table.skills)
+        corporations = self.corporations
+        for column, array in corporations.arrays().items():
+            setattr(corporations, column, self.shared.share(CORPORATION_PREFIX + column, array))
+        # The employment index must keep pointing at the live employer and staff count columns
+        self.employment.employer_of = table.employer_id
+        self.employment.employee_counts = corporations.employee_count
+
+    def _partition(self, workers: int) -> List[Tuple[int, int]]:
+        """Split the rows into contiguous shards of whole regions with similar populations"""
+        size = len(self.population)
+        region_starts = np.flatnonzero(np.diff(self.population.location)) + 1
+        if not len(region_starts):
+            return [(0, size)]
+        targets = np.arange(1, workers) * size / workers
+        cuts = region_starts[np.minimum(np.searchsorted(region_starts, targets), len(region_starts) - 1)]
+        bounds = np.unique(np.concatenate(([0], cuts, [size])))
+        return [(int(start), int(stop)) for start, stop in zip(bounds[:-1], bounds[1:])]
+
+    @staticmethod
+    def _even_shards(size: int, workers: int) -> List[Tuple[int, int]]:
+        bounds = np.unique(np.linspace(0, size, workers + 1).astype(np.int64))
+        return [(int(start), int(stop)) for start, stop in zip(bounds[:-1], bounds[1:])]
+
+    def _run_shards(self, kernel, shards: List[Tuple[int, int]], *args):
+        """Run a row-range kernel on every shard and wait for all of them"""
+        for future in [self.pool.submit(kernel, start, stop, *args) for start, stop in shards]:
+            future.result()
+
+    def _update_households(self, periods: int, years: float):
+        if self.pool is None:
+            super()._update_households(periods, years)
+            return
+        # Each shard draws from the same row-keyed streams as a serial World, so results match it
+        tick = self.time.ordinal()
+        futures = [self.pool.submit(_step_shard, self.rngs.rows("population", tick, start, stop),
+                                    self.config.region_count, years)
+                   for start, stop in self.shards]
+        # Partial aggregates of the shards add up to the population's
+        self.population.stats.reset()
+        total_spent = 0.0
+        for future in futures:
+            stats, spent = future.result()
+            self.population.stats += stats
+            total_spent += spent
+        self.economy.record_spending(total_spent, BASIC_NEEDS_COST * years * len(self.population))
+
+    def _age_population(self, periods: int, years: float):
+        if self.pool is None:
+            super()._age_population(periods, years)
+            return
+        self._run_shards(_age_shard, self.shards, periods)
+
+    def _update_corporations(self, periods: int, years: float):
+        if self.pool is None:
+            super()._update_corporations(periods, years)
+            return
+        prices = self.economy.price_vector(self.corporations.resources)
+        self._run_shards(_update_corporation_shard, self.corporation_shards, prices, years)
+
+    def close(self):
+        """Stop the workers and move the population back to private memory"""
+        super().close()
+        if self.pool is None:
+            return
+        self.pool.shutdown()
+        self.pool = None
+        table = self.population
+        for column, array in table.columns().items():
+            setattr(table, column, array.copy())
+        table.skills = table.skills.copy()
+        corporations = self.corporations
+        for column, array in corporations.arrays().items():
+            setattr(corporations, column, array.copy())
+        self.employment.employer_of = table.employer_id
+        self.employment.employee_counts = corporations.employee_count
+        self.shared.release()
+
+    def __enter__(self) -> 'ParallelWorld':
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
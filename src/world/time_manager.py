@@ -1,3 +1,5 @@
+from datetime import date
+
 class TimeManager:
     def __init__(self, start_year: int = 2024):
         self.current_year = start_year
@@ -34,4 +36,32 @@ class TimeManager:
     def _is_leap_year(self) -> bool:
         """Determina si el año actual es bisiesto"""
         year = self.current_year
-        return year % 4 == 0 and (year % 100 != 0 or year % 400 == 0) 
\ No newline at end of file
+        return year % 4 == 0 and (year % 100 != 0 or year % 400 == 0)
+
+    def advance(self, unit: str):
+        """Avanza el tiempo una unidad ("day", "month" o "year")"""
+        if unit == "day":
+            self.advance_day()
+        elif unit == "month":
+            self.advance_month()
+        elif unit == "year":
+            self.advance_year()
+        else:
+            raise ValueError(f"Unknown time unit: {unit}")
+
+    def copy(self) -> 'TimeManager':
+        clone = TimeManager(self.current_year)
+        clone.current_month = self.current_month
+        clone.current_day = self.current_day
+        return clone
+
+    def ordinal(self) -> int:
+        """Número de día absoluto de la fecha actual"""
+        return date(self.current_year, self.current_month, self.current_day).toordinal()
+
+    def month_index(self) -> int:
+        """Número de mes absoluto (año * 12 + mes - 1)"""
+        return self.current_year * 12 + self.current_month - 1
+
+    def days_in_year(self) -> int:
+        return 366 if self._is_leap_year() else 365
@@ -1,17 +1,46 @@
-from typing import List, Dict
+from typing import Callable, Iterable, List, Dict, Optional, Union
+import traceback
 from .time_manager import TimeManager
 from dataclasses import dataclass
-from entities.person import Person
+import numpy as np
+from entities.person import Person, BASIC_NEEDS_COST
+from entities.population import PopulationTable, PERSONALITIES, update_households, age_population
+from entities.aggregates import PopulationAggregates
 from entities.corporation import Corporation
+from entities.corporation_table import CorporationTable
+from entities.employment import EmploymentIndex
+from entities.regions import RegionIndex
 from systems.economy import EconomySystem
 from systems.politics import PoliticalSystem
+from systems.labor import JobMarket
+from systems.social import SocialSystem
+from events.scheduler import EventScheduler
+from events.political import PoliticalShock
+from utils.profiler import Profiler
+from utils.rng import RngRegistry
+from .cadence import CadenceScheduler, DAILY, MONTHLY, QUARTERLY, YEARLY
+from .changes import ChangeBatch, ChangeFeed, Subscription
+from .history import HistoryRecorder
 
 @dataclass
 class WorldConfig:
     """Configuration for world initialization"""
     initial_population: int = 1000
     region_count: int = 5
+    corporation_count: int = 50
     initial_resources: Dict[str, float] = None
+    columnar: bool = False  # Store the population as a PopulationTable instead of Person objects
+    seed: Optional[int] = None
+    social_degree: int = 0  # Average ties per person in the social graph (0 disables it)
+    migration_rate: float = 0.0  # Share of people moving to another region each tick
+    debug_statistics: bool = False  # Cross-check the running aggregates against a full recompute every tick
+    record_history: bool = False  # Keep a per-tick HistoryRecorder in World.history
+    history_path: Optional[str] = None  # Directory the history is flushed to (in memory if None)
+    history_sample_stride: int = 0  # Also record every n-th person each tick (0 disables)
+    profile: bool = False  # Time every phase of World.update (see World.get_profile)
+    profile_memory: bool = False  # Also take tracemalloc snapshots per phase (slow)
+    raise_errors: bool = False  # Let exceptions escape World.update instead of printing them
+    tick_unit: str = "year"  # Length of one World.update: "day", "month" or "year"
     
     def __post_init__(self):
         if self.initial_resources is None:
@@ -22,77 +51,349 @@ class WorldConfig:
                 "minerals": 5000.0
             }
 
+def _fill_cycle(column: np.ndarray, pattern: np.ndarray):
+    """Fill a column with `pattern` repeated (row i gets pattern[i % len(pattern)]) without temporaries"""
+    period = len(pattern)
+    whole = len(column) // period * period
+    column[:whole].reshape(-1, period)[:] = pattern
+    column[whole:] = pattern[:len(column) - whole]
+
 class World:
     def __init__(self, config: WorldConfig):
         self.config = config
         self.time = TimeManager()
-        self.population: List[Person] = []
-        self.corporations: List[Corporation] = []
-        self.economy = EconomySystem()
-        self.politics = PoliticalSystem()
+        # Un flujo independiente por subsistema, todos derivados de la semilla
+        self.rngs = RngRegistry(config.seed)
+        self.rng = self.rngs.stream("world")
+        self.population: Union[List[Person], PopulationTable] = []
+        self.corporations: Union[List[Corporation], CorporationTable] = []
+        self.employment: Optional[EmploymentIndex] = None
+        self._people_by_region: Optional[RegionIndex] = None
+        self._corporations_by_region: Optional[RegionIndex] = None
+        self.economy = EconomySystem(self.rngs.stream("economy"))
+        self.politics = PoliticalSystem(self.rngs.stream("politics"))
+        self.social = SocialSystem()
+        self.events = EventScheduler(self.rngs.stream("events"))
+        self.profiler = Profiler(config.profile or config.profile_memory, config.profile_memory)
+        self.economy.profiler = self.profiler
+        self.last_error: Optional[Exception] = None
+        self.history: Optional[HistoryRecorder] = None
+        if config.record_history:
+            self.history = HistoryRecorder(config.history_path, sample_stride=config.history_sample_stride)
+        self.changes = ChangeFeed()
+        self.scheduler = CadenceScheduler()
+        self._register_systems()
         self._initialize_world()
+
+    def _register_systems(self):
+        """Each system runs at its own cadence, in this order when several are due on a tick"""
+        scheduler = self.scheduler
+        scheduler.register("politics", YEARLY, self._update_politics)
+        scheduler.register("events", YEARLY, self._fire_events)
+        scheduler.register("economy", MONTHLY, self._update_economy)
+        scheduler.register("social", YEARLY, self._update_social)
+        scheduler.register("corporations", QUARTERLY, self._update_corporations)
+        scheduler.register("population", DAILY, self._update_households)
+        scheduler.register("aging", YEARLY, self._age_population)
+        scheduler.register("migration", YEARLY, self._migrate)
         
     def _initialize_world(self):
         """Initialize the world with starting conditions"""
         # Initialize political system first as it affects other systems
         self.politics.initialize_governments(self.config.region_count)
+        self.politics.random_shocks = False
+        self.events.schedule(PoliticalShock())
         
-        # Initialize corporations
-        self.corporations = Corporation.generate_initial_corporations(50)
-        
-        # Initialize population
-        for i in range(self.config.initial_population):
-            person = Person(
-                person_id=i,
-                age=20 + i % 40,  # Ages 20-60
-                education_level=i % 5 + 1,  # Levels 1-5
-                skills={"general": 0.5},
+        # Initialize corporations and population
+        if self.config.columnar:
+            self.corporations = CorporationTable.generate(
+                self.config.corporation_count, self.rngs.stream("corporations"))
+            # Corporations are spread over the regions in contiguous blocks, like people
+            ids = np.arange(len(self.corporations))
+            self.corporations.region[:] = ids * self.config.region_count // max(len(ids), 1)
+            self.population = self._create_population_table(self.config.initial_population)
+            self.employment = EmploymentIndex(self.population.employer_id)
+            self.employment.register_table(self.corporations)
+            self.economy.job_market = JobMarket(self.corporations, self.rngs.stream("labor"))
+            if self.config.social_degree > 0:
+                self.social.initialize_graph(self.population.location, self.config.social_degree,
+                                             self.rngs.stream("social"))
+        else:
+            self.corporations = Corporation.generate_initial_corporations(
+                self.config.corporation_count, self.rngs.stream("corporations"))
+            for corporation in self.corporations:
+                corporation.region = corporation.id * self.config.region_count // len(self.corporations)
+            ids = np.arange(self.config.initial_population)
+            self.population = Person.generate_many(
+                self.config.initial_population, self.rngs.stream("population"),
+                age=(20 + ids % 40).tolist(),  # Ages 20-60
+                education_level=(ids % 5 + 1).tolist(),  # Levels 1-5
                 wealth=1000.0
             )
-            self.population.append(person)
+            self.employment = EmploymentIndex.for_population(self.population)
+            for corporation in self.corporations:
+                self.employment.register(corporation)
             
         # Initialize economy with resources
         self.economy.initialize_markets(self.config.initial_resources)
+        self.economy.calibrate_prices(self.corporations)
+        self.economy.initialize_regional_markets(
+            self.config.region_count, self.rng.uniform(0.8, 1.2, self.config.region_count))
+        if isinstance(self.corporations, CorporationTable):
+            self.economy.initialize_clearing(list(self.corporations.resources), self.config.region_count)
+
+    def _create_population_table(self, size: int) -> PopulationTable:
+        """Build the starting population directly as arrays, drawing each random column in one call"""
+        regions = self.config.region_count
+        table = PopulationTable(size)
+        _fill_cycle(table.age, np.arange(20, 60))  # Ages 20-60
+        _fill_cycle(table.education_level, np.arange(1, 6))  # Levels 1-5
+        # Regions in contiguous blocks: row i lives in region i * regions // size
+        starts = -(-np.arange(regions + 1) * size // max(regions, 1))
+        for region in range(regions):
+            table.location[starts[region]:starts[region + 1]] = region
+        table.wealth.fill(1000.0)
+        rng = self.rngs.stream("population")
+        # Draws go straight into the float32 columns, without float64 temporaries
+        rng.random(dtype=np.float32, out=table.intelligence)
+        table.intelligence *= np.float32(60)
+        table.intelligence += np.float32(70)
+        table.personality[:] = rng.integers(0, len(PERSONALITIES), size, dtype=table.personality.dtype)
+        # Same distribution as Person.__post_init__, rescaled to proficiency (0.0-1.0)
+        rng.standard_normal(dtype=np.float32, out=table.skills)
+        table.skills *= np.float32(0.15)
+        table.skills += np.float32(0.5)
+        np.clip(table.skills, 0.0, 1.0, out=table.skills)
+        table.stats = PopulationAggregates(regions)
+        table.refresh_stats()
+        return table
         
     def update(self):
-        """Update the world state for one time step"""
+        """Update the world state for one tick of WorldConfig.tick_unit"""
+        profiler = self.profiler
         try:
-            # Update time
-            current_year = self.time.current_year
-            
-            # Update systems
-            self.politics.update(current_year)
-            self.economy.update(self.corporations, self.population)
-            
-            # Update entities
-            for corporation in self.corporations:
-                corporation.produce_resources()
-                corporation.calculate_operating_costs()
-                corporation.calculate_revenue(self.economy.get_market_prices())
-                
-            for person in self.population:
-                person.update(self.economy)
+            # Update the systems that are due on this tick
+            self.scheduler.run(self.time, self.config.tick_unit, profiler)
+            if self.config.debug_statistics:
+                with profiler.phase("verify_statistics"):
+                    self._verify_statistics()
+            if self.history is not None:
+                with profiler.phase("history"):
+                    self.history.record(self)
+            if self.changes.subscriptions:
+                with profiler.phase("changes"):
+                    self.changes.publish(self)
             
             # Advance time
-            self.time.advance_year()
+            self.time.advance(self.config.tick_unit)
             
             return True
             
         except Exception as e:
-            print(f"Error en la simulación: {str(e)}")
+            self.last_error = e
+            profiler.count("errors")
+            if self.config.raise_errors:
+                raise
+            print(f"Error en la simulación: {e!r}")
+            traceback.print_exc()
             return False
-            
+
+    def _update_politics(self, periods: int, years: float):
+        self.politics.update(self.time.current_year, self.population)
+
+    def _fire_events(self, periods: int, years: float):
+        self.profiler.count("events_fired", self.events.advance(self))
+
+    def _update_economy(self, periods: int, years: float):
+        self.economy.update(self.corporations, self.population, years)
+
+    def _update_social(self, periods: int, years: float):
+        self.social.update(self)
+
+    def _update_corporations(self, periods: int, years: float):
+        if isinstance(self.corporations, CorporationTable):
+            self.corporations.update(self.economy.price_vector(self.corporations.resources), years)
+            return
+        prices = self.economy.get_market_prices()
+        for corporation in self.corporations:
+            corporation.produce_resources(years)
+            corporation.calculate_operating_costs()
+            corporation.calculate_revenue(prices)
+
+    def _update_households(self, periods: int, years: float):
+        """Consumption, salaries and life events of every person over `years`"""
+        if isinstance(self.population, PopulationTable):
+            # Row-keyed streams: the same draws as ParallelWorld's shards
+            rows = self.rngs.rows("population", self.time.ordinal(), 0, len(self.population))
+            spent = update_households(self.population, rows, years)
+            self.economy.record_spending(spent, BASIC_NEEDS_COST * years * len(self.population))
+
+    def _age_population(self, periods: int, years: float):
+        if isinstance(self.population, PopulationTable):
+            age_population(self.population, periods)
+        else:
+            # Person objects keep their yearly update
+            rng = self.rngs.stream("population")
+            for _ in range(periods):
+                for person in self.population:
+                    person.update(self.economy, rng)
+
+    def _migrate(self, periods: int, years: float):
+        """Move a random share of the population to a different region"""
+        size, regions = len(self.population), self.config.region_count
+        if self.config.migration_rate <= 0 or regions < 2 or not size:
+            return
+        rng = self.rngs.stream("migration")
+        movers = rng.choice(size, rng.binomial(size, self.config.migration_rate), replace=False)
+        if isinstance(self.population, PopulationTable):
+            current = self.population.location[movers]
+        else:
+            current = np.array([self.population[i].location for i in movers], dtype=np.int64)
+        destinations = (current + rng.integers(1, regions, len(movers))) % regions
+        self.move_people(movers, destinations)
+
+    def move_people(self, ids: np.ndarray, destinations: np.ndarray):
+        """Move people to other regions; locations must change through here to keep the region index current"""
+        if isinstance(self.population, PopulationTable):
+            self.population.assign("location", ids, destinations)
+        else:
+            destinations = np.broadcast_to(destinations, np.shape(ids))
+            for person_id, region in zip(np.asarray(ids).tolist(), destinations.tolist()):
+                self.population[person_id].location = int(region)
+        if self._people_by_region is not None:
+            self._people_by_region.move(ids, destinations)
+
+    def move_corporations(self, ids: np.ndarray, destinations: np.ndarray):
+        """Move corporations to other regions, keeping the region index current"""
+        if isinstance(self.corporations, CorporationTable):
+            self.corporations.assign("region", ids, destinations)
+        else:
+            destinations = np.broadcast_to(destinations, np.shape(ids))
+            for corporation_id, region in zip(np.asarray(ids).tolist(), destinations.tolist()):
+                self.corporations[corporation_id].region = int(region)
+        if self._corporations_by_region is not None:
+            self._corporations_by_region.move(ids, destinations)
+
+    @property
+    def people_by_region(self) -> RegionIndex:
+        """Person ids of every region; built on first use, then kept current by move_people"""
+        if self._people_by_region is None:
+            self._people_by_region = RegionIndex(self._locations(), self.config.region_count)
+        return self._people_by_region
+
+    @property
+    def corporations_by_region(self) -> RegionIndex:
+        """Corporation ids of every region; built on first use, then kept current by move_corporations"""
+        if self._corporations_by_region is None:
+            self._corporations_by_region = RegionIndex(self._corporation_regions(), self.config.region_count)
+        return self._corporations_by_region
+
+    def _locations(self) -> np.ndarray:
+        if isinstance(self.population, PopulationTable):
+            return self.population.location
+        return np.array([person.location for person in self.population], dtype=np.int32)
+
+    def _corporation_regions(self) -> np.ndarray:
+        if isinstance(self.corporations, CorporationTable):
+            return self.corporations.region
+        return np.array([corporation.region for corporation in self.corporations], dtype=np.int32)
+
+    def get_profile(self) -> Dict:
+        """Phase timings and counters collected while WorldConfig.profile is on"""
+        return self.profiler.report()
+
+    def export_profile(self, path: str) -> str:
+        """Write get_profile() as JSON to `path` and return the text"""
+        return self.profiler.to_json(path)
+
+    def subscribe(self, callback: Callable[[int, List[ChangeBatch]], None], entities: Optional[Iterable[str]] = None,
+                  fields: Optional[Iterable[str]] = None, regions: Optional[Iterable[int]] = None,
+                  initial: bool = True) -> Subscription:
+        """Receive the rows and fields that change on every tick (see world.changes)"""
+        return self.changes.subscribe(self, callback, entities, fields, regions, initial)
+
+    def unsubscribe(self, subscription: Subscription):
+        self.changes.unsubscribe(subscription)
+
+    def close(self):
+        """Flush anything still buffered (e.g. the history)"""
+        if self.history is not None:
+            self.history.close()
+
+    def save_checkpoint(self, path: str):
+        """Write a binary snapshot of the whole world to the directory `path`"""
+        from .checkpoint import save_checkpoint
+        save_checkpoint(self, path)
+
+    @classmethod
+    def load_checkpoint(cls, path: str, mmap: bool = True) -> 'World':
+        """Resume a world from a snapshot written by save_checkpoint"""
+        from .checkpoint import load_checkpoint
+        world = load_checkpoint(path, mmap)
+        if not isinstance(world, cls):
+            raise TypeError(f"Checkpoint holds a {type(world).__name__}, not a {cls.__name__}")
+        return world
+
     def get_current_year(self) -> int:
         """Get the current year of the simulation"""
         return self.time.current_year
         
     def get_statistics(self) -> Dict:
-        """Get current statistics of the world"""
+        """
+        Get current statistics of the world. For columnar worlds this is O(1)
+        in the population size: the household kernel leaves the aggregates
+        current at the end of every tick.
+        """
+        aggregates = self._aggregates()
         return {
             "year": self.time.current_year,
             "population": len(self.population),
             "corporations": len(self.corporations),
             "market_prices": self.economy.get_market_prices(),
             "political_state": self.politics.get_state_report(),
-            "average_wealth": sum(p.wealth for p in self.population) / len(self.population) if self.population else 0
-        } 
\ No newline at end of file
+            "average_wealth": aggregates.average_wealth(),
+            "average_happiness": aggregates.average_happiness(),
+            "average_health": aggregates.average_health(),
+            "employment_rate": self._employment_rate(),
+            "gini": aggregates.gini(),
+            "regional_wealth": aggregates.region_wealth.tolist()
+        }
+
+    def _verify_statistics(self):
+        """Compare the running aggregates and region indexes with a full recompute and fail on any drift"""
+        errors = {}
+        table = self.population
+        if isinstance(table, PopulationTable) and table.stats is not None:
+            fresh = PopulationAggregates(self.config.region_count)
+            fresh.refresh(table.wealth, table.happiness, table.health, table.location)
+            errors = table.current_stats().differences(fresh)
+            employed = int(np.count_nonzero(table.employer_id != -1))
+            if self.employment.employed != employed:
+                errors["employed"] = f"{self.employment.employed} != {employed}"
+        # A location written around move_people/move_corporations leaves the indexes stale
+        if self._people_by_region is not None and not self._people_by_region.check(self._locations()):
+            errors["people_by_region"] = "out of sync with the location column"
+        if (self._corporations_by_region is not None and
+                not self._corporations_by_region.check(self._corporation_regions())):
+            errors["corporations_by_region"] = "out of sync with the region column"
+        if errors:
+            raise RuntimeError(f"Running statistics drifted: {errors}")
+
+    def _aggregates(self) -> PopulationAggregates:
+        """Running aggregates of the table, or a one-off pass over Person objects"""
+        if isinstance(self.population, PopulationTable) and self.population.stats is not None:
+            return self.population.current_stats()
+        people = self.population
+        aggregates = PopulationAggregates(self.config.region_count)
+        aggregates.refresh(np.array([p.wealth for p in people], dtype=np.float64),
+                           np.array([p.happiness for p in people], dtype=np.float64),
+                           np.array([p.health for p in people], dtype=np.float64),
+                           np.array([p.location for p in people], dtype=np.int64))
+        return aggregates
+
+    def _employment_rate(self) -> float:
+        if not len(self.population):
+            return 0.0
+        if isinstance(self.population, PopulationTable):
+            return self.employment.employed / len(self.population)
+        return sum(1 for p in self.population if p.job) / len(self.population)
@@ -0,0 +1,49 @@
+import pickle
+import numpy as np
+import pytest
+from entities.corporation import COMPANY_NAMES, INDUSTRIES
+from utils.categorical import REGISTRY, Categories, categories
+from utils.name_generator import NameGenerator, NamePool
+
+def test_categories_round_trip_codes():
+    table = Categories(["farming", "mining"])
+    codes = table.encode(["mining", "fishing", "farming", "fishing"])
+    assert codes.tolist() == [1, 2, 0, 2]
+    assert table.decode(codes) == ["mining", "fishing", "farming", "fishing"]
+    assert list(table) == ["farming", "mining", "fishing"] and table[2] == "fishing"
+    assert table.index("mining") == 1 and "mining" in table and "forestry" not in table
+    with pytest.raises(ValueError):
+        table.index("forestry")
+    assert table.totals(codes, np.array([1.0, 2.0, 3.0, 4.0])) == {"farming": 3.0, "mining": 1.0, "fishing": 6.0}
+    assert table.counts(codes).tolist() == [1, 1, 2]
+
+def test_registered_categories_are_shared_and_survive_pickling():
+    kind = "test_shared_kind"
+    table = categories(kind, ["a", "b"])
+    assert categories(kind) is table
+    assert categories(kind, ["b", "c"]).names == ["a", "b", "c"]
+    assert pickle.loads(pickle.dumps(table)) is table
+    assert pickle.loads(pickle.dumps(INDUSTRIES)) is INDUSTRIES
+    del REGISTRY[kind]
+    loose = pickle.loads(pickle.dumps(Categories(["x", "y"])))
+    assert loose.names == ["x", "y"] and loose.code("y") == 1
+
+def test_name_pool_codes_round_trip():
+    pool = NamePool(["Ana", "Luis", "Eva"], ["García", "López"])
+    assert pool.size == 6
+    for code in range(pool.size):
+        assert pool.code(pool.name(code)) == code
+    drawn = pool.draw(100, np.random.default_rng(0))
+    assert pool.names(drawn) == [pool.name(code) for code in drawn]
+    assert pool.name(pool.code("Ana López")) == "Ana López"
+
+    custom = pool.code("Ana María López")  # Not built from the word lists: interned after them
+    assert custom >= pool.size and pool.code("Ana María López") == custom
+    assert pool.name(custom) == "Ana María López"
+    assert pool.code("Zoe García") == custom + 1
+
+def test_generated_names_come_from_the_shared_pools():
+    for name in NameGenerator.generate_names(50, np.random.default_rng(1)):
+        assert NameGenerator.POOL.code(name) < NameGenerator.POOL.size
+    codes = COMPANY_NAMES.draw(50, np.random.default_rng(2))
+    assert [COMPANY_NAMES.code(name) for name in COMPANY_NAMES.names(codes)] == codes.tolist()
@@ -0,0 +1,61 @@
+import numpy as np
+import pytest
+from world.changes import ENTITIES, entity_columns
+from world.world import World, WorldConfig
+
+class Mirror:
+    """A subscriber that rebuilds the fields it is sent, row by row"""
+    def __init__(self):
+        self.fields = {}
+        self.ticks = []
+
+    def __call__(self, tick, batches):
+        self.ticks.append(tick)
+        for batch in batches:
+            self.fields.setdefault((batch.entity, batch.field), {}).update(
+                zip(batch.ids.tolist(), batch.values.tolist()))
+
+def _world(columnar):
+    return World(WorldConfig(initial_population=3000, region_count=4, corporation_count=20, columnar=columnar,
+                             seed=1, migration_rate=0.05, tick_unit="month", raise_errors=True))
+
+@pytest.mark.parametrize("columnar", [True, False])
+def test_batches_rebuild_every_field(columnar):
+    world, mirror = _world(columnar), Mirror()
+    world.subscribe(mirror)
+    for _ in range(14):
+        assert world.update()
+        for entity in ENTITIES:
+            for field, values in entity_columns(world, entity)[0].items():
+                rows = mirror.fields[entity, field]
+                rebuilt = np.array([rows[i] for i in range(len(values))], dtype=values.dtype)
+                np.testing.assert_array_equal(rebuilt, values, err_msg=f"{entity}.{field}")
+    assert mirror.ticks == list(range(15))
+
+def test_batches_hold_only_changed_rows():
+    world = _world(True)
+    previous = {}
+
+    def check(tick, batches):
+        for batch in batches:
+            if tick:
+                before = previous[batch.entity, batch.field]
+                changed = np.flatnonzero(getattr(world.population, batch.field) != before)
+                np.testing.assert_array_equal(batch.ids, changed)
+        for field in ("wealth", "location", "employer_id"):
+            previous["population", field] = getattr(world.population, field).copy()
+
+    world.subscribe(check, entities=["population"], fields=["wealth", "location", "employer_id"])
+    for _ in range(6):
+        assert world.update()
+
+def test_region_filter_tracks_arrivals_and_departures():
+    world, mirror = _world(True), Mirror()
+    world.subscribe(mirror, entities=["population"], fields=["wealth", "location"], regions=[2])
+    for _ in range(14):
+        assert world.update()
+    table = world.population
+    locations, wealth = mirror.fields["population", "location"], mirror.fields["population", "wealth"]
+    inside = np.flatnonzero(table.location == 2)
+    assert sorted(row for row, region in locations.items() if region == 2) == inside.tolist()
+    np.testing.assert_array_equal([wealth[row] for row in inside.tolist()], table.wealth[inside])
@@ -0,0 +1,41 @@
+import numpy as np
+from world.world import World, WorldConfig
+
+def _state(world):
+    population = world.population
+    state = {column: values.copy() for column, values in population.columns().items()}
+    state["skills"] = population.skills.copy()
+    state.update({f"corporations.{column}": values.copy() for column, values in world.corporations.arrays().items()})
+    state["prices"] = world.economy.market.prices.copy()
+    return state
+
+def _assert_same(first, second):
+    assert first.keys() == second.keys()
+    for key in first:
+        np.testing.assert_array_equal(first[key], second[key], err_msg=key)
+
+def test_resume_is_bit_for_bit_and_can_save_over_its_own_checkpoint(tmp_path):
+    config = WorldConfig(initial_population=5000, corporation_count=50, columnar=True, seed=8, raise_errors=True,
+                         tick_unit="month", migration_rate=0.02)
+    original = World(config)
+    for _ in range(3):
+        original.update()
+    path = str(tmp_path / "checkpoint")
+    original.save_checkpoint(path)
+
+    resumed = World.load_checkpoint(path)
+    for _ in range(4):
+        original.update()
+        resumed.update()
+    _assert_same(_state(original), _state(resumed))
+
+    # The resumed world still maps the blocks it is about to overwrite
+    resumed.save_checkpoint(path)
+    _assert_same(_state(original), _state(resumed))
+    again = World.load_checkpoint(path)
+    _assert_same(_state(resumed), _state(again))
+    for _ in range(2):
+        original.update()
+        again.update()
+    _assert_same(_state(original), _state(again))
+    assert [entry.name for entry in tmp_path.iterdir()] == ["checkpoint"]
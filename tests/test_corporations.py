@@ -0,0 +1,61 @@
+import numpy as np
+import pytest
+from entities.corporation import RESOURCES, Corporation
+from entities.corporation_table import CorporationTable
+
+def _pair(count=25, seed=3):
+    corporations = Corporation.generate_initial_corporations(count, np.random.default_rng(seed))
+    return corporations, CorporationTable.generate(count, np.random.default_rng(seed))
+
+def _assert_same(corporations, table):
+    assert len(table) == len(corporations)
+    for corporation, view in zip(corporations, table):
+        assert view.id == corporation.id
+        assert view.name == corporation.name
+        assert view.industry_type == corporation.industry_type
+        assert view.capital == corporation.capital
+        assert view.profit_margin == corporation.profit_margin
+        assert view.operating_costs == pytest.approx(corporation.operating_costs)
+        assert view.revenue == pytest.approx(corporation.revenue)
+        assert view.desired_employees() == corporation.desired_employees()
+        for resource in RESOURCES:
+            assert view.production_capacity.get(resource, 0.0) == corporation.production_capacity.get(resource, 0.0)
+            assert view.inventory.get(resource, 0.0) == pytest.approx(corporation.inventory.get(resource, 0.0))
+
+def test_generate_matches_the_object_constructor():
+    corporations, table = _pair()
+    _assert_same(corporations, table)
+    assert table.by_industry() == {industry: sum(corporation.industry_type == industry
+                                                 for corporation in corporations)
+                                   for industry in {corporation.industry_type for corporation in corporations}}
+
+def test_vectorized_update_matches_the_objects():
+    corporations, table = _pair()
+    prices = np.random.default_rng(4).uniform(5.0, 50.0, len(RESOURCES))
+    market_prices = dict(zip(RESOURCES, prices.tolist()))
+    for corporation, view in zip(corporations, table):
+        staff = range(corporation.id * 10, corporation.id * 10 + corporation.id % 7)
+        corporation.hire_many(staff)
+        view.hire_many(staff)
+    table.count_employees()
+    for years in (1.0, 0.25):
+        for corporation in corporations:
+            corporation.produce_resources(years)
+            corporation.calculate_operating_costs()
+            corporation.calculate_revenue(market_prices)
+        table.update(prices, years)
+        _assert_same(corporations, table)
+
+def test_from_corporations_round_trips_objects():
+    corporations, _ = _pair(count=10)
+    corporations[3].region = 2
+    corporations[3].hire_many([1, 2, 3])
+    corporations[5].production_capacity["helium"] = 7.0  # Resource outside RESOURCES
+    table = CorporationTable.from_corporations(corporations)
+    assert table.resources[-1] == "helium"
+    assert table[3].region == 2 and table.employee_count[3] == 3
+    assert sorted(table[3].employees) == [1, 2, 3]
+    assert table[5].production_capacity["helium"] == 7.0
+    assert table[-1] == table[9] and table[9] != table[8]
+    with pytest.raises(IndexError):
+        table[10]
@@ -0,0 +1,51 @@
+import numpy as np
+from world.world import World, WorldConfig
+
+def _employers(world):
+    return np.array([person.employer_id for person in world.population])
+
+def test_object_index_follows_person_employers():
+    world = World(WorldConfig(initial_population=400, corporation_count=8, seed=4, raise_errors=True))
+    employment = world.employment
+    np.testing.assert_array_equal(employment.employer_of, _employers(world))
+
+    assert employment.hire_many(0, range(0, 100)) == 100
+    assert employment.hire_many(1, range(50, 150)) == 100  # 50 move over from corporation 0
+    world.corporations[2].hire_employee(300)
+    employment.fire_many(1, [60, 61])
+    employment.mass_layoff(0, 0.5, np.random.default_rng(0))
+
+    employers = _employers(world)
+    np.testing.assert_array_equal(employment.employer_of, employers)
+    assert employment.employed == np.count_nonzero(employers != -1)
+    for corporation in world.corporations:
+        np.testing.assert_array_equal(np.sort(employment.employees(corporation.id)),
+                                      np.flatnonzero(employers == corporation.id))
+
+    # Employed people now grow their skills during the tick
+    assert world.update()
+    np.testing.assert_array_equal(employment.employer_of, _employers(world))
+
+def test_hiring_someone_away_moves_them_off_the_old_roster():
+    world = World(WorldConfig(initial_population=50, corporation_count=3, seed=4))
+    first, second = world.corporations[0], world.corporations[1]
+    assert first.hire_employee(7)
+    assert second.hire_employee(7)
+    assert 7 not in first.employees and 7 in second.employees
+    assert world.employment.employee_counts[first.id] == len(first.employees) == 0
+    assert world.employment.employee_counts[second.id] == len(second.employees) == 1
+    # The old employer no longer has them to fire
+    assert not first.fire_employee(7)
+    assert world.population[7].employer_id == second.id
+
+def test_layoffs_follow_the_callers_stream():
+    fired = []
+    for _ in range(2):
+        world = World(WorldConfig(initial_population=400, corporation_count=4, seed=4))
+        world.employment.hire_many(0, range(100))
+        world.employment.hire_many(1, range(100, 200))
+        rng = world.rngs.stream("events")
+        fired.append((world.employment.mass_layoff(0, 0.3, rng).tolist(),
+                      world.corporations[1].lay_off(0.3, rng).tolist()))
+    assert fired[0] == fired[1]
+    assert len(fired[0][0]) == len(fired[0][1]) == 30
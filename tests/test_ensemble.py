@@ -0,0 +1,25 @@
+import numpy as np
+from world.ensemble import EnsembleRunner
+from world.world import WorldConfig
+
+CONFIG = WorldConfig(initial_population=300, corporation_count=6, columnar=True, raise_errors=True)
+
+def test_stream_yields_every_tick_as_it_arrives():
+    with EnsembleRunner(CONFIG, replicas=3, ticks=4, workers=0, seed=1) as runner:
+        updates = []
+        for update in runner.stream():
+            updates.append((update.replica, update.tick))
+            # The running mean already covers the tick just received
+            assert not np.isnan(runner.running_mean()[update.tick]).all()
+        assert updates == [(replica, tick) for replica in range(3) for tick in range(4)]
+        result = runner.result()
+    np.testing.assert_allclose(result.mean, runner.running_mean())
+
+def test_workers_stream_the_same_ticks_as_a_serial_run():
+    with EnsembleRunner(CONFIG, replicas=3, ticks=4, workers=0, seed=1) as runner:
+        serial = runner.run()
+    with EnsembleRunner(CONFIG, replicas=3, ticks=4, workers=2, seed=1) as runner:
+        ticks = sorted((update.replica, update.tick) for update in runner.stream())
+        parallel = runner.result()
+    assert ticks == [(replica, tick) for replica in range(3) for tick in range(4)]
+    np.testing.assert_array_equal(serial.samples, parallel.samples)
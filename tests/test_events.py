@@ -0,0 +1,105 @@
+import numpy as np
+from events.base import PoliticalEvent
+from events.personal import Illness, Layoff
+from events.political import PoliticalShock
+from events.scheduler import EventScheduler
+from world.world import World, WorldConfig
+
+class Recorder(PoliticalEvent):
+    def __init__(self, name, probability):
+        super().__init__(name, probability)
+        self.ticks = []
+        self.scheduler = None
+
+    def trigger(self, world):
+        self.ticks.append(self.scheduler.tick)
+
+def _world(**overrides):
+    config = dict(initial_population=2000, corporation_count=10, columnar=True, seed=5, raise_errors=True)
+    config.update(overrides)
+    return World(WorldConfig(**config))
+
+def test_world_event_fires_at_its_geometric_ticks():
+    world = _world()
+    scheduler = EventScheduler(np.random.default_rng(7))
+    event = Recorder("rare", 0.05)
+    event.scheduler = scheduler
+    scheduler.schedule(event)
+
+    # Same generator, same draws: the event waits a geometric number of ticks after each firing
+    draws = np.random.default_rng(7)
+    expected, due = [], int(draws.geometric(0.05))
+    while due < 500:
+        expected.append(due)
+        due += int(draws.geometric(0.05))
+    assert scheduler.next_firing() == expected[0]
+    for _ in range(499):
+        scheduler.advance(world)
+    assert event.ticks == expected
+    assert scheduler.fired == {"rare": len(expected)}
+    assert scheduler.next_firing() == due
+
+def test_queued_events_fire_in_tick_order_and_keep_their_own_rates():
+    world = _world()
+    scheduler = EventScheduler(np.random.default_rng(8))
+    rare, frequent = Recorder("rare", 0.02), Recorder("frequent", 0.5)
+    for event in (rare, frequent):
+        event.scheduler = scheduler
+        scheduler.schedule(event)
+    for _ in range(2000):
+        due = scheduler.next_firing()
+        scheduler.advance(world)
+        assert scheduler.next_firing() > scheduler.tick >= due or scheduler.tick < due
+    for event in (rare, frequent):
+        assert event.ticks == sorted(set(event.ticks))
+        assert abs(len(event.ticks) / 2000 - event.probability) < 0.3 * event.probability
+    scheduler.remove(rare)
+    count = len(rare.ticks)
+    for _ in range(200):
+        scheduler.advance(world)
+    assert len(rare.ticks) == count and len(frequent.ticks) > 0
+
+def test_certain_political_shock_fires_every_tick():
+    world = _world()
+    scheduler = EventScheduler(np.random.default_rng(1))
+    scheduler.schedule(PoliticalShock(probability=1.0, max_impact=0.5))
+    assert scheduler.next_firing() == 1
+    for tick in range(1, 6):
+        before = world.politics.stability
+        assert scheduler.advance(world) == 1
+        assert scheduler.fired["Political shock"] == tick
+        assert 0.0 <= world.politics.stability <= 1.0 and world.politics.stability != before
+
+def test_illness_strikes_a_binomial_draw_of_people():
+    world = _world()
+    scheduler = EventScheduler(np.random.default_rng(2))
+    scheduler.schedule(Illness(probability=0.1, severity=0.25))
+    health = world.population.health.copy()
+
+    struck = scheduler.advance(world)
+    draws = np.random.default_rng(2)
+    expected = int(draws.binomial(len(health), 0.1))
+    assert struck == expected == scheduler.fired["Illness"]
+    people = draws.choice(len(health), expected, replace=False)
+    np.testing.assert_allclose(world.population.health[people], np.maximum(health[people] - 0.25, 0.0))
+    untouched = np.setdiff1d(np.arange(len(health)), people)
+    np.testing.assert_array_equal(world.population.health[untouched], health[untouched])
+
+def test_certain_layoff_leaves_everyone_unemployed():
+    world = _world()
+    employment = world.employment
+    employment.hire_many(0, range(0, 300))
+    assert employment.employed > 0
+    scheduler = EventScheduler(np.random.default_rng(3))
+    scheduler.schedule(Layoff(probability=1.0))
+    assert scheduler.advance(world) == len(world.population)
+    assert employment.employed == 0
+    assert np.all(employment.employer_of == -1)
+
+def test_world_schedules_the_political_shock():
+    world = _world()
+    due = world.events.next_firing()
+    assert due is not None
+    for _ in range(due):
+        assert world.update()
+    assert world.events.fired.get("Political shock", 0) >= 1
@@ -0,0 +1,55 @@
+import numpy as np
+import pytest
+from entities.population import PopulationTable
+from world.history import HistoryRecorder, load_history_arrays
+from world.world import World, WorldConfig
+
+def _world(**options):
+    return World(WorldConfig(initial_population=3000, corporation_count=20, columnar=True, seed=6,
+                             raise_errors=True, record_history=True, tick_unit="month", **options))
+
+def test_history_records_every_tick_across_chunks(tmp_path):
+    world = _world(history_path=str(tmp_path))
+    world.history = HistoryRecorder(str(tmp_path), chunk_size=4)
+    wealth, gini = [], []
+    for _ in range(10):
+        assert world.update()
+        statistics = world.get_statistics()
+        wealth.append(statistics["average_wealth"])
+        gini.append(statistics["gini"])
+    assert world.history.chunks == [4, 4] and world.history.ticks == 10
+
+    in_memory = world.history.to_arrays()
+    np.testing.assert_allclose(in_memory["average_wealth"], wealth)
+    np.testing.assert_allclose(in_memory["gini"], gini)
+    world.history.close()
+    on_disk = load_history_arrays(str(tmp_path))
+    assert on_disk.keys() == in_memory.keys()
+    for column, values in in_memory.items():
+        np.testing.assert_array_equal(on_disk[column], values, err_msg=column)
+    quantiles = [on_disk[f"wealth.q{q}"] for q in ("10", "50", "90")]
+    assert np.all(quantiles[0] <= quantiles[1]) and np.all(quantiles[1] <= quantiles[2])
+
+def test_recording_never_rebuilds_the_aggregates(monkeypatch):
+    world = _world()
+    def rebuild(table):
+        raise AssertionError("statistics were rebuilt from every row")
+    monkeypatch.setattr(PopulationTable, "refresh_stats", rebuild)
+    for _ in range(3):
+        assert world.update()  # Records the tick
+    assert world.history.ticks == 3
+
+def test_agent_samples_follow_the_sampled_people(tmp_path):
+    pd = pytest.importorskip("pandas")
+    from world.history import load_agent_samples, load_history
+    world = _world(history_path=str(tmp_path), history_sample_stride=100)
+    wealth = []
+    for _ in range(3):
+        assert world.update()
+        wealth.append(world.population.wealth[::100].copy())
+    world.history.close()
+    samples = load_agent_samples(str(tmp_path))
+    assert isinstance(samples, pd.DataFrame)
+    np.testing.assert_array_equal(samples["person_id"].unique(), np.arange(0, 3000, 100))
+    np.testing.assert_array_equal(samples["wealth"].to_numpy().reshape(3, -1), np.array(wealth))
+    assert len(load_history(str(tmp_path))) == 3
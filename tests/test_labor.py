@@ -0,0 +1,54 @@
+import numpy as np
+from systems.labor import MIN_EMPLOYABILITY, employability
+from world.world import World, WorldConfig
+
+def _check_ledger(market, corporations):
+    """Every corporation has exactly its staffing gap open, and the counts agree with the openings"""
+    open_slots = np.flatnonzero(market.open)
+    assert market.open_total == len(open_slots) == len(market) == market.open_count.sum()
+    np.testing.assert_array_equal(market.open_count,
+                                  np.bincount(market.corporation_id[open_slots], minlength=len(market.open_count)))
+    gap = np.maximum(corporations.desired_employees() - corporations.employee_count, 0)
+    np.testing.assert_array_equal(market.open_count[:len(corporations)], gap)
+
+def _expected_salaries(market, population, seekers):
+    """Brute force: each education level, most educated first, takes the best-paid openings it qualifies for"""
+    seekers = seekers[population.employer_id[seekers] == -1]
+    seekers = seekers[employability(population, seekers) > MIN_EMPLOYABILITY]
+    available = np.flatnonzero(market.open)
+    available = available[np.argsort(-market.salary[available], kind="stable")]
+    expected = {}
+    for level in np.unique(population.education_level[seekers])[::-1]:
+        group = seekers[population.education_level[seekers] == level]
+        eligible = available[market.education_level[available] <= level][:len(group)]
+        expected.update(zip(group[:len(eligible)].tolist(), market.salary[eligible].tolist()))
+        available = available[~np.isin(available, eligible)]
+    return expected
+
+def test_ledger_and_matching_under_churn():
+    world = World(WorldConfig(initial_population=4000, corporation_count=60, columnar=True, seed=12))
+    market, corporations, population = world.economy.job_market, world.corporations, world.population
+    rng = np.random.default_rng(0)
+    capacity = corporations.capacity.copy()
+    for step in range(12):
+        # Staffing targets move up and down, so seats are both opened and withdrawn
+        corporations.capacity[:] = capacity * rng.uniform(0.2, 6.0, (len(corporations), 1))
+        market.sync(corporations)
+        _check_ledger(market, corporations)
+        # Every other round only a few people look for work, so openings outnumber seekers
+        seekers = np.arange(len(population)) if step % 2 else np.sort(rng.choice(len(population), 40, replace=False))
+        expected = _expected_salaries(market, population, seekers)
+        before = population.employer_id.copy()
+        hires = market.match(population, None if step % 2 else seekers)
+        hired = np.flatnonzero(before != population.employer_id)
+        assert hires == len(hired) == len(expected)
+        np.testing.assert_allclose(population.salary[hired], [expected[row] for row in hired.tolist()])
+        _check_ledger(market, corporations)
+        best = market.best_opening(5)
+        if len(market):
+            assert market.salary[best] == market.salary[market.open].max()
+        # Some people quit, so the next round has seekers again
+        quitting = rng.choice(len(population), 300, replace=False)
+        quitting = quitting[population.employer_id[quitting] != -1]
+        for corporation_id in np.unique(population.employer_id[quitting]).tolist():
+            world.employment.fire_many(corporation_id, quitting[population.employer_id[quitting] == corporation_id])
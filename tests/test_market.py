@@ -0,0 +1,56 @@
+import numpy as np
+import pytest
+from entities.corporation_table import CorporationTable
+from systems.market import HOUSEHOLD_DEMAND
+from systems.trade import TradeEngine
+from world.world import World, WorldConfig
+
+def _world(columnar, **options):
+    return World(WorldConfig(initial_population=20000, corporation_count=200, columnar=columnar, seed=3,
+                             raise_errors=True, **options))
+
+def test_prices_start_on_the_same_scale_in_both_modes():
+    columnar, objects = _world(True).economy.get_market_prices(), _world(False).economy.get_market_prices()
+    assert columnar.keys() == objects.keys()
+    for resource, price in columnar.items():
+        assert objects[resource] == pytest.approx(price)
+    assert "water" not in columnar  # Nobody produces it, so it has no sellers and no price
+
+@pytest.mark.parametrize("tick_unit", ["month", "year"])
+def test_first_session_continues_the_initial_prices(tick_unit):
+    world = _world(True, tick_unit=tick_unit)
+    market = world.economy.market
+    initial = market.prices.copy()
+    world.update()
+    traded = market.volume > 0
+    assert traded.any()
+    ratio = market.prices[traded] / initial[traded]
+    assert np.all((ratio > 0.5) & (ratio < 2.0))
+    # Markets where nothing traded carry their last price
+    np.testing.assert_array_equal(market.prices[~traded], initial[~traded])
+
+def test_demand_counts_only_households_that_paid_for_their_basic_needs():
+    world = World(WorldConfig(initial_population=2000, corporation_count=20, seed=3, raise_errors=True))
+    for person in world.population[::2]:
+        person.wealth = 0.0
+    world.update()  # Half the households cannot pay this year...
+    world.update()  # ...so the next session only hears demand from the other half
+    assert world.economy.state.needs_met == pytest.approx(0.5)
+    for resource, quantity in HOUSEHOLD_DEMAND.items():
+        assert world.economy.state.demand[resource] == pytest.approx(1000 * quantity)
+
+def test_trade_ships_corporation_inventories_towards_dearer_regions():
+    corporations = CorporationTable(4, resources=("food", "energy"))
+    corporations.region[:] = [0, 0, 1, 2]
+    corporations.capacity[:] = [[10, 0], [30, 0], [20, 0], [0, 5]]
+    corporations.inventory[:] = [[100, 0], [300, 0], [0, 0], [0, 40]]
+    engine = TradeEngine(["food", "energy"], 3)
+    prices = np.array([[100.0, np.nan], [200.0, np.nan], [400.0, 10.0]])
+    assert engine.exchange(corporations, prices) > 0
+    np.testing.assert_allclose(corporations.inventory.sum(axis=0), [400, 40])
+    # Region 1 had no food in stock: its imports go to its producer
+    assert corporations.inventory[2, 0] == pytest.approx(engine.inventory[1, 0]) and engine.inventory[1, 0] > 0
+    # Region 0 exports in proportion to what each of its corporations held
+    assert corporations.inventory[1, 0] == pytest.approx(3 * corporations.inventory[0, 0])
+    # Region 2 produces no food, and energy has no price anywhere else: neither moves
+    assert corporations.inventory[3, 0] == 0 and corporations.inventory[3, 1] == 40
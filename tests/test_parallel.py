@@ -0,0 +1,21 @@
+import numpy as np
+from world.world import World, WorldConfig
+from world.parallel import ParallelWorld
+
+def test_sharded_kernels_match_a_serial_world():
+    config = WorldConfig(initial_population=4000, corporation_count=60, columnar=True, seed=5, raise_errors=True,
+                         tick_unit="month", migration_rate=0.02)
+    serial = World(config)
+    with ParallelWorld(config, workers=3) as parallel:
+        # Fourteen months cover households, quarterly corporate accounts and a yearly aging step
+        for _ in range(14):
+            serial.update()
+            parallel.update()
+        for column, values in serial.population.columns().items():
+            np.testing.assert_array_equal(values, getattr(parallel.population, column), err_msg=column)
+        np.testing.assert_array_equal(serial.population.skills, parallel.population.skills)
+        for column, values in serial.corporations.arrays().items():
+            np.testing.assert_array_equal(values, getattr(parallel.corporations, column), err_msg=column)
+    # Closed, the world keeps stepping serially on private copies
+    parallel.update()
+    assert parallel.pool is None
@@ -0,0 +1,27 @@
+import numpy as np
+import pytest
+from systems.elections import ElectionEngine
+from world.world import World, WorldConfig
+
+def test_election_result_stands_after_the_yearly_update():
+    world = World(WorldConfig(initial_population=2000, corporation_count=10, columnar=True, seed=3))
+    politics = world.politics
+    politics.update(politics.election_cycle * 10, world.population)
+    result = politics.last_election
+    assert result is not None
+    np.testing.assert_allclose([party.support_level for party in politics.parties], result.shares)
+    approval = [politics.regional_governments[region].local_approval for region in range(world.config.region_count)]
+    np.testing.assert_allclose(approval, result.regional_shares[:, result.winner])
+
+def test_elections_reject_out_of_range_region_codes():
+    world = World(WorldConfig(initial_population=2000, corporation_count=10, columnar=True, seed=3))
+    engine = ElectionEngine(world.config.region_count)
+    ideologies = [party.ideology for party in world.politics.parties]
+    standing = np.zeros((world.config.region_count, len(ideologies)))
+    votes = engine.run(world.population, ideologies, standing, np.random.default_rng(0))
+    assert votes.sum() == len(world.population)
+    np.testing.assert_array_equal(votes.sum(axis=1), np.bincount(world.population.location,
+                                                                 minlength=world.config.region_count))
+    world.population.location[7] = world.config.region_count  # Would be clipped onto the last region
+    with pytest.raises(ValueError, match="region"):
+        engine.run(world.population, ideologies, standing, np.random.default_rng(0))
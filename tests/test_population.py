@@ -0,0 +1,90 @@
+import numpy as np
+import pytest
+from entities.person import PERSONALITIES, Person
+from entities.population import PopulationTable, update_population
+from world.world import World, WorldConfig
+
+def _people(count: int, seed: int):
+    rng = np.random.default_rng(seed)
+    people = Person.generate_many(count, rng, age=rng.integers(18, 80, count).tolist(), education_level=3,
+                                  wealth=rng.uniform(0, 3000, count).tolist())
+    levels = rng.uniform(0.9, 1.0, (count, 2)).tolist()
+    wellbeing = rng.uniform(0.3, 0.9, (count, 2)).tolist()
+    for person, (farming, manufacturing), (happiness, health) in zip(people, levels, wellbeing):
+        person.skills = {"farming": farming, "manufacturing": manufacturing}
+        person.happiness, person.health = happiness, health
+    for person in people[::2]:
+        person.employer_id, person.salary = 0, 500.0
+    return people
+
+def test_table_kernel_matches_person_update():
+    people = _people(20000, seed=1)
+    table = PopulationTable.from_people(people)
+    rng = np.random.default_rng(2)
+    for person in people:
+        person.update(None, rng)
+    update_population(table, None, np.random.default_rng(3))
+
+    # Aging, basic needs, salaries and skill growth are deterministic
+    np.testing.assert_array_equal(table.age, [person.age for person in people])
+    np.testing.assert_allclose(table.wealth, [person.wealth for person in people])
+    skills = [[person.skills[name] for name in table.skill_names] for person in people]
+    np.testing.assert_allclose(table.skills, skills, rtol=1e-6)
+    # Life events are random: same seed-independent distribution
+    for column in ("happiness", "health"):
+        objects = np.array([getattr(person, column) for person in people])
+        values = getattr(table, column).astype(np.float64)
+        error = 4 * objects.std() / np.sqrt(len(objects))
+        assert abs(values.mean() - objects.mean()) < error
+        assert abs(values.std() - objects.std()) < 0.05 * objects.std()
+
+def _draws(people):
+    intelligence = np.array([person.intelligence for person in people])
+    skills = np.array([[person.skills[name].level for name in ("farming", "manufacturing")] for person in people])
+    personality = np.array([PERSONALITIES.index(person.personality) for person in people])
+    return intelligence, skills, personality
+
+def test_bulk_people_match_the_constructor():
+    count = 20000
+    bulk = Person.generate_many(count, np.random.default_rng(5), age=list(range(count)), education_level=2)
+    rng = np.random.default_rng(6)
+    single = [Person(person_id=i, age=i, education_level=2, rng=rng) for i in range(count)]
+
+    for made, built in ((bulk[0], single[0]), (bulk[-1], single[-1])):
+        assert made.person_id == built.person_id and made.age == built.age
+        assert made.education_level == built.education_level and made.wealth == built.wealth
+        assert made.health == built.health == 100.0
+        assert made.skills.keys() == built.skills.keys()
+        for lazy in ("name", "relationships", "needs", "job", "finances", "employment_status", "region"):
+            assert getattr(made, lazy) == getattr(built, lazy)
+    bulk[0].finances['cash'] -= 1.0  # Lazy defaults are created per person, not shared
+    assert bulk[1].finances['cash'] == 1000.0
+
+    for made, built in zip(_draws(bulk), _draws(single)):
+        assert abs(made.mean() - built.mean()) < 0.05 * made.std()
+        assert abs(made.std() / built.std() - 1.0) < 0.05
+    assert abs(_draws(bulk)[0].mean() - 100.0) < 0.5 and _draws(bulk)[1].std() == pytest.approx(15, rel=0.05)
+    assert set(_draws(bulk)[2].tolist()) == set(range(len(PERSONALITIES)))
+
+def test_columnar_world_starts_like_an_object_world():
+    config = dict(initial_population=20000, corporation_count=5, seed=7)
+    table = World(WorldConfig(columnar=True, **config)).population
+    people = World(WorldConfig(columnar=False, **config)).population
+
+    np.testing.assert_array_equal(table.age, [person.age for person in people])
+    np.testing.assert_array_equal(table.education_level, [person.education_level for person in people])
+    np.testing.assert_array_equal(table.wealth, [person.wealth for person in people])
+    regions = np.bincount(table.location)  # Contiguous, equally sized region blocks
+    assert len(regions) == WorldConfig().region_count and regions.max() - regions.min() <= 1
+    assert np.all(np.diff(table.location) >= 0)
+
+    intelligence, skills, personality = _draws(people)
+    assert table.intelligence.dtype == np.float32
+    assert 70.0 <= table.intelligence.min() and table.intelligence.max() < 130.0
+    assert abs(table.intelligence.mean() - intelligence.mean()) < 1.0
+    assert abs(table.intelligence.std() - intelligence.std()) < 0.5
+    # Object skills are levels on 0-100; table skills are the same normal rescaled to 0.0-1.0 and clipped
+    assert abs(table.skills.mean() - skills.mean() / 100) < 0.005
+    assert abs(table.skills.std() - skills.std() / 100) < 0.005
+    assert np.all((table.skills >= 0.0) & (table.skills <= 1.0))
+    assert set(np.unique(table.personality).tolist()) == set(np.unique(personality).tolist())
@@ -0,0 +1,41 @@
+import json
+from utils.profiler import _DISABLED, Profiler
+from world.world import World, WorldConfig
+
+def test_disabled_profiler_records_nothing(tmp_path):
+    world = World(WorldConfig(initial_population=500, corporation_count=5, columnar=True, seed=1, raise_errors=True))
+    assert world.profiler.phase("economy") is _DISABLED
+    for _ in range(3):
+        assert world.update()
+    assert world.get_profile() == {"phases": {}, "counters": {}}
+    path = tmp_path / "profile.json"
+    world.export_profile(str(path))
+    assert json.loads(path.read_text()) == {"phases": {}, "counters": {}}
+
+def test_enabled_profiler_exports_nested_phases(tmp_path):
+    world = World(WorldConfig(initial_population=500, corporation_count=5, columnar=True, seed=1, raise_errors=True,
+                              profile=True))
+    for _ in range(3):
+        assert world.update()
+    path = tmp_path / "profile.json"
+    text = world.export_profile(str(path))
+    report = json.loads(path.read_text())
+    assert json.loads(text) == report
+    assert report["phases"] == world.get_profile()["phases"]
+    assert report["phases"]["economy"]["calls"] == 3
+    assert any(name.startswith("economy.") for name in report["phases"])
+    for stats in report["phases"].values():
+        assert stats["calls"] > 0 and 0.0 <= stats["max_s"] <= stats["total_s"]
+
+def test_nested_phases_are_reported_by_dotted_path():
+    profiler = Profiler(enabled=True)
+    with profiler.phase("outer"):
+        with profiler.phase("inner"):
+            pass
+        with profiler.phase("inner"):
+            pass
+    profiler.count("hits", 2)
+    report = profiler.report()
+    assert report["phases"]["outer"]["calls"] == 1
+    assert report["phases"]["outer.inner"]["calls"] == 2
+    assert report["counters"] == {"hits": 2}
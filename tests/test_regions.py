@@ -0,0 +1,60 @@
+import numpy as np
+import pytest
+from entities.corporation import Corporation
+from entities.corporation_table import CorporationTable
+from entities.regions import RegionIndex
+from world.world import World, WorldConfig
+
+def _assert_members(index: RegionIndex, regions: np.ndarray):
+    assert index.check(regions)
+    for region in range(index.region_count):
+        np.testing.assert_array_equal(np.sort(index.members(region)), np.flatnonzero(regions == region))
+
+def test_moves_match_a_rebuilt_index():
+    rng = np.random.default_rng(0)
+    regions = rng.integers(0, 7, 5000).astype(np.int32)
+    index = RegionIndex(regions, 7)
+    for _ in range(20):
+        movers = rng.choice(len(regions), rng.integers(1, 800), replace=False)
+        destinations = rng.integers(0, 7, len(movers))
+        regions[movers] = destinations
+        index.move(movers, destinations)
+        _assert_members(index, regions)
+
+@pytest.mark.parametrize("columnar", [True, False])
+def test_migration_keeps_the_index_current(columnar):
+    world = World(WorldConfig(initial_population=3000, corporation_count=20, columnar=columnar, seed=11,
+                              migration_rate=0.1, debug_statistics=True, raise_errors=True))
+    index = world.people_by_region
+    for _ in range(3):
+        assert world.update()
+    if columnar:
+        locations = world.population.location
+    else:
+        locations = np.array([person.location for person in world.population])
+    _assert_members(index, locations)
+
+@pytest.mark.parametrize("columnar", [True, False])
+def test_moved_corporations_change_region(columnar):
+    world = World(WorldConfig(initial_population=500, corporation_count=40, columnar=columnar, seed=5,
+                              debug_statistics=True, raise_errors=True))
+    index = world.corporations_by_region
+    world.move_corporations(np.array([0, 1, 39]), np.array([4, 4, 0]))
+    assert {0, 1} <= set(index.members(4).tolist())
+    assert 39 in index.members(0)
+    assert world.update()
+
+def test_writes_around_the_index_are_caught_in_debug_mode():
+    world = World(WorldConfig(initial_population=500, corporation_count=10, columnar=True, seed=2,
+                              debug_statistics=True, raise_errors=True))
+    world.people_by_region
+    world.population.assign("location", np.array([0]), np.array([4]))
+    with pytest.raises(RuntimeError, match="people_by_region"):
+        world.update()
+
+def test_table_from_corporations_keeps_regions():
+    corporations = Corporation.generate_initial_corporations(12, np.random.default_rng(1))
+    for corporation in corporations:
+        corporation.region = corporation.id % 3
+    table = CorporationTable.from_corporations(corporations)
+    np.testing.assert_array_equal(table.region, [corporation.id % 3 for corporation in corporations])
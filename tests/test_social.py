@@ -0,0 +1,53 @@
+from collections import Counter
+import numpy as np
+import pytest
+from systems.social import RELATIONSHIP_TYPES, SocialGraph
+
+def _edge_list(size, count, seed):
+    rng = np.random.default_rng(seed)
+    sources = rng.integers(0, size, count)
+    targets = rng.integers(0, size, count)
+    types = rng.integers(0, len(RELATIONSHIP_TYPES), count)
+    strengths = rng.uniform(0.0, 1.0, count).astype(np.float32)
+    return sources, targets, types, strengths
+
+def _ties(graph, person_id):
+    targets, types, strengths = graph.neighbors(person_id)
+    return Counter(zip(targets.tolist(), types.tolist(), strengths.tolist()))
+
+def _expected(edges, person_id, keep=None):
+    sources, targets, types, strengths = edges
+    mine = sources == person_id
+    if keep is not None:
+        mine &= keep
+    return Counter(zip(targets[mine].tolist(), types[mine].tolist(), strengths[mine].tolist()))
+
+def test_csr_neighbors_match_the_edge_list():
+    edges = _edge_list(200, 3000, seed=1)
+    graph = SocialGraph.from_edges(200, *edges)
+    assert graph.edge_count == 3000
+    assert graph.degree().tolist() == np.bincount(edges[0], minlength=200).tolist()
+    for person_id in range(200):
+        assert _ties(graph, person_id) == _expected(edges, person_id)
+    assert np.array_equal(np.sort(graph.sources()), np.sort(edges[0]))
+
+def test_prune_keeps_the_surviving_edges_of_every_person():
+    edges = _edge_list(100, 1500, seed=2)
+    graph = SocialGraph.from_edges(100, *edges)
+    assert graph.prune(0.4) == int(np.count_nonzero(edges[3] < 0.4))
+    for person_id in range(100):
+        assert _ties(graph, person_id) == _expected(edges, person_id, keep=edges[3] >= 0.4)
+
+@pytest.mark.parametrize("model", ["small_world", "preferential_attachment"])
+def test_generated_graphs_are_symmetric_without_self_loops(model):
+    locations = np.random.default_rng(3).integers(0, 4, 2000)
+    graph = getattr(SocialGraph, model)(locations, 6, np.random.default_rng(4))
+    sources = graph.sources()
+    assert not np.any(sources == graph.targets)
+    forward = Counter(zip(sources.tolist(), graph.targets.tolist(), graph.types.tolist(), graph.strengths.tolist()))
+    backward = Counter(zip(graph.targets.tolist(), sources.tolist(), graph.types.tolist(), graph.strengths.tolist()))
+    assert forward == backward
+    relationships = graph.relationships(int(sources[0]))
+    targets, _, _ = graph.neighbors(int(sources[0]))
+    assert [relationship.target_id for relationship in relationships] == targets.tolist()
+    assert all(relationship.type in RELATIONSHIP_TYPES for relationship in relationships)
@@ -0,0 +1,47 @@
+import numpy as np
+import pytest
+from entities.aggregates import PopulationAggregates
+from world.world import World, WorldConfig
+
+def _recompute(table, region_count):
+    fresh = PopulationAggregates(region_count)
+    fresh.refresh(table.wealth, table.happiness, table.health, table.location)
+    return fresh
+
+def test_assign_deltas_match_a_full_recompute():
+    world = World(WorldConfig(initial_population=5000, corporation_count=10, columnar=True, seed=8))
+    table, rng = world.population, np.random.default_rng(0)
+    assert not table.current_stats().stale
+    for _ in range(10):
+        rows = rng.choice(len(table), 700, replace=False)
+        table.assign("wealth", rows, rng.normal(0.0, 1e5, len(rows)))
+        table.assign("location", rows[:300], rng.integers(0, world.config.region_count, 300))
+        table.assign("happiness", rows[300:], rng.random(400))
+        table.assign("health", rows[:50], 0.25)
+    assert table.stats.differences(_recompute(table, world.config.region_count)) == {}
+
+@pytest.mark.parametrize("tick_unit", ["year", "month", "day"])
+def test_statistics_match_a_full_recompute(tick_unit):
+    world = World(WorldConfig(initial_population=5000, corporation_count=20, columnar=True, seed=9,
+                              migration_rate=0.05, tick_unit=tick_unit, debug_statistics=True, raise_errors=True))
+    for _ in range(6):
+        assert world.update()
+        table = world.population
+        statistics = world.get_statistics()
+        assert statistics["average_wealth"] == pytest.approx(table.wealth.mean())
+        assert statistics["average_happiness"] == pytest.approx(table.happiness.mean(dtype=np.float64))
+        assert statistics["average_health"] == pytest.approx(table.health.mean(dtype=np.float64))
+        assert statistics["employment_rate"] == pytest.approx(np.mean(table.employer_id != -1))
+        regional = np.bincount(table.location, weights=table.wealth, minlength=world.config.region_count)
+        np.testing.assert_allclose(statistics["regional_wealth"], regional)
+
+@pytest.mark.parametrize("tick_unit", ["year", "month", "day"])
+def test_aggregates_are_current_at_the_end_of_every_tick(tick_unit):
+    # Reads must not pay for a rebuild: the household kernel leaves the totals up to date
+    world = World(WorldConfig(initial_population=5000, corporation_count=20, columnar=True, seed=9,
+                              migration_rate=0.05, tick_unit=tick_unit, raise_errors=True))
+    for _ in range(4):
+        assert world.update()
+        table = world.population
+        assert not table.stats.stale
+        assert table.stats.differences(_recompute(table, world.config.region_count)) == {}
@@ -0,0 +1,32 @@
+import warnings
+import numpy as np
+from entities.person import Person
+from systems.economy import EconomySystem, TaxBracket, TaxSystem
+
+def test_batch_matches_scalar_calculation():
+    taxes = TaxSystem()
+    incomes = np.array([-5.0, 0.0, 500.0, 10000.0, 25000.0, 70001.0, 1e6])
+    expected = [taxes.calculate_tax(income) for income in incomes]
+    np.testing.assert_allclose(taxes.calculate_tax_batch(incomes), expected)
+
+def test_untaxed_unbounded_last_bracket():
+    taxes = TaxSystem()
+    brackets = [TaxBracket(0, 10000, 0.1), TaxBracket(10000, float("inf"), 0.0)]
+    taxes.set_regional_brackets(1, brackets)
+    with warnings.catch_warnings():
+        warnings.simplefilter("error")
+        owed = taxes.calculate_tax_batch(np.array([5000.0, 50000.0]), np.array([1, 1]))
+    np.testing.assert_allclose(owed, [500.0, 1000.0])
+
+def test_object_population_is_taxed_through_the_bracket_tables():
+    economy = EconomySystem()
+    economy.tax_system.set_regional_brackets(1, [TaxBracket(0, float("inf"), 0.5)])
+    people = [Person(person_id=i, age=30, education_level=3, location=i % 2) for i in range(4)]
+    for person, salary in zip(people, [20000.0, 20000.0, 0.0, 80000.0]):
+        person.job = "Worker"
+        person.finances['salary'] = salary
+    economy._collect_taxes(people, years=0.5)
+    owed = [0.5 * economy.tax_system.calculate_tax(20000.0), 0.5 * 0.5 * 20000.0, 0.0, 0.5 * 0.5 * 80000.0]
+    np.testing.assert_allclose([1000.0 - person.finances['cash'] for person in people], owed)
+    assert economy.tax_system.total_revenue == sum(owed)
+    assert economy.tax_system.regional_revenue == {0: owed[0], 1: owed[1] + owed[3]}